@@ -0,0 +1,63 @@
+"""
+Замер задержки коммита для профилей PRAGMA SQLite.
+
+Каждый коммит — одна карточка через Database.add_card / update_card,
+как при сохранении карточки из UI.
+
+Запуск из корня проекта:
+    python -m benchmarks.sqlite_profiles --commits 500
+"""
+import argparse
+import datetime
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+from sqlalchemy import create_engine, event
+
+from src.backend.db.base import SQLITE_PROFILES, apply_sqlite_pragmas
+from src.backend.db.database import Database
+
+
+def make_database(path: Path, profile: str) -> Database:
+    engine = create_engine(f"sqlite:///{path}", future=True)
+    event.listen(engine, "connect",
+                 lambda dbapi_connection, _: apply_sqlite_pragmas(dbapi_connection, profile))
+    return Database(engine=engine)
+
+
+def measure(db: Database, commits: int) -> List[float]:
+    timings = []
+    for i in range(commits):
+        payload = {
+            "date": datetime.date(2024, 1, 1 + i % 28), "time": datetime.time(8, i % 60),
+            "artist": f"artist {i}", "title": f"title {i}"
+        }
+        started = time.perf_counter()
+        card_id = db.add_card("report", payload)
+        db.update_card(card_id, "report", {"genre": "edited"})
+        timings.append((time.perf_counter() - started) / 2)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--commits", type=int, default=500)
+    args = parser.parse_args()
+
+    print(f"{'профиль':<8} {'mean, мс':>10} {'p50, мс':>10} {'p95, мс':>10} {'итого, с':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for profile in SQLITE_PROFILES:
+            db = make_database(Path(tmp) / f"{profile}.db", profile)
+            timings = sorted(measure(db, args.commits))
+            db.release_connections()
+            db.engine.dispose()
+            ms = [t * 1000 for t in timings]
+            print(f"{profile:<8} {statistics.mean(ms):>10.3f} {ms[len(ms) // 2]:>10.3f} "
+                  f"{ms[int(len(ms) * 0.95)]:>10.3f} {sum(timings) * 2:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Замер скорости фильтрации TableBuffer.
+
+Сравнивает прежний проход (lower() по каждой ячейке на каждый запрос)
+с кешированной строкой поиска на строку.
+
+Запуск из корня проекта:
+    python -m benchmarks.table_search --sizes 10000 100000 1000000
+"""
+import argparse
+import random
+import string
+import time
+from typing import Dict, List
+
+from src.eventbus import EventBus
+from src.enums import GROUP
+from src.frontend.widgets.table import TableBuffer
+
+
+TERMS = ["a", "ab", "abc", "lov", "ёж", "zzz"]
+
+
+def make_rows(size: int, seed: int = 0) -> Dict[str, List[str]]:
+    rnd = random.Random(seed)
+    alphabet = string.ascii_letters + "абвгдеёжзийклмнопрстуфхцчшщьыэюя "
+
+    def word(n: int) -> str:
+        return "".join(rnd.choice(alphabet) for _ in range(n))
+
+    return {
+        str(i): [str(i), word(18), word(14), word(10), word(10), f"{rnd.randint(1, 9)}:{rnd.randint(0, 59):02}"]
+        for i in range(size)
+    }
+
+
+def legacy_filter(buffer: TableBuffer, term: str) -> List[str]:
+    term = term.strip().lower()
+    return [
+        key for key in buffer.sorted_keys
+        if any(term in cell.lower() for cell in buffer.original_data[key])
+    ]
+
+
+def measure(fn, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(size: int):
+    buffer = TableBuffer(group_id=GROUP.REPORT_TABLE, original_data=make_rows(size), header_map={})
+
+    start = time.perf_counter()
+    buffer._search_texts()
+    warmup = time.perf_counter() - start
+
+    def legacy():
+        for term in TERMS:
+            legacy_filter(buffer, term)
+
+    def cached():
+        for term in TERMS:
+            buffer.history.clear()
+            buffer.filter_data(term)
+
+    old = measure(legacy)
+    new = measure(cached)
+    print(f"{size:>9} строк: lower() {old * 1000:9.1f} мс | кеш {new * 1000:9.1f} мс | "
+          f"x{old / new:5.1f} | построение кеша {warmup * 1000:.1f} мс")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    # Таблица не подключена к UI, события фильтрации отбрасываем
+    EventBus.publish = staticmethod(lambda *args, **kwargs: None)
+    for size in args.sizes:
+        run(size)
+
+
+if __name__ == "__main__":
+    main()
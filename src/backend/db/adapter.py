@@ -1,5 +1,5 @@
 import logging
-from typing import Any, Dict, List, Type, Union
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Type, Union
 from datetime import datetime, time
 
 from sqlalchemy import Date, Time, DateTime, Integer, Float, Boolean
@@ -21,125 +21,168 @@ class TableAdapter:
         self.model = self.MODEL_MAP[self.header]
         self.fields_map = FIELD_MAPS[self.header]
         self.columns = {col.name: col.type for col in self.model.__table__.columns}
+        # Позиции колонок в кортежах строк, которые отдаёт Database
+        self.column_index = {name: i for i, name in enumerate(self.columns)}
+
+        # Скомпилированные планы преобразования: порядок колонок, индекс
+        # в кортеже и форматтер/парсер определяются один раз на таблицу.
+        self._view_plan: Tuple[Tuple[str, str, int, Callable[[Any], str]], ...] = tuple(
+            (ui_key, field, self.column_index[field],
+             self._make_stringifier(self.columns[field], field))
+            for ui_key in self._ui_headers()
+            for field in (self.fields_map[ui_key],)
+        )
+        self._table_plan: Tuple[Tuple[int, Callable[[Any], str]], ...] = tuple(
+            (idx, stringify) for _, _, idx, stringify in self._view_plan
+        )
+        self._db_plan: Dict[str, Tuple[str, Callable[[Any], Any]]] = {
+            ui_key: (field, self._make_coercer(self.columns[field], field))
+            for ui_key, field in self.fields_map.items()
+        }
 
     def to_db(self, ui_row: Dict[str, str], transform: bool = True) -> Dict[str, Any]:
         """
         Преобразует словарь из UI в словарь с полями модели ORM.
         """
-        if transform:
-            return {
-                self.fields_map[k]: self._coerce(v, self.columns[self.fields_map[k]], self.fields_map[k])
-                for k, v in ui_row.items()
-                if k in self.fields_map
-            }
-        return {self.fields_map[k]: ui_row[k] for k in ui_row if k in self.fields_map}
+        plan = self._db_plan
+        result = {}
+        for ui_key, value in ui_row.items():
+            step = plan.get(ui_key)
+            if step is None:
+                continue
+            field, coerce = step
+            result[field] = coerce(value) if transform else value
+        return result
 
     def to_view(self, db_row: Dict[str, Any], transform: bool = True) -> Dict[str, Union[str, Any]]:
         """
         Преобразует словарь ORM (из БД) в словарь с ключами для UI.
         """
-        result = {}
-        for ui_key in self._ui_headers():
-            field = self.fields_map.get(ui_key)
-            value = db_row.get(field)
-            column_type = self.columns.get(field)
-            if transform:
-                result[ui_key] = self._stringify(value, column_type, field)
-            else:
-                result[ui_key] = value
-        return result
+        if transform:
+            return {ui_key: stringify(db_row.get(field))
+                    for ui_key, field, _, stringify in self._view_plan}
+        return {ui_key: db_row.get(field) for ui_key, field, _, _ in self._view_plan}
 
-    def to_table(self, db_rows: List[Dict[str, Any]]) -> List[List[str]]:
+    def to_table(self, db_rows: List[Sequence[Any]]) -> List[List[str]]:
         """
-        Преобразует список ORM-строк в UI-таблицу (список списков).
+        Преобразует строки БД (кортежи в порядке колонок модели)
+        в UI-таблицу (список списков).
         """
-        headers = self._ui_headers()
-        result = []
-        for row in db_rows:
-            line = []
-            for ui_key in headers:
-                field = self.fields_map.get(ui_key)
-                value = row.get(field)
-                column_type = self.columns.get(field)
-                line.append(self._stringify(value, column_type, field))
-            result.append(line)
-        return result
-
-    def _coerce(self, value: str, column_type: Any, field_name: str = "") -> Any:
-        if value in ("", None):
-            return None
-        try:
-            if isinstance(column_type, Date):
-                return datetime.strptime(value, "%Y-%m-%d").date()
+        plan = self._table_plan
+        return [[stringify(row[idx]) for idx, stringify in plan] for row in db_rows]
+
+    def _make_coercer(self, column_type: Any, field_name: str) -> Callable[[Any], Any]:
+        """Собирает функцию приведения строки из UI к типу колонки."""
+        parse = self._make_parser(column_type, field_name)
+        logger = self._logger
+
+        def coerce(value):
+            if value in ("", None):
+                return None
+            if parse is None:
+                return value
+            try:
+                return parse(value)
+            except Exception:
+                logger.warning(f"Не удалось привести поле '{field_name}' "
+                               f"со значением '{value}' к типу {column_type}")
+            return value
+
+        return coerce
+
+    @staticmethod
+    def _make_parser(column_type: Any, field_name: str) -> Optional[Callable[[str], Any]]:
+        if isinstance(column_type, Date):
+            return lambda value: datetime.strptime(value, "%Y-%m-%d").date()
 
-            elif isinstance(column_type, Time):
-                if "duration" in field_name:
+        elif isinstance(column_type, Time):
+            if "duration" in field_name:
+                def parse_duration(value: str) -> time:
                     value = value.replace('.', ':').replace(',', ':')
                     if len(value.split(":")) == 2:
                         m, s = map(int, value.split(":"))
                         return time(minute=m, second=s)
-                return datetime.strptime(value, "%H:%M:%S").time()
+                    return datetime.strptime(value, "%H:%M:%S").time()
+                return parse_duration
+            return lambda value: datetime.strptime(value, "%H:%M:%S").time()
 
-            elif isinstance(column_type, DateTime):
-                return datetime.strptime(value, "%Y-%m-%d %H:%M:%S")
+        elif isinstance(column_type, DateTime):
+            return lambda value: datetime.strptime(value, "%Y-%m-%d %H:%M:%S")
 
-            elif isinstance(column_type, Integer):
-                return int(value)
+        elif isinstance(column_type, Integer):
+            return int
 
-            elif isinstance(column_type, Float):
-                return float(value)
+        elif isinstance(column_type, Float):
+            return float
 
-            elif isinstance(column_type, Boolean):
-                return value.lower() in ("true", "1", "yes", "on")
+        elif isinstance(column_type, Boolean):
+            return lambda value: value.lower() in ("true", "1", "yes", "on")
 
-        except Exception:
-            self._logger.warning(f"Не удалось привести поле '{field_name}' "
-                                 f"со значением '{value}' к типу {column_type}")
-        return value
+        return None
 
-    def _stringify(self, value: Any, column_type: Any, field_name: str = "") -> str:
-        if value is None:
-            return ""
+    @staticmethod
+    def _make_stringifier(column_type: Any, field_name: str) -> Callable[[Any], str]:
+        """Собирает функцию форматирования значения колонки для UI."""
         if isinstance(column_type, Date):
-            return value.strftime("%Y-%m-%d")
+            return lambda value: "" if value is None else value.strftime("%Y-%m-%d")
+
         elif isinstance(column_type, Time):
-            if "duration" in field_name and value.hour == 0:
-                return f"{value.minute}:{value.second:02}"
-            return f"{value.hour}:{value.minute:02}:{value.second:02}"
+            if "duration" in field_name:
+                def format_duration(value) -> str:
+                    if value is None:
+                        return ""
+                    if value.hour == 0:
+                        return f"{value.minute}:{value.second:02}"
+                    return f"{value.hour}:{value.minute:02}:{value.second:02}"
+                return format_duration
+            return lambda value: "" if value is None else \
+                f"{value.hour}:{value.minute:02}:{value.second:02}"
+
         elif isinstance(column_type, DateTime):
-            return value.strftime("%Y-%m-%d %H:%M:%S")
-        return str(value)
+            return lambda value: "" if value is None else value.strftime("%Y-%m-%d %H:%M:%S")
+
+        return lambda value: "" if value is None else str(value)
 
     def _ui_headers(self) -> List[str]:
         return list(DEFAULT_CARD_VALUES[self.header].keys())
 
-    def _to_report(self, db_rows: List[Dict[str, Any]], column_order: List[str]) -> List[
+    def _to_report(self, db_rows: List[Sequence[Any]], column_order: List[str]) -> List[
         List[Any]]:
         """
-        Преобразует строки из БД в табличный формат по заданному порядку колонок.
+        Преобразует строки из БД (кортежи, уже отсортированные по (date, id))
+        в табличный формат по заданному порядку колонок.
         Поддерживает спец. колонку 'datetime' = объединение 'date' и 'time' в datetime.datetime.
         """
+        index = self.column_index
         result = []
-        db_rows.sort(key=lambda x: (x.get("date"), x.get("id")))
         for row in db_rows:
             line = []
             for col in column_order:
                 if col == "datetime":
-                    date_val = row.get("date")
-                    time_val = row.get("time")
+                    date_val = row[index["date"]]
+                    time_val = row[index["time"]]
                     line.append(datetime.combine(date_val, time_val))
                 elif col == "play_count":
-                    line.append(int(row.get(col)))
+                    line.append(int(row[index[col]]))
                 else:
-                    line.append(row.get(col))
+                    line.append(row[index[col]])
             result.append(line)
         return result
 
-    def to_month_report(self, db_rows: List[Dict[str, Any]]) -> List[List[Any]]:
+    def to_month_report(self, db_rows: List[Sequence[Any]]) -> List[List[Any]]:
         order = ["title", "composer", "lyricist", "play_count", "artist", "label"]
         return self._to_report(db_rows, order)
 
-    def to_quarter_report(self, db_rows: List[Dict[str, Any]]) -> List[List[Any]]:
+    @staticmethod
+    def to_aggregated_month_report(db_rows: List[Sequence[Any]]) -> List[List[Any]]:
+        """
+        Строки сводного отчёта из SQL уже в порядке колонок месячного
+        отчёта и отсортированы, остаётся привести сумму к int.
+        """
+        return [[title, composer, lyricist, int(plays), artist, label]
+                for title, composer, lyricist, plays, artist, label in db_rows]
+
+    def to_quarter_report(self, db_rows: List[Sequence[Any]]) -> List[List[Any]]:
         order = ["program_name", "datetime", "title", "composer", "lyricist",
                  "play_duration", "play_count", "total_duration", "genre", "artist"]
         return self._to_report(db_rows, order)
@@ -1,7 +1,8 @@
 import sys
 from pathlib import Path
+from typing import Any, Dict
 from sqlalchemy import create_engine, event
-from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.orm import declarative_base
 
 
 Base = declarative_base()
@@ -14,13 +15,61 @@ DB_PATH.parent.mkdir(parents=True, exist_ok=True)
 Engine = create_engine(f"sqlite:///{DB_PATH}", echo=False, future=True)
 
 
-# Принудительно включаем внешние ключи для SQLite
-@event.listens_for(Engine, "connect")
-def set_sqlite_pragma(dbapi_connection, connection_record):
+# Профили PRAGMA для соединений SQLite.
+# safe — журнал отката и fsync на каждый коммит (поведение SQLite по умолчанию);
+# fast — WAL: читатели не блокируют писателя, fsync только на чекпойнте,
+# база не портится при сбое, но последние коммиты могут потеряться при
+# отключении питания. Включается только явно в настройках.
+SQLITE_PROFILES: Dict[str, Dict[str, Any]] = {
+    "safe": {
+        "journal_mode": "DELETE",
+        "synchronous": "FULL",
+        "mmap_size": 0,
+        "cache_size": -2000,         # 2 МБ
+        "temp_store": "DEFAULT",
+        "busy_timeout": 5000,
+    },
+    "fast": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": 256 * 1024 * 1024,
+        "cache_size": -64000,        # 64 МБ
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+    },
+}
+DEFAULT_SQLITE_PROFILE = "safe"
+
+_sqlite_profile = DEFAULT_SQLITE_PROFILE
+
+
+def apply_sqlite_pragmas(dbapi_connection, profile: str):
     cursor = dbapi_connection.cursor()
+    # Принудительно включаем внешние ключи для SQLite
     cursor.execute("PRAGMA foreign_keys=ON;")
+    for name, value in SQLITE_PROFILES[profile].items():
+        cursor.execute(f"PRAGMA {name}={value};")
     cursor.close()
 
 
-# Фабрика сессий
-SessionFactory = sessionmaker(bind=Engine, autoflush=False, future=True)
+@event.listens_for(Engine, "connect")
+def set_sqlite_pragma(dbapi_connection, connection_record):
+    apply_sqlite_pragmas(dbapi_connection, _sqlite_profile)
+
+
+def set_sqlite_profile(profile: str) -> bool:
+    """
+    Переключает профиль PRAGMA. Пул соединений сбрасывается, чтобы
+    новые соединения открылись уже с новыми настройками.
+
+    Вызывается только при старте, пока базой не пользуются другие потоки:
+    смена journal_mode при чужом открытом соединении даёт "database is locked".
+    """
+    global _sqlite_profile
+    if profile not in SQLITE_PROFILES:
+        return False
+    if profile != _sqlite_profile:
+        _sqlite_profile = profile
+        Engine.dispose()
+    return True
+
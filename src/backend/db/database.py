@@ -1,14 +1,21 @@
-from typing import List, Dict, Optional, Type, Any
+from typing import Iterator, List, Dict, Optional, Type, Any, Sequence, Tuple
 import json
 import logging
 import datetime
 from pathlib import Path
+import threading
 import traceback
+from contextlib import contextmanager
 
+from sqlalchemy import (select, Select, Table, Text, insert, update, delete, bindparam, literal,
+                        type_coerce, func, tuple_)
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Connection
 from sqlalchemy.exc import SQLAlchemyError
 
-from .models import Base, State, Songs, Report, Settings
-from .base import DB_PATH, Engine, SessionFactory
+from .models import Base, State, Songs, Report, Settings, DURATION_SECONDS
+from .base import DB_PATH, Engine
+from .migrations import MigrationRunner, data_version
 from ...enums import HEADER
 
 
@@ -18,27 +25,93 @@ class Database:
         HEADER.REPORT.value: Report,
     }
 
-    def __init__(self) -> None:
+    def __init__(self, engine=None) -> None:
         """
-        Управляющий класс базы данных синхронизации (ORM).
+        Управляющий класс базы данных синхронизации.
+
+        Каждый поток работает через своё долгоживущее соединение (на практике —
+        поток DB-диспетчера), запросы выполняются в явных транзакциях через
+        Core-выражения, частые однострочные запросы собраны заранее.
+
+        :param engine: движок SQLAlchemy, по умолчанию — общий движок rao.db
         """
         self._logger = logging.getLogger(__name__)
         self.db_path: Path = DB_PATH
-        self.engine = Engine
-        self.session_factory = SessionFactory
+        self.engine = engine or Engine
+        self._local = threading.local()
+        # Поколение соединений: release_connections увеличивает его, и потоки
+        # со старым поколением переоткрывают соединение при следующем запросе.
+        self._generation = 0
+        self._generation_lock = threading.Lock()
+        self.schema_version = 0
         self._initialization()
 
     def _initialization(self):
         try:
-            Base.metadata.create_all(self.engine)
+            runner = MigrationRunner(self.engine)
+            runner.run()
+            self.schema_version = max(runner.applied_versions(), default=0)
         except SQLAlchemyError as e:
             self._logger.error(f"Ошибка базы данных во время инициализации: {e}")
             self._logger.debug(traceback.format_exc())
 
-    def get_all_rows(self, table_name: str) -> List[Dict[str, Any]]:
+    # region Connection
+
+    def _connection(self) -> Connection:
+        """
+        Долгоживущее соединение текущего потока, открывается при первом
+        обращении. Соединение, устаревшее после release_connections,
+        закрывается здесь же — его владельцем.
         """
-        Возвращает все строки из таблицы как список словарей:
-        [{field_name: value, ...}, ...]
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.generation != self._generation:
+            conn.close()
+            conn = None
+        if conn is None or conn.closed or conn.invalidated:
+            conn = self.engine.connect()
+            self._local.conn = conn
+            self._local.generation = self._generation
+        return conn
+
+    @contextmanager
+    def _transaction(self) -> Iterator[Connection]:
+        """Явная транзакция на соединении потока: commit на выходе, rollback при ошибке."""
+        conn = self._connection()
+        with conn.begin():
+            yield conn
+
+    def release_connections(self):
+        """
+        Закрывает соединение вызывающего потока, соединения остальных потоков
+        помечаются устаревшими: в них может идти запрос, поэтому каждое
+        закроет и переоткроет свой поток при следующем обращении.
+        Нужно перед сменой PRAGMA-профиля.
+        """
+        with self._generation_lock:
+            self._generation += 1
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    # endregion
+
+    @staticmethod
+    def _select_columns(model: Type[Base]) -> Select:
+        """
+        SELECT всех колонок таблицы модели (Core, без ORM-объектов).
+        Строки результата — кортежи в порядке model.__table__.columns.
+        """
+        return select(*model.__table__.columns)
+
+    def _fetch_all(self, stmt: Select) -> List[Sequence[Any]]:
+        with self._transaction() as conn:
+            return conn.execute(stmt).all()
+
+    def get_all_rows(self, table_name: str) -> List[Sequence[Any]]:
+        """
+        Возвращает все строки из таблицы как список кортежей значений
+        в порядке колонок модели.
         """
         model = self.model_map.get(table_name.lower())
         if not model:
@@ -46,86 +119,203 @@ class Database:
             return []
 
         try:
-            with self.session_factory() as session:
-                records = session.query(model).all()
-                rows = []
-                for record in records:
-                    row_dict = {}
-                    for col in model.__table__.columns:
-                        value = getattr(record, col.name)
-                        row_dict[col.name] = value
-                    rows.append(row_dict)
-                return rows
+            return self._fetch_all(self._select_columns(model))
         except SQLAlchemyError as e:
             self._logger.error(f"Ошибка базы данных в get_all_rows('{table_name}'): {e}")
             self._logger.debug(traceback.format_exc())
             return []
 
-    def get_month_report(self, month: int, year: int) -> List[Dict[str, Any]]:
+    def iter_rows(self, table_name: str, first_chunk: int = 500,
+                  max_chunk: int = 20000) -> Iterator[List[Sequence[Any]]]:
+        """
+        Отдаёт строки таблицы (кортежи) порциями в порядке id. Первая порция
+        маленькая, чтобы UI быстро показал данные, каждая следующая вдвое
+        больше, но не больше max_chunk.
+        """
+        model = self.model_map.get(table_name.lower())
+        if not model:
+            self._logger.error(f"Недопустимое имя таблицы: {table_name}")
+            return
+
+        stmt = self._select_columns(model).order_by(model.id)
         try:
-            start_date = datetime.date(year, month, 1)
-            # Конец месяца: если декабрь — следующий январь, иначе следующий месяц
-            if month == 12:
-                end_date = datetime.date(year + 1, 1, 1)
-            else:
-                end_date = datetime.date(year, month + 1, 1)
+            # Отдельное соединение: генератор держит курсор между порциями
+            with self.engine.connect() as conn:
+                result = conn.execution_options(yield_per=first_chunk).execute(stmt)
+                chunk_size = first_chunk
+                while True:
+                    chunk = result.fetchmany(chunk_size)
+                    if not chunk:
+                        break
+                    yield chunk
+                    chunk_size = min(chunk_size * 2, max_chunk)
+        except SQLAlchemyError as e:
+            self._logger.error(f"Ошибка базы данных в iter_rows('{table_name}'): {e}")
+            self._logger.debug(traceback.format_exc())
 
-            with self.session_factory() as session:
-                query = (
-                    session.query(Report)
-                    .filter(Report.date >= start_date, Report.date < end_date)
-                    .all()
-                )
+    @staticmethod
+    def _page_stmt(model: Type[Base], after: Optional[Tuple[Any, ...]],
+                   limit: int, direction: int) -> Select:
+        keys = _PAGE_KEYS[model]
+        stmt = select(*model.__table__.columns)
+        if direction >= 0:
+            if after is not None:
+                stmt = stmt.where(tuple_(*keys) > tuple_(*after))
+            return stmt.order_by(*keys).limit(limit)
+        if after is not None:
+            stmt = stmt.where(tuple_(*keys) < tuple_(*after))
+        return stmt.order_by(*(key.desc() for key in keys)).limit(limit)
+
+    def get_rows_page(self, table_name: str, after: Optional[Tuple[Any, ...]] = None,
+                      limit: int = 500, direction: int = 1) -> List[Sequence[Any]]:
+        """
+        Страница строк по ключу (keyset pagination) на индексированных
+        колонках: report — (date, id), songs — (id,).
+
+        :param after: ключ граничной строки предыдущей страницы, None — с начала
+            (direction=1) или с конца таблицы (direction=-1)
+        :param limit: размер страницы
+        :param direction: 1 — строки после after, -1 — строки перед after
+        :return: строки в порядке ключа (по возрастанию) в любом направлении
+        """
+        model = self.model_map.get(table_name.lower())
+        if not model:
+            self._logger.error(f"Недопустимое имя таблицы: {table_name}")
+            return []
 
-                rows = []
-                for record in query:
-                    row_dict = {}
-                    for col in Report.__table__.columns:
-                        value = getattr(record, col.name)
-                        row_dict[col.name] = value
-                    rows.append(row_dict)
-                return rows
+        try:
+            rows = self._fetch_all(self._page_stmt(model, after, limit, direction))
+        except SQLAlchemyError as e:
+            self._logger.error(f"Ошибка базы данных в get_rows_page('{table_name}', {after=}): {e}")
+            self._logger.debug(traceback.format_exc())
+            return []
+        return rows if direction >= 0 else rows[::-1]
+
+    def page_key(self, table_name: str, row: Sequence[Any]) -> Tuple[Any, ...]:
+        """Ключ строки get_rows_page — значение для after следующего запроса."""
+        model = self.model_map[table_name.lower()]
+        columns = model.__table__.columns
+        return tuple(row[columns.keys().index(key.key)] for key in _PAGE_KEYS[model])
+
+    @classmethod
+    def _report_rows_stmt(cls, start_date: datetime.date, end_date: datetime.date) -> Select:
+        """Строки отчёта за [start_date, end_date), отсортированные по (date, id)."""
+        return (
+            cls._select_columns(Report)
+            .where(Report.date >= start_date, Report.date < end_date)
+            .order_by(Report.date, Report.id)
+        )
+
+    def _get_report_rows(self, start_date: datetime.date,
+                         end_date: datetime.date) -> List[Sequence[Any]]:
+        return self._fetch_all(self._report_rows_stmt(start_date, end_date))
+
+    @staticmethod
+    def _month_bounds(month: int, year: int) -> Tuple[datetime.date, datetime.date]:
+        start_date = datetime.date(year, month, 1)
+        # Конец месяца: если декабрь — следующий январь, иначе следующий месяц
+        if month == 12:
+            end_date = datetime.date(year + 1, 1, 1)
+        else:
+            end_date = datetime.date(year, month + 1, 1)
+        return start_date, end_date
+
+    def get_month_report(self, month: int, year: int) -> List[Sequence[Any]]:
+        try:
+            return self._get_report_rows(*self._month_bounds(month, year))
 
         except SQLAlchemyError as e:
             self._logger.error(f"Ошибка в get_month_report({month=}, {year=}): {e}")
             self._logger.debug(traceback.format_exc())
             return []
 
-    def get_quarter_report(self, quarter: int, year: int) -> List[Dict[str, Any]]:
+    @classmethod
+    def _aggregated_report_stmt(cls, start_date: datetime.date, end_date: datetime.date) -> Select:
+        """
+        Сводный отчёт за [start_date, end_date): одна строка на произведение
+        с суммой исполнений, в порядке первого исполнения. Колонки:
+        title, composer, lyricist, play_count, artist, label.
+        """
+        return (
+            select(
+                Report.title, Report.composer, Report.lyricist,
+                func.sum(func.coalesce(Report.play_count, 1)).label("play_count"),
+                Report.artist, Report.label,
+            )
+            .where(Report.date >= start_date, Report.date < end_date)
+            .group_by(Report.title, Report.artist, Report.composer, Report.lyricist, Report.label)
+            .order_by(func.min(Report.date), func.min(Report.id))
+        )
+
+    def get_month_report_aggregated(self, month: int, year: int) -> List[Sequence[Any]]:
+        try:
+            return self._fetch_all(self._aggregated_report_stmt(*self._month_bounds(month, year)))
+
+        except SQLAlchemyError as e:
+            self._logger.error(f"Ошибка в get_month_report_aggregated({month=}, {year=}): {e}")
+            self._logger.debug(traceback.format_exc())
+            return []
+
+    @staticmethod
+    def _quarter_bounds(quarter: int, year: int) -> Tuple[datetime.date, datetime.date]:
+        month_start = (quarter - 1) * 3 + 1
+        start_date = datetime.date(year, month_start, 1)
+
+        # начало следующего квартала
+        if quarter == 4:
+            end_date = datetime.date(year + 1, 1, 1)
+        else:
+            end_date = datetime.date(year, month_start + 3, 1)
+        return start_date, end_date
+
+    def get_quarter_report(self, quarter: int, year: int) -> List[Sequence[Any]]:
         try:
             if quarter not in (1, 2, 3, 4):
                 self._logger.error(f"Некорректный номер квартала: {quarter}")
                 return []
 
-            month_start = (quarter - 1) * 3 + 1
-            start_date = datetime.date(year, month_start, 1)
+            return self._get_report_rows(*self._quarter_bounds(quarter, year))
 
-            # начало следующего квартала
-            if quarter == 4:
-                end_date = datetime.date(year + 1, 1, 1)
-            else:
-                end_date = datetime.date(year, month_start + 3, 1)
+        except SQLAlchemyError as e:
+            self._logger.error(f"Ошибка в get_quarter_report({quarter=}, {year=}): {e}")
+            self._logger.debug(traceback.format_exc())
+            return []
 
-            with self.session_factory() as session:
-                query = (
-                    session.query(Report)
-                    .filter(Report.date >= start_date, Report.date < end_date)
-                    .all()
-                )
+    @staticmethod
+    def _play_seconds_stmt(start_date: datetime.date, end_date: datetime.date) -> Select:
+        """Суммарное время звучания за [start_date, end_date) в секундах."""
+        return (
+            select(func.coalesce(func.sum(Report.play_duration_sec), 0))
+            .where(Report.date >= start_date, Report.date < end_date)
+        )
 
-                rows = []
-                for record in query:
-                    row_dict = {}
-                    for col in Report.__table__.columns:
-                        value = getattr(record, col.name)
-                        row_dict[col.name] = value
-                    rows.append(row_dict)
-                return rows
+    def get_quarter_play_seconds(self, quarter: int, year: int) -> Optional[int]:
+        """
+        Суммарное время звучания за квартал в секундах, считается в SQL
+        по индексу ix_report_date_id. None при ошибке.
+        """
+        if quarter not in (1, 2, 3, 4):
+            self._logger.error(f"Некорректный номер квартала: {quarter}")
+            return None
+        try:
+            with self._transaction() as conn:
+                return conn.execute(
+                    self._play_seconds_stmt(*self._quarter_bounds(quarter, year))).scalar_one()
 
         except SQLAlchemyError as e:
-            self._logger.error(f"Ошибка в get_quarter_report({quarter=}, {year=}): {e}")
+            self._logger.error(f"Ошибка в get_quarter_play_seconds({quarter=}, {year=}): {e}")
             self._logger.debug(traceback.format_exc())
-            return []
+            return None
+
+    @staticmethod
+    def _with_seconds(model: Type[Base], values: dict) -> dict:
+        """Дополняет values секундами для каждой переданной длительности."""
+        for time_column, seconds_column in DURATION_SECONDS.get(model, {}).items():
+            if time_column in values:
+                value = values[time_column]
+                values[seconds_column] = value.hour * 3600 + value.minute * 60 + value.second \
+                    if isinstance(value, datetime.time) else None
+        return values
 
     def get_card(self, table_name: str, card_id: str) -> Optional[Dict[str, str]]:
         """
@@ -142,15 +332,14 @@ class Database:
             return None
 
         try:
-            with self.session_factory() as session:
-                record = session.get(model, int(card_id))
-                if not record:
-                    self._logger.warning(
-                        f"Запись с ID {card_id} не найдена в {table_name}")
-                    return None
+            with self._transaction() as conn:
+                record = conn.execute(_CARD_SELECT[model], {"card_id": int(card_id)}).first()
+            if not record:
+                self._logger.warning(
+                    f"Запись с ID {card_id} не найдена в {table_name}")
+                return None
 
-                return {col.name: getattr(record, col.name) for col in
-                        model.__table__.columns}
+            return dict(record._mapping)
 
         except SQLAlchemyError as e:
             self._logger.error(
@@ -176,16 +365,15 @@ class Database:
             payload.pop("ID", None)
             payload.pop("id", None)
 
-            with self.session_factory() as session:
-                new_instance = model_cls(**payload)
-                session.add(new_instance)
-                session.commit()
+            with self._transaction() as conn:
+                result = conn.execute(
+                    insert(model_cls.__table__).values(**self._with_seconds(model_cls, payload)))
 
-                card_id = str(new_instance.id)
-                # если нужно — можно отправить card_id через EventBus, как в flashcard-логике
-                self._logger.debug(f"Карточка (ID: {card_id}) "
-                                   f"добавлена в таблицу '{table_name}'")
-                return card_id
+            card_id = str(result.inserted_primary_key[0])
+            # если нужно — можно отправить card_id через EventBus, как в flashcard-логике
+            self._logger.debug(f"Карточка (ID: {card_id}) "
+                               f"добавлена в таблицу '{table_name}'")
+            return card_id
 
         except SQLAlchemyError as e:
             self._logger.error(f"Ошибка при добавлении записи в таблицу '{table_name}': {e}")
@@ -206,25 +394,113 @@ class Database:
             self._logger.error(f"update_card: неизвестная таблица '{table_name}'")
             return
 
+        table = model_cls.__table__
+        values = self._with_seconds(
+            model_cls, {key: value for key, value in payload.items() if key in table.c})
         try:
-            with self.session_factory() as session:
-                record = session.get(model_cls, int(card_id))
-                if not record:
-                    self._logger.warning(f"{model_cls.__name__} с ID {card_id} не найдена.")
-                    return
-
-                for key, value in payload.items():
-                    if hasattr(record, key):
-                        setattr(record, key, value)
+            with self._transaction() as conn:
+                result = conn.execute(
+                    update(table).where(table.c.id == int(card_id)).values(**values)
+                )
+            if not result.rowcount:
+                self._logger.warning(f"{model_cls.__name__} с ID {card_id} не найдена.")
+                return
 
-                session.commit()
-                self._logger.debug(f"Карточка с (ID: {card_id}) обновлена в таблице '{table_name}'")
+            self._logger.debug(f"Карточка с (ID: {card_id}) обновлена в таблице '{table_name}'")
 
         except SQLAlchemyError as e:
             self._logger.error(f"Ошибка при обновлении записи ID={card_id} в таблице "
                                f"'{table_name}': {e}")
             self._logger.debug(traceback.format_exc())
 
+    # region Bulk
+
+    def add_cards(self, table_name: str, payloads: List[dict]) -> List[str]:
+        """
+        Добавляет пачку записей одной транзакцией.
+
+        :return: ID новых записей в порядке payloads, [] при ошибке
+        """
+        return self.upsert_cards(table_name, [
+            {k: v for k, v in payload.items() if k not in ("ID", "id")} for payload in payloads
+        ])
+
+    def update_cards(self, table_name: str, payloads: List[dict]) -> List[str]:
+        """
+        Обновляет пачку записей одной транзакцией, ID берётся из поля 'id'.
+
+        :return: ID обновлённых записей в порядке payloads, [] при ошибке
+        """
+        return self.upsert_cards(table_name, [payload for payload in payloads if payload.get("id")])
+
+    def upsert_cards(self, table_name: str, payloads: List[dict]) -> List[str]:
+        """
+        Сохраняет пачку записей одной транзакцией: записи с 'id' обновляются,
+        без него — добавляются. Строки с одинаковым набором полей уходят
+        одним executemany.
+
+        :return: ID записей в порядке payloads, [] при ошибке
+        """
+        model_cls = self.model_map.get(table_name.lower())
+        if not model_cls:
+            self._logger.error(f"upsert_cards: неизвестная таблица '{table_name}'")
+            return []
+        if not payloads:
+            return []
+
+        table = model_cls.__table__
+        ids: List[Optional[str]] = [None] * len(payloads)
+        new_rows, updated_rows = [], []
+        for i, payload in enumerate(payloads):
+            card_id = payload.get("id") or payload.get("ID")
+            values = self._with_seconds(
+                model_cls, {k: v for k, v in payload.items() if k in table.c and k != "id"})
+            if card_id:
+                ids[i] = str(card_id)
+                updated_rows.append((i, values))
+            else:
+                new_rows.append((i, values))
+
+        try:
+            with self._transaction() as conn:
+                self._insert_rows(conn, table, new_rows, ids)
+                self._update_rows(conn, table, updated_rows, ids)
+
+            self._logger.debug(f"В таблице '{table_name}' добавлено {len(new_rows)} "
+                               f"и обновлено {len(updated_rows)} карточек")
+            return ids
+
+        except SQLAlchemyError as e:
+            self._logger.error(f"Ошибка при пакетном сохранении в таблицу '{table_name}': {e}")
+            self._logger.debug(traceback.format_exc())
+            return []
+
+    @staticmethod
+    def _group_by_columns(rows: List[Tuple[int, dict]]) -> Dict[Tuple[str, ...], List[Tuple[int, dict]]]:
+        groups: Dict[Tuple[str, ...], List[Tuple[int, dict]]] = {}
+        for i, values in rows:
+            groups.setdefault(tuple(sorted(values)), []).append((i, values))
+        return groups
+
+    def _insert_rows(self, conn: Connection, table: Table,
+                     rows: List[Tuple[int, dict]], ids: List[Optional[str]]):
+        stmt = insert(table).returning(table.c.id, sort_by_parameter_order=True)
+        for group in self._group_by_columns(rows).values():
+            result = conn.execute(stmt, [values for _, values in group])
+            for (i, _), card_id in zip(group, result.scalars()):
+                ids[i] = str(card_id)
+
+    def _update_rows(self, conn: Connection, table: Table,
+                     rows: List[Tuple[int, dict]], ids: List[Optional[str]]):
+        # SET собирается из ключей параметров, WHERE — по отдельному bindparam
+        stmt = update(table).where(table.c.id == bindparam("_card_id"))
+        for group in self._group_by_columns(rows).values():
+            if not group[0][1]:
+                continue
+            conn.execute(stmt, [{"_card_id": int(ids[i]), **values} for i, values in group])
+
+    # endregion
+
     def delete_card(self, deleted_ids: List[str], table_name: str) -> None:
         """
         Deletes cards from the specified table by their IDs.
@@ -238,15 +514,13 @@ class Database:
             return
 
         try:
-            with self.session_factory() as session:
-                count = (
-                    session.query(model_cls)
-                    .filter(model_cls.id.in_(map(int, deleted_ids)))
-                    .delete(synchronize_session=False)
-                )
-                session.commit()
-                self._logger.debug(
-                    f"Удалено {count} карточек из таблицы '{table_name}' с IDs: {deleted_ids}")
+            table = model_cls.__table__
+            with self._transaction() as conn:
+                count = conn.execute(
+                    delete(table).where(table.c.id.in_(list(map(int, deleted_ids))))
+                ).rowcount
+            self._logger.debug(
+                f"Удалено {count} карточек из таблицы '{table_name}' с IDs: {deleted_ids}")
 
         except SQLAlchemyError as e:
             self._logger.error(f"Ошибка при удалении карточек из таблицы '{table_name}': {e}")
@@ -260,9 +534,8 @@ class Database:
         :return: значение (dict / list / str / bool / int / float), если найдено; иначе None
         """
         try:
-            with self.session_factory() as session:
-                record = session.get(State, key)
-                return record.value if record else None
+            with self._transaction() as conn:
+                return conn.execute(_STATE_SELECT, {"key": key}).scalar()
 
         except SQLAlchemyError as e:
             self._logger.error(f"Ошибка при получении состояния по ключу '{key}': {e}")
@@ -277,30 +550,71 @@ class Database:
         :param value: значение (должно быть сериализуемо в JSON)
         """
         try:
-            with self.session_factory() as session:
-                existing = session.get(State, key)
-                if existing:
-                    existing.value = value
-                else:
-                    session.add(State(key=key, value=value))
-                session.commit()
+            with self._transaction() as conn:
+                conn.execute(_STATE_UPSERT, {"key": key, "value": value})
             # self._logger.debug(f"Обновлено состояние: '{key}', с значениями {value}")
 
         except SQLAlchemyError as e:
             self._logger.error(f"Ошибка при установке состояния '{key}': {e}")
             self._logger.debug(traceback.format_exc())
 
+    def set_states(self, states: Dict[str, Any]) -> None:
+        """
+        Записывает несколько состояний одной транзакцией.
+
+        :param states: словарь ключей и значений (сериализуемых в JSON)
+        """
+        if not states:
+            return
+        try:
+            with self._transaction() as conn:
+                conn.execute(_STATE_UPSERT, [
+                    {"key": key, "value": value} for key, value in states.items()
+                ])
+
+        except SQLAlchemyError as e:
+            self._logger.error(f"Ошибка при записи состояний {list(states)}: {e}")
+            self._logger.debug(traceback.format_exc())
+
+    def get_data_version(self, table_name: str) -> Optional[int]:
+        """
+        Счётчик изменений таблицы, растёт с каждой изменённой строкой.
+        None, если счётчик недоступен.
+        """
+        try:
+            with self._transaction() as conn:
+                return conn.execute(_DATA_VERSION_SELECT, {"table_name": table_name.lower()}).scalar()
+        except SQLAlchemyError as e:
+            self._logger.error(f"Ошибка при чтении data_version('{table_name}'): {e}")
+            self._logger.debug(traceback.format_exc())
+            return None
+
+    def get_states_and_settings(self) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Читает все состояния и все настройки одним запросом (UNION ALL).
+
+        :return: (состояния, настройки), значения уже декодированы из JSON
+        """
+        states, settings = {}, {}
+        try:
+            with self._transaction() as conn:
+                rows = conn.execute(_STATES_AND_SETTINGS_SELECT).all()
+            for source, key, value in rows:
+                target = states if source == "state" else settings
+                target[key] = json.loads(value)
+        except (SQLAlchemyError, ValueError) as e:
+            self._logger.error(f"Ошибка при чтении состояний и настроек: {e}")
+            self._logger.debug(traceback.format_exc())
+        return states, settings
+
     def get_settings(self) -> Dict[str, Any]:
         """
         Возвращает все настройки из таблицы `settings` как словарь.
         """
         try:
-            with self.session_factory() as session:
-                rows = session.query(Settings).all()
-                return {
-                    row.key: json.loads(row.value)
-                    for row in rows
-                }
+            with self._transaction() as conn:
+                rows = conn.execute(_SETTINGS_SELECT).all()
+            return {key: json.loads(value) for key, value in rows}
         except SQLAlchemyError as e:
             self._logger.error(f"Ошибка при чтении настроек: {e}")
             self._logger.debug(traceback.format_exc())
@@ -312,17 +626,52 @@ class Database:
 
         :param settings: словарь ключей и значений
         """
+        if not settings:
+            return
         try:
-            with self.session_factory() as session:
-                for key, value in settings.items():
-                    value_json = json.dumps(value)
-                    existing = session.get(Settings, key)
-                    if existing:
-                        existing.value = value_json
-                    else:
-                        session.add(Settings(key=key, value=value_json))
-                session.commit()
+            with self._transaction() as conn:
+                conn.execute(_SETTINGS_UPSERT, [
+                    {"key": key, "value": json.dumps(value)}
+                    for key, value in settings.items()
+                ])
 
         except SQLAlchemyError as e:
             self._logger.error(f"Ошибка при записи настроек: {e}")
             self._logger.debug(traceback.format_exc())
+
+
+# Колонки ключа для get_rows_page, каждый набор покрыт индексом
+_PAGE_KEYS = {
+    Songs: (Songs.id,),
+    Report: (Report.date, Report.id),  # ix_report_date_id
+}
+
+
+def _upsert(model: Type[Base]):
+    stmt = sqlite_insert(model.__table__)
+    return stmt.on_conflict_do_update(
+        index_elements=[model.__table__.c.key],
+        set_={"value": stmt.excluded.value}
+    )
+
+
+# Заранее собранные выражения для частых однострочных запросов. Их
+# скомпилированный SQL берётся из кеша движка, а текст запроса — из кеша
+# подготовленных выражений sqlite3 на соединении.
+_CARD_SELECT: Dict[Type[Base], Select] = {
+    model: Database._select_columns(model).where(model.__table__.c.id == bindparam("card_id"))
+    for model in Database.model_map.values()
+}
+_STATE_SELECT = select(State.value).where(State.key == bindparam("key"))
+_STATE_UPSERT = _upsert(State)
+_SETTINGS_SELECT = select(Settings.key, Settings.value)
+_SETTINGS_UPSERT = _upsert(Settings)
+_DATA_VERSION_SELECT = select(data_version.c.version).where(
+    data_version.c.table_name == bindparam("table_name"))
+# Оба значения хранятся как JSON-текст, поэтому читаются как Text и
+# декодируются одинаково.
+_STATES_AND_SETTINGS_SELECT = select(
+    literal("state"), State.key, type_coerce(State.value, Text)
+).union_all(
+    select(literal("setting"), Settings.key, Settings.value)
+)
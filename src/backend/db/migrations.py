@@ -0,0 +1,135 @@
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, List, Sequence
+
+from sqlalchemy import Column, Integer, String, MetaData, Table, select, insert, inspect
+from sqlalchemy.engine import Connection, Engine
+
+from .models import Base, Songs, Report, DURATION_SECONDS
+
+
+# Служебная таблица версий схемы. Отдельная MetaData, чтобы create_all
+# моделей её не трогал, а сама она не попадала в Base.metadata.
+_migrations_metadata = MetaData()
+schema_migrations = Table(
+    "schema_migrations",
+    _migrations_metadata,
+    Column("version", Integer, primary_key=True),
+    Column("name", String, nullable=False),
+    Column("applied_at", String, nullable=False),
+)
+
+
+# Счётчик изменений таблиц данных. Растёт триггерами на каждую вставку,
+# изменение и удаление строки, в отличие от PRAGMA data_version переживает
+# перезапуск и видит изменения из любого соединения.
+data_version = Table(
+    "data_version",
+    _migrations_metadata,
+    Column("table_name", String, primary_key=True),
+    Column("version", Integer, nullable=False),
+)
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    upgrade: Callable[[Connection], None]
+
+
+def _create_tables(conn: Connection):
+    Base.metadata.create_all(conn)
+
+
+def _create_indexes(conn: Connection):
+    # На новой базе индексы уже созданы create_all вместе с таблицами,
+    # на существующей — создаются здесь.
+    for model in (Report, Songs):
+        for index in model.__table__.indexes:
+            index.create(conn, checkfirst=True)
+
+
+def _create_data_version(conn: Connection):
+    data_version.create(conn, checkfirst=True)
+    for model in (Songs, Report):
+        table = model.__tablename__
+        conn.execute(insert(data_version).prefix_with("OR IGNORE").values(table_name=table, version=0))
+        for operation in ("INSERT", "UPDATE", "DELETE"):
+            conn.exec_driver_sql(
+                f"CREATE TRIGGER IF NOT EXISTS {table}_{operation.lower()}_data_version "
+                f"AFTER {operation} ON {table} BEGIN "
+                f"UPDATE data_version SET version = version + 1 WHERE table_name = '{table}'; "
+                f"END"
+            )
+
+
+# Секунды из значения Time, как его хранит SQLAlchemy в SQLite: 'HH:MM:SS.ffffff'
+_SQL_SECONDS = ("CAST(substr({col}, 1, 2) AS INTEGER) * 3600 + "
+                "CAST(substr({col}, 4, 2) AS INTEGER) * 60 + "
+                "CAST(substr({col}, 7, 2) AS INTEGER)")
+
+
+def _add_duration_seconds(conn: Connection):
+    # Индекс по секундам намеренно не создаётся: единственный SQL-запрос по
+    # ним — SUM за период, его обслуживает ix_report_date_id. Индекс
+    # (date, play_duration_sec) планировщик выбирает и для сводного отчёта,
+    # теряя порядок по (date, id); сортировка по длительности идёт в буфере
+    # таблицы, не в SQL.
+    for model, columns in DURATION_SECONDS.items():
+        table = model.__tablename__
+        existing = {column["name"] for column in inspect(conn).get_columns(table)}
+        for time_column, seconds_column in columns.items():
+            if seconds_column not in existing:
+                conn.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN {seconds_column} INTEGER")
+            conn.exec_driver_sql(
+                f"UPDATE {table} SET {seconds_column} = {_SQL_SECONDS.format(col=time_column)} "
+                f"WHERE {time_column} IS NOT NULL"
+            )
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "create tables", _create_tables),
+    Migration(2, "report(date, id), report(song_id), songs(artist, title) indexes", _create_indexes),
+    Migration(3, "data_version counters and triggers", _create_data_version),
+    Migration(4, "integer seconds for durations", _add_duration_seconds),
+]
+
+
+class MigrationRunner:
+    """
+    Применяет миграции схемы по порядку версий. Каждая миграция выполняется
+    в своей транзакции вместе с записью в schema_migrations, поэтому
+    применяется ровно один раз.
+    """
+
+    def __init__(self, engine: Engine, migrations: Sequence[Migration] = MIGRATIONS):
+        self._logger = logging.getLogger(__name__)
+        self.engine = engine
+        self.migrations = sorted(migrations, key=lambda m: m.version)
+
+    def applied_versions(self) -> List[int]:
+        with self.engine.begin() as conn:
+            schema_migrations.create(conn, checkfirst=True)
+            return list(conn.execute(
+                select(schema_migrations.c.version).order_by(schema_migrations.c.version)
+            ).scalars())
+
+    def run(self) -> List[int]:
+        """Применяет недостающие миграции и возвращает их версии."""
+        applied = set(self.applied_versions())
+        done = []
+        for migration in self.migrations:
+            if migration.version in applied:
+                continue
+            with self.engine.begin() as conn:
+                migration.upgrade(conn)
+                conn.execute(insert(schema_migrations).values(
+                    version=migration.version,
+                    name=migration.name,
+                    applied_at=datetime.now().isoformat(timespec="seconds")
+                ))
+            self._logger.debug(f"Применена миграция схемы {migration.version}: {migration.name}")
+            done.append(migration.version)
+        return done
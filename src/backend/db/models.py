@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, JSON, Date, Time, Text
+from sqlalchemy import Column, Integer, String, ForeignKey, JSON, Date, Time, Text, Index
 from sqlalchemy.orm import relationship
 
 from .base import Base
@@ -6,6 +6,9 @@ from .base import Base
 
 class Songs(Base):
     __tablename__ = 'songs'
+    __table_args__ = (
+        Index("ix_songs_artist_title", "artist", "title"),
+    )
 
     id = Column(Integer, primary_key=True)
     artist = Column(String, nullable=False)         # Исполнитель
@@ -14,10 +17,16 @@ class Songs(Base):
     composer = Column(String, nullable=True)        # ФИО композитора
     lyricist = Column(String, nullable=True)        # ФИО автора текста
     label = Column(String, nullable=True)           # Лейбл
+    # Секунды — в конце таблицы: миграция добавляет их через ADD COLUMN
+    duration_sec = Column(Integer, nullable=True)   # duration в секундах
 
 
 class Report(Base):
     __tablename__ = 'report'
+    __table_args__ = (
+        Index("ix_report_date_id", "date", "id"),  # отчёты за период, сортировка по (date, id)
+        Index("ix_report_song_id", "song_id"),
+    )
 
     id = Column(Integer, primary_key=True)
     date = Column(Date, nullable=False)             # Дата
@@ -34,7 +43,17 @@ class Report(Base):
     label = Column(String, nullable=True)           # Лейбл
 
     song_id = Column(Integer, ForeignKey("songs.id"), nullable=True)  # опционально
-    song = relationship("Songs", backref="usages", lazy="joined")     # позволяет связывать при желании
+    play_duration_sec = Column(Integer, nullable=True)   # play_duration в секундах
+    total_duration_sec = Column(Integer, nullable=True)  # total_duration в секундах
+    song = relationship("Songs", backref="usages", lazy="select")     # позволяет связывать при желании
+
+
+# Теневые колонки длительностей в секундах {модель: {колонка Time: колонка секунд}}.
+# Заполняются Database при каждой записи, по ним считаются суммы и сортировки в SQL.
+DURATION_SECONDS = {
+    Songs: {"duration": "duration_sec"},
+    Report: {"play_duration": "play_duration_sec", "total_duration": "total_duration_sec"},
+}
 
 
 class State(Base):
@@ -8,5 +8,7 @@ DEFAULT_SETTINGS: Dict[ConfigKey, Any] = {
     ConfigKey.CARD_TRANSPARENCY: 85,
     ConfigKey.CARD_PIN: False,
     ConfigKey.SONG_TOOLTIPS: False,
-    ConfigKey.REPORT_TOOLTIPS: True
+    ConfigKey.REPORT_TOOLTIPS: True,
+    ConfigKey.PROGRESSIVE_STARTUP: True,
+    ConfigKey.SQLITE_PROFILE: "safe"
 }
@@ -0,0 +1,233 @@
+import gc
+import json
+import logging
+import os
+import threading
+import traceback
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+# Ключ снимка: (версия схемы, data_version таблицы). Снимок годен, только
+# пока оба совпадают с базой.
+SnapshotKey = Tuple[int, int]
+
+
+@dataclass
+class TableSnapshot:
+    rows: List[List[str]]
+    # Порядок ключей для sort_state, если он был известен при записи
+    order: Optional[List[str]] = None
+    sort_state: Optional[Tuple[int, str, int]] = None
+
+
+class _TableState:
+    def __init__(self, key: SnapshotKey, rows: Dict[str, List[str]]):
+        self.key = key
+        self.rows = rows
+        self.order: Optional[List[str]] = None
+        self.sort_state: Optional[Tuple[int, str, int]] = None
+        self.dirty = False
+
+
+class SnapshotStore:
+    """
+    Снимки таблиц на диске: строки уже в виде для UI (после to_table)
+    и порядок сортировки. Позволяют показать таблицу на старте без чтения
+    и преобразования всех строк из БД.
+
+    Формат файла: строка MAGIC, строка JSON-заголовка, затем тело UTF-8 —
+    ячейки через CELL_SEP, строки через ROW_SEP, после PART_SEP порядок
+    ключей. Заголовок читается первым: при несовпадении ключа тело не читается.
+
+    Снимок в памяти обновляется после каждого коммита, на диск пишется
+    в фоне с задержкой WRITE_DELAY и сразу при flush().
+    """
+
+    MAGIC = b"RAOSNAP1\n"
+    CELL_SEP = "\x1f"
+    ROW_SEP = "\x1e"
+    PART_SEP = "\x1d"
+    WRITE_DELAY = 2.0
+
+    def __init__(self, directory: Path):
+        self._logger = logging.getLogger(__name__)
+        self.directory = directory
+        self._tables: Dict[str, _TableState] = {}
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+
+    def path(self, table_name: str) -> Path:
+        return self.directory / f"rao_{table_name.lower()}.snapshot"
+
+    # region Memory
+
+    def load(self, table_name: str, key: SnapshotKey) -> Optional[TableSnapshot]:
+        """Читает снимок с диска, None — если его нет или он устарел."""
+        snapshot = self._read(table_name, key)
+        if snapshot is None:
+            return None
+        state = _TableState(key, {row[0]: row for row in snapshot.rows})
+        state.order, state.sort_state = snapshot.order, snapshot.sort_state
+        with self._lock:
+            self._tables[table_name] = state
+        return snapshot
+
+    def replace(self, table_name: str, rows: Iterable[List[str]], key: SnapshotKey):
+        """Новый снимок таблицы после полной загрузки из БД."""
+        state = _TableState(key, {row[0]: row for row in rows})
+        state.dirty = True
+        with self._lock:
+            self._tables[table_name] = state
+        self._schedule_write()
+
+    def update(self, table_name: str, rows: List[List[str]], key: Optional[SnapshotKey]):
+        """Применяет сохранённые строки. Порядок сортировки при этом устаревает."""
+        with self._lock:
+            state = self._tables.get(table_name)
+            if state is None:
+                return
+            if key is None or key == state.key:
+                # Версию не прочитать или она не сдвинулась (запись не прошла) —
+                # снимок в памяти больше нельзя сверить с базой
+                del self._tables[table_name]
+                return
+            for row in rows:
+                state.rows[row[0]] = row
+            self._touch(state, key)
+        self._schedule_write()
+
+    def delete(self, table_name: str, card_ids: List[str], key: Optional[SnapshotKey]):
+        with self._lock:
+            state = self._tables.get(table_name)
+            if state is None:
+                return
+            if key is None or key == state.key:
+                del self._tables[table_name]
+                return
+            for card_id in card_ids:
+                state.rows.pop(card_id, None)
+            self._touch(state, key)
+        self._schedule_write()
+
+    def set_order(self, table_name: str, sort_state: Optional[Tuple[int, str, int]],
+                  order: List[str]):
+        """Запоминает порядок строк из UI, если он покрывает ровно строки снимка."""
+        with self._lock:
+            state = self._tables.get(table_name)
+            if state is None or len(order) != len(state.rows) \
+                    or not all(card_id in state.rows for card_id in order):
+                return
+            if state.order != order or state.sort_state != sort_state:
+                state.order, state.sort_state = list(order), sort_state
+                state.dirty = True
+
+    @staticmethod
+    def _touch(state: _TableState, key: SnapshotKey):
+        state.key = key
+        state.order = None
+        state.dirty = True
+
+    # endregion
+
+    # region Disk
+
+    def flush(self):
+        """Записывает все изменённые снимки на диск."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            pending = []
+            for table_name, state in self._tables.items():
+                if state.dirty:
+                    state.dirty = False
+                    pending.append((table_name, state.key, list(state.rows.values()),
+                                    state.order, state.sort_state))
+
+        with self._write_lock:
+            for table_name, key, rows, order, sort_state in pending:
+                self._write(table_name, key, TableSnapshot(rows, order, sort_state))
+
+    def _schedule_write(self):
+        with self._lock:
+            if self._timer is None:
+                self._timer = threading.Timer(self.WRITE_DELAY, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _write(self, table_name: str, key: SnapshotKey, snapshot: TableSnapshot):
+        body = self.ROW_SEP.join(self.CELL_SEP.join(row) for row in snapshot.rows)
+        columns = len(snapshot.rows[0]) if snapshot.rows else 0
+        # Разделители внутри ячеек сломали бы разбор — такой снимок не пишем
+        if body.count(self.CELL_SEP) != len(snapshot.rows) * max(columns - 1, 0) \
+                or body.count(self.ROW_SEP) != max(len(snapshot.rows) - 1, 0) \
+                or self.PART_SEP in body:
+            self._logger.debug(f"Снимок '{table_name}' не записан: разделитель в данных")
+            self._remove(table_name)
+            return
+        if snapshot.order is not None:
+            body += self.PART_SEP + self.ROW_SEP.join(snapshot.order)
+
+        header = {
+            "key": list(key),
+            "rows": len(snapshot.rows),
+            "columns": columns,
+            "order": snapshot.order is not None,
+            "sort_state": list(snapshot.sort_state) if snapshot.sort_state else None,
+        }
+        path = self.path(table_name)
+        tmp_path = path.with_suffix(".tmp")
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(self.MAGIC)
+                f.write(json.dumps(header).encode("utf-8") + b"\n")
+                f.write(body.encode("utf-8"))
+            os.replace(tmp_path, path)
+            self._logger.debug(f"Снимок '{table_name}' записан: {len(snapshot.rows)} строк")
+        except OSError as e:
+            self._logger.warning(f"Не удалось записать снимок таблицы '{table_name}': {e}")
+            self._logger.debug(traceback.format_exc())
+
+    def _read(self, table_name: str, key: SnapshotKey) -> Optional[TableSnapshot]:
+        path = self.path(table_name)
+        if not path.exists():
+            return None
+        try:
+            with open(path, "rb") as f:
+                if f.readline() != self.MAGIC:
+                    return None
+                header: Dict[str, Any] = json.loads(f.readline())
+                if tuple(header["key"]) != tuple(key):
+                    return None
+                body = f.read().decode("utf-8")
+        except (OSError, ValueError, KeyError) as e:
+            self._logger.debug(f"Снимок таблицы '{table_name}' не прочитан: {e}")
+            return None
+
+        rows_part, _, order_part = body.partition(self.PART_SEP)
+        # Миллион мелких строк подряд — сборщик мусора здесь только мешает
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            rows = [row.split(self.CELL_SEP) for row in rows_part.split(self.ROW_SEP)] \
+                if header["rows"] else []
+        finally:
+            if gc_enabled:
+                gc.enable()
+        if len(rows) != header["rows"] or any(len(row) != header["columns"] for row in rows):
+            return None
+
+        order = order_part.split(self.ROW_SEP) if header["order"] and rows else None
+        sort_state = tuple(header["sort_state"]) if header["sort_state"] else None
+        return TableSnapshot(rows, order, sort_state)
+
+    def _remove(self, table_name: str):
+        try:
+            self.path(table_name).unlink(missing_ok=True)
+        except OSError:
+            pass
+
+    # endregion
@@ -1,18 +1,38 @@
-from typing import Dict, List, Any, Union
+import copy
+import logging
+import threading
+from typing import Dict, Iterable, List, Any, Optional, Union
 
+from .base import set_sqlite_profile
 from .database import Database
 from .adapter import TableAdapter
 from .validator import DataValidator
 from .order_map import FIELD_MAPS, FIELD_MAPS_REVERSED
 from .settings import DEFAULT_SETTINGS
-from ...enums import EventType, DispatcherType, HEADER, GROUP, STATE, ConfigKey
-from ...eventbus import Event, Subscriber, EventBus
-from ...entities import MonthReport, QuarterReport
+from .snapshot import SnapshotStore, SnapshotKey, TableSnapshot
+from ...enums import EventType, DispatcherType, HEADER, GROUP, STATE, ConfigKey, CoalesceMode
+from ...eventbus import Event, Subscriber, EventBus, CoalescePolicy
+from ...entities import MonthReport, QuarterReport, BootstrapSnapshot
 
 
 class SyncDB:
-    def __init__(self):
-        self.db = Database()
+    # Окно, за которое записи состояния UI копятся перед сбросом в БД, сек.
+    STATE_FLUSH_DELAY = 0.5
+    # Порция строк при потоковой отдаче таблицы из снимка
+    SNAPSHOT_CHUNK = 5000
+
+    def __init__(self, db: Optional[Database] = None, snapshots: Optional[SnapshotStore] = None):
+        self._logger = logging.getLogger(__name__)
+        self.db = db or Database()
+        self.snapshots = snapshots or SnapshotStore(self.db.db_path.parent)
+
+        # Write-behind кеш состояний: чтения из памяти, записи в _dirty_states
+        # сбрасываются одной транзакцией по таймеру, при закрытии окна и при
+        # остановке диспетчеров.
+        self._states: Dict[str, Any] = {}
+        self._dirty_states: Dict[str, Any] = {}
+        self._flush_timer: Optional[threading.Timer] = None
+        self._states_lock = threading.Lock()
 
         _song_adapter = TableAdapter(HEADER.SONGS)
         _report_adapter = TableAdapter(HEADER.REPORT)
@@ -25,8 +45,9 @@ class SyncDB:
 
     def subscribe(self):
         handlers = [
-            (EventType.VIEW.TABLE.DT.EDIT_CARD, self.get_card),
+            (EventType.VIEW.CARD.FETCH, self.get_card),
             (EventType.VIEW.CARD.SAVE, self.save_card),
+            (EventType.VIEW.CARD.SAVE_MANY, self.save_cards),
             (EventType.VIEW.TABLE.DT.DELETE_CARDS, self.delete_card),
             (EventType.VIEW.TABLE.DT.MANUAL_COL_SIZE, self.set_state),
             (EventType.VIEW.TABLE.DT.AUTO_COL_SIZE, self.set_state),
@@ -34,30 +55,124 @@ class SyncDB:
             (EventType.VIEW.EXPORT.GENERATE_REPORT, self.get_report),
             (EventType.VIEW.TABLE.DT.SORT_CHANGED, self.set_state),
             (EventType.VIEW.SETTINGS.ON_CHANGE, self.set_settings),
+            (EventType.VIEW.UI.STREAM_TABLES, self.stream_tables),
+            (EventType.VIEW.TABLE.DT.REQUEST_PAGE, self.get_rows_page),
+            (EventType.BACK.DB.FLUSH_STATE, self.flush_states),
+            (EventType.VIEW.UI.CLOSE_WINDOW, self.flush_states),
         ]
+        # Для состояний UI и настроек важно только последнее значение:
+        # устаревшие события отбрасываются шиной до DB диспетчера
+        latest = CoalescePolicy(CoalesceMode.LATEST)
+        policies = {
+            EventType.VIEW.TABLE.DT.MANUAL_COL_SIZE: latest,
+            EventType.VIEW.TABLE.DT.AUTO_COL_SIZE: latest,
+            EventType.VIEW.TABLE.DT.SORT_CHANGED: latest,
+            EventType.VIEW.EXPORT.PATH_CHANGED: CoalescePolicy(
+                CoalesceMode.LATEST, key=lambda state_key, *_: state_key),
+            EventType.VIEW.SETTINGS.ON_CHANGE: CoalescePolicy(
+                CoalesceMode.DEBOUNCE, 300, key=lambda settings: tuple(settings)),
+        }
 
         for event, handler in handlers:
             EventBus.subscribe(
                 event_type=event,
                 subscriber=Subscriber(
-                    callback=handler, route_by=DispatcherType.DB
+                    callback=handler, route_by=DispatcherType.DB, policy=policies.get(event)
                 )
             )
+        EventBus.register_flush(self.flush_states)
 
     def get_all_rows(self, table_name: str):
         all_rows = self.db.get_all_rows(table_name)
         adapter = self.adapters.get(table_name)
         remapped_rows = adapter.to_table(all_rows)
+        self._replace_snapshot(table_name, remapped_rows)
         return remapped_rows
 
+    # region Snapshots
+
+    def load_table_snapshot(self, table_name: HEADER) -> Optional[TableSnapshot]:
+        """Снимок таблицы с диска, если он соответствует текущей базе."""
+        key = self._snapshot_key(table_name)
+        if key is None:
+            return None
+        return self.snapshots.load(table_name, key)
+
+    def save_snapshots(self, orders: Dict[HEADER, Iterable[str]]):
+        """
+        Запоминает текущий порядок строк таблиц из UI и записывает снимки.
+        Вызывается при выходе, когда диспетчеры уже остановлены.
+        """
+        sort_states = {HEADER.SONGS: STATE.SONGS_SORT, HEADER.REPORT: STATE.REPORT_SORT}
+        for table_name, order in orders.items():
+            self.snapshots.set_order(table_name, self.get_state(sort_states[table_name]), list(order))
+        self.snapshots.flush()
+
+    def _snapshot_key(self, table_name: str) -> Optional[SnapshotKey]:
+        version = self.db.get_data_version(table_name)
+        return None if version is None else (self.db.schema_version, version)
+
+    def _replace_snapshot(self, table_name: str, rows: List[List[str]]):
+        key = self._snapshot_key(table_name)
+        if key is not None:
+            self.snapshots.replace(table_name, rows, key)
+
+    # endregion
+
+    def stream_tables(self, table_names: List[HEADER]):
+        """
+        Потоковая загрузка таблиц на старте: строки уходят в UI порциями
+        событием TABLE_CHUNK, последнее событие таблицы помечено is_last=True.
+        """
+        for table_name in table_names:
+            adapter = self.adapters.get(table_name)
+            event = Event(event_type=EventType.BACK.DB.TABLE_CHUNK, group_id=GROUP(table_name))
+
+            snapshot = self.load_table_snapshot(table_name)
+            if snapshot is not None:
+                # Строки из снимка уже преобразованы, БД не читается
+                step = self.SNAPSHOT_CHUNK
+                for start in range(0, len(snapshot.rows), step):
+                    EventBus.publish(event, snapshot.rows[start:start + step], False)
+            else:
+                all_rows = []
+                for db_rows in self.db.iter_rows(table_name):
+                    rows = adapter.to_table(db_rows)
+                    all_rows.extend(rows)
+                    EventBus.publish(event, rows, False)
+                self._replace_snapshot(table_name, all_rows)
+            EventBus.publish(event, [], True)
+
+    def get_rows_page(self, table_name: str, after: Optional[tuple] = None,
+                      limit: int = 500, direction: int = 1):
+        """
+        Отдаёт в UI страницу строк таблицы событием TABLE_PAGE:
+        (rows, cursor, direction). cursor — after для следующей страницы
+        в том же направлении, None — если строк дальше нет.
+        """
+        db_rows = self.db.get_rows_page(table_name, after, limit, direction)
+        cursor = None
+        if len(db_rows) == limit:
+            edge = db_rows[-1] if direction >= 0 else db_rows[0]
+            cursor = self.db.page_key(table_name, edge)
+
+        EventBus.publish(
+            Event(event_type=EventType.BACK.DB.TABLE_PAGE, group_id=GROUP(table_name)),
+            self.adapters.get(table_name).to_table(db_rows), cursor, direction
+        )
+
     def get_report(self, report: Union[MonthReport, QuarterReport]):
         adapter = self.adapters.get(HEADER.REPORT)
-        if isinstance(report, MonthReport):
+        if isinstance(report, MonthReport) and report.aggregated:
+            db_rows = self.db.get_month_report_aggregated(report.month, report.year)
+            report.data = adapter.to_aggregated_month_report(db_rows)
+        elif isinstance(report, MonthReport):
             db_rows = self.db.get_month_report(report.month, report.year)
             report.data = adapter.to_month_report(db_rows)
         elif isinstance(report, QuarterReport):
             db_rows = self.db.get_quarter_report(report.quarter, report.year)
             report.data = adapter.to_quarter_report(db_rows)
+            report.total_play_seconds = self.db.get_quarter_play_seconds(report.quarter, report.year)
         else:
             pass
 
@@ -66,14 +181,13 @@ class SyncDB:
             report
         )
 
-    def get_card(self, table_name: str, card_id: str):
+    def get_card(self, table_name: str, card_id: str) -> Dict[str, str]:
+        """Ответ на запрос VIEW.CARD.FETCH: словарь карточки с ключами UI."""
         db_row = self.db.get_card(table_name, card_id)
+        if db_row is None:
+            raise LookupError(f"запись с ID {card_id} не найдена")
         adapter = self.adapters.get(table_name)
-        remapped_row = adapter.to_view(db_row)
-        EventBus.publish(
-            Event(event_type=EventType.BACK.DB.CARD_DICT),
-            "", table_name, remapped_row
-        )
+        return adapter.to_view(db_row)
 
     def save_card(self, card_key: str, table_name: Union[str, GROUP], data: Dict[str, str]):
         if not self.validator.validate(card_key, table_name, data):
@@ -91,27 +205,54 @@ class SyncDB:
             card_id = self.db.add_card(table_name=table_name, payload=remapped_data)
             remapped_data["id"] = card_id
 
-        to_view = adapter.to_view(remapped_data)
+        row = list(adapter.to_view(remapped_data).values())
+        self.snapshots.update(table_name, [row], self._snapshot_key(table_name))
         # Генерируем событие для таблицы
         EventBus.publish(Event(
             event_type=EventType.BACK.DB.CARD_VALUES,
             group_id=GROUP(table_name)
-        ), list(to_view.values()))
+        ), row)
 
-        # Генерируем событие для Card Manager, включить если карточка не будет
-        # закрываться после сохранения.
-        # EventBus.publish(
-        #     Event(event_type=EventType.BACK.DB.CARD_DICT),
-        #     card_key, table_name, to_view
-        # )
+    def save_cards(self, table_name: Union[str, GROUP], cards: List[Dict[str, str]]):
+        """
+        Пакетное сохранение: все карточки пишутся одной транзакцией, таблица
+        получает одно событие со всеми строками. Невалидные карточки пропускаются.
+        """
+        adapter = self.adapters.get(table_name)
+        if isinstance(table_name, GROUP):
+            table_name = str(table_name.value)
+
+        valid = [data for data in cards if self.validator.is_valid(table_name, data)]
+        if len(valid) != len(cards):
+            self._logger.warning(
+                f"Пропущено невалидных карточек: {len(cards) - len(valid)} из {len(cards)}")
+        if not valid:
+            return
+
+        remapped = [adapter.to_db(data) for data in valid]
+        card_ids = self.db.upsert_cards(table_name, remapped)
+        if not card_ids:
+            return
+
+        rows = []
+        for card_id, db_row in zip(card_ids, remapped):
+            db_row["id"] = card_id
+            rows.append(list(adapter.to_view(db_row).values()))
+        self.snapshots.update(table_name, rows, self._snapshot_key(table_name))
+
+        EventBus.publish(Event(
+            event_type=EventType.BACK.DB.CARDS_VALUES,
+            group_id=GROUP(table_name)
+        ), rows)
 
     def delete_card(self, deleted_ids: List[str], table_name: Union[str, GROUP]):
         if isinstance(table_name, GROUP):
             table_name = str(table_name.value)
         self.db.delete_card(deleted_ids, table_name)
+        self.snapshots.delete(table_name, deleted_ids, self._snapshot_key(table_name))
 
     def get_state(self, state_name: STATE):
-        state = self.db.get_state(state_name)
+        state = self._read_state(str(state_name.value))
 
         if state and state_name in (STATE.SONGS_COL_SIZE, STATE.REPORT_COL_SIZE):
             table_name = self._extract_table_name(state_name)
@@ -141,16 +282,89 @@ class SyncDB:
                 col_name = FIELD_MAPS[table_name][data[1]]
                 data = [data[0], col_name, data[2]]
 
-        self.db.set_state(str(state_name.value), data)
+        self._write_state(str(state_name.value), data)
+
+    def _read_state(self, key: str) -> Any:
+        with self._states_lock:
+            if key not in self._states:
+                self._states[key] = self.db.get_state(key)
+            # Копия, чтобы вызывающий код не правил кеш
+            return copy.deepcopy(self._states[key])
+
+    def _write_state(self, key: str, data: Any):
+        data = copy.deepcopy(data)
+        with self._states_lock:
+            self._states[key] = data
+            self._dirty_states[key] = data
+            if self._flush_timer is None:
+                self._flush_timer = threading.Timer(self.STATE_FLUSH_DELAY, self._request_flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+
+    @staticmethod
+    def _request_flush():
+        # Сама запись выполняется в потоке DB-диспетчера
+        EventBus.publish(Event(event_type=EventType.BACK.DB.FLUSH_STATE))
+
+    def flush_states(self):
+        """Записывает накопленные изменения состояния одной транзакцией."""
+        with self._states_lock:
+            pending, self._dirty_states = self._dirty_states, {}
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+        self.db.set_states(pending)
+
+    def load_bootstrap_snapshot(self) -> BootstrapSnapshot:
+        """
+        Загружает всё стартовое состояние UI и настройки одним запросом.
+        Состояния попадают в кеш, дальше декодируются как в get_state.
+        """
+        db_states, db_settings = self.db.get_states_and_settings()
+        with self._states_lock:
+            for state in STATE:
+                self._states.setdefault(state.value, db_states.get(state.value))
+
+        return BootstrapSnapshot(
+            songs_col_size=self.get_state(STATE.SONGS_COL_SIZE),
+            report_col_size=self.get_state(STATE.REPORT_COL_SIZE),
+            monthly_path=self.get_state(STATE.MONTHLY_PATH),
+            quarterly_path=self.get_state(STATE.QUARTERLY_PATH),
+            songs_sort=self.get_state(STATE.SONGS_SORT),
+            report_sort=self.get_state(STATE.REPORT_SORT),
+            settings=self._with_default_settings(db_settings)
+        )
 
     def get_settings(self) -> Dict[str, Any]:
-        db_settings = self.db.get_settings()
-        return {k: db_settings.get(k) or v for k, v in DEFAULT_SETTINGS.items()}
+        return self._with_default_settings(self.db.get_settings())
+
+    @staticmethod
+    def _with_default_settings(db_settings: Dict[str, Any]) -> Dict[str, Any]:
+        # Сохранённые False/0 — тоже значения, по умолчанию только при отсутствии
+        return {k: v if db_settings.get(k) is None else db_settings[k]
+                for k, v in DEFAULT_SETTINGS.items()}
 
     def set_settings(self, settings: Dict[ConfigKey, Any]):
+        # Профиль SQLite только сохраняется: он применяется при следующем
+        # запуске, см. apply_sqlite_profile.
         converted_settings = {k.value: v for k, v in settings.items()}
         self.db.set_settings(settings=converted_settings)
 
+    def release_connections(self):
+        """Закрывает соединение БД вызывающего потока (см. Database.release_connections)."""
+        self.db.release_connections()
+
+    def apply_sqlite_profile(self, profile: str):
+        """
+        Применяет профиль PRAGMA при старте, до запуска потоков БД. Во время
+        работы профиль не переключается: пока другой поток держит соединение,
+        смена journal_mode блокирует базу.
+        """
+        # Соединение, открытое чтением снимка старта, держит старые PRAGMA.
+        self.db.release_connections()
+        if not set_sqlite_profile(profile):
+            self._logger.warning(f"Неизвестный профиль SQLite: {profile}")
+
     @staticmethod
     def _extract_table_name(state_name: STATE) -> HEADER:
         return HEADER(state_name.value.split("_")[0])
\ No newline at end of file
@@ -14,10 +14,8 @@ class DataValidator:
         self.field_maps = FIELD_MAPS
 
     def validate(self, card_key: str, table_name: str, data: Dict[str, str]) -> bool:
-        if table_name == "songs":
-            validated = self._validate_songs(table_name, data)
-        else:
-            validated = self._validate_report(table_name, data)
+        """Проверяет карточку и рассылает результат открытой карточке card_key."""
+        validated = self._validate(table_name, data)
 
         EventBus.publish(Event(
             event_type=EventType.BACK.DB.VALIDATION
@@ -25,6 +23,15 @@ class DataValidator:
 
         return all(validated.values())
 
+    def is_valid(self, table_name: str, data: Dict[str, str]) -> bool:
+        """Проверяет данные без рассылки: для карточек, которые не открыты."""
+        return all(self._validate(table_name, data).values())
+
+    def _validate(self, table_name: str, data: Dict[str, str]) -> Dict[str, bool]:
+        if table_name == "songs":
+            return self._validate_songs(table_name, data)
+        return self._validate_report(table_name, data)
+
     def _validate_songs(self, table_name: str, data: Dict[str, str]) -> Dict[str, bool]:
         validated = {}
         for view_key, val in data.items():
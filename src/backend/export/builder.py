@@ -108,7 +108,8 @@ class ReportBuilder:
         elif isinstance(report, QuarterReport):
             headers = self.quarter_table_headers
             label = "Квартальный"
-            args = {"quarter": report.quarter, "year": report.year}
+            args = {"quarter": report.quarter, "year": report.year,
+                    "total_play_seconds": report.total_play_seconds}
         else:
             self._logger.warning("Неверный тип отчета.")
             return
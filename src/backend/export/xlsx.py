@@ -1,4 +1,4 @@
-from typing import List, Union, Any
+from typing import List, Union, Any, Optional
 import datetime
 import calendar
 from pathlib import Path
@@ -20,24 +20,22 @@ def _get_russian_period_text(month: int, year: int) -> str:
     return f"с {from_day} {month_name} {year} по {to_day} {month_name} {year}"
 
 
-def _calculate_total_play_time(data: List[List[Any]]) -> str:
+def _calculate_total_play_time(data: List[List[Any]], total_seconds: Optional[int] = None) -> str:
     """
-    Calculates the total play time from a list of rows,
-    where the 6th column (index 5) contains datetime.time values.
+    Formats the total play time. Uses total_seconds when it was already
+    summed in the database, otherwise sums the 6th column (index 5)
+    of the rows, which contains datetime.time values.
 
     :param data: List of rows, each containing a datetime.time object at index 5
+    :param total_seconds: Precomputed total in seconds
     :return: String in format 'X час. Y мин. Z сек.'
     """
 
-    def time_to_timedelta(t: datetime.time) -> datetime.timedelta:
-        return datetime.timedelta(hours=t.hour, minutes=t.minute, seconds=t.second)
+    if total_seconds is None:
+        total_seconds = sum(
+            t.hour * 3600 + t.minute * 60 + t.second for t in (row[5] for row in data) if t
+        )
 
-    total_duration = sum(
-        (time_to_timedelta(i[5]) for i in data),
-        start=datetime.timedelta()
-    )
-
-    total_seconds = int(total_duration.total_seconds())
     hours = total_seconds // 3600
     minutes = (total_seconds % 3600) // 60
     seconds = total_seconds % 60
@@ -172,7 +170,8 @@ def generate_xlsx_quarter_report(
     year: int,
     data: List[List],
     save_path: Union[str, Path],
-    table_headers: List[str]
+    table_headers: List[str],
+    total_play_seconds: Optional[int] = None
 ):
 
     save_path = Path(save_path)
@@ -293,7 +292,7 @@ def generate_xlsx_quarter_report(
         'valign': 'top'
     })
 
-    total_play_time = _calculate_total_play_time(data)
+    total_play_time = _calculate_total_play_time(data, total_play_seconds)
     worksheet.write(
         final_row + 2, 0,
         f"Итого общий хронометраж Произведений за Отчетный период: {total_play_time}",
@@ -1,3 +1,5 @@
+import time
+
 from .backend.service import BackendService
 from .frontend.window import Window
 
@@ -10,26 +12,47 @@ from .frontend.style import UIStyles
 from .frontend.bindings import apply_global_bindings
 
 from .logging_config import set_logging_config
-from .eventbus import EventBus, TkDispatcher, QueueDispatcher
-from .enums import DispatcherType, HEADER, GROUP, STATE, ConfigKey
+from .eventbus import EventBus, Event, TkDispatcher, QueueDispatcher
+from .enums import DispatcherType, EventType, HEADER, GROUP, ConfigKey
 from .version import __version__
 
 
 def bootstrap():
+    started_at = time.perf_counter()
+
     # -------------------------------
     # Backend initialization
     # -------------------------------
     set_logging_config()
     backend = BackendService()
 
-    songs_table_cols_state = backend.sync_db.get_state(STATE.SONGS_COL_SIZE)
-    report_table_cols_state = backend.sync_db.get_state(STATE.REPORT_COL_SIZE)
-    monthly_path_state = backend.sync_db.get_state(STATE.MONTHLY_PATH)
-    quarterly_path_state = backend.sync_db.get_state(STATE.QUARTERLY_PATH)
-    songs_table_sort_state = backend.sync_db.get_state(STATE.SONGS_SORT)
-    report_table_sort_state = backend.sync_db.get_state(STATE.REPORT_SORT)
-
-    settings_dict = backend.sync_db.get_settings()
+    snapshot = backend.sync_db.load_bootstrap_snapshot()
+    settings_dict = snapshot.settings
+    backend.sync_db.apply_sqlite_profile(settings_dict.get(ConfigKey.SQLITE_PROFILE))
+
+    # При потоковом старте окно показывается с пустыми таблицами,
+    # строки приходят порциями из потока БД после запуска EventBus.
+    # Без потокового старта строки берутся из снимка таблицы на диске, если
+    # он совпадает с базой, иначе читаются из БД.
+    progressive = settings_dict.get(ConfigKey.PROGRESSIVE_STARTUP)
+    table_rows = {HEADER.SONGS: [], HEADER.REPORT: []}
+    table_order = {HEADER.SONGS: None, HEADER.REPORT: None}
+    sort_states = {HEADER.SONGS: snapshot.songs_sort, HEADER.REPORT: snapshot.report_sort}
+    if progressive:
+        loading_started_at = started_at
+    else:
+        for table_name in table_rows:
+            table_snapshot = backend.sync_db.load_table_snapshot(table_name)
+            if table_snapshot is None:
+                table_rows[table_name] = backend.sync_db.get_all_rows(table_name)
+                continue
+            table_rows[table_name] = table_snapshot.rows
+            if table_snapshot.sort_state == sort_states[table_name]:
+                table_order[table_name] = table_snapshot.order
+        loading_started_at = None
+        # Дальше с базой работает только поток DB-диспетчера: соединение
+        # главного потока закрывается, чтобы не держать блокировку SQLite.
+        backend.sync_db.release_connections()
 
     # -------------------------------
     # UI initialization
@@ -51,30 +74,35 @@ def bootstrap():
         parent=window.content,
         group_id=GROUP.SONGS_TABLE,
         header_map=FIELD_MAPS.get(HEADER.SONGS),
-        data=backend.sync_db.get_all_rows(HEADER.SONGS),
+        data=table_rows[HEADER.SONGS],
         stretchable_column_indices=[1, 2, 4, 5, 6],
         enable_tooltips=settings_dict.get(ConfigKey.SONG_TOOLTIPS),
         show_table_end=True,
         default_report_values=DEFAULT_CARD_VALUES[HEADER.REPORT],
-        prev_cols_state=songs_table_cols_state,
-        sort_key_state=songs_table_sort_state
+        prev_cols_state=snapshot.songs_col_size,
+        sort_key_state=snapshot.songs_sort,
+        loading_started_at=loading_started_at,
+        sorted_keys=table_order[HEADER.SONGS]
     )
 
     report = ReportTable(
         parent=window.content,
         group_id=GROUP.REPORT_TABLE,
         header_map=FIELD_MAPS.get(HEADER.REPORT),
-        data=backend.sync_db.get_all_rows(HEADER.REPORT),
+        data=table_rows[HEADER.REPORT],
         stretchable_column_indices=[3, 4, 7, 8, 12],
         enable_tooltips=settings_dict.get(ConfigKey.REPORT_TOOLTIPS),
         show_table_end=True,
-        prev_cols_state=report_table_cols_state,
-        sort_key_state=report_table_sort_state
+        prev_cols_state=snapshot.report_col_size,
+        sort_key_state=snapshot.report_sort,
+        virtual_scroll=True,
+        loading_started_at=loading_started_at,
+        sorted_keys=table_order[HEADER.REPORT]
     )
     export = Export(
         parent=window.content,
-        monthly_path=monthly_path_state,
-        quarterly_path=quarterly_path_state
+        monthly_path=snapshot.monthly_path,
+        quarterly_path=snapshot.quarterly_path
     )
     settings = Settings(
         parent=window.content,
@@ -130,8 +158,21 @@ def bootstrap():
     EventBus.register_dispatcher(DispatcherType.TABLE, table_dispatcher)
     EventBus.register_dispatcher(DispatcherType.COMMON, common_dispatcher)
 
+    # Снимки таблиц дописываются после остановки диспетчеров, с порядком строк
+    # из буферов, чтобы следующий старт обошёлся без сортировки.
+    EventBus.register_flush(lambda: backend.sync_db.save_snapshots({
+        HEADER.SONGS: songs.table.buffer.sorted_keys,
+        HEADER.REPORT: report.table.buffer.sorted_keys,
+    }))
+
     EventBus.start()
 
+    if progressive:
+        EventBus.publish(
+            Event(event_type=EventType.VIEW.UI.STREAM_TABLES),
+            [HEADER.SONGS, HEADER.REPORT]
+        )
+
     # -------------------------------
     # Start main application loop
     # -------------------------------
@@ -1,7 +1,9 @@
-from typing import List, Any
-from dataclasses import dataclass
+from typing import List, Any, Dict, Optional, Tuple
+from dataclasses import dataclass, field
 from pathlib import Path
 
+from .enums import ConfigKey
+
 
 @dataclass
 class BaseReport:
@@ -21,6 +23,8 @@ class BaseReport:
 
 class MonthReport(BaseReport):
     month: int
+    # Сводный режим: одна строка на произведение с суммой исполнений
+    aggregated: bool
 
     def __init__(
             self,
@@ -28,9 +32,11 @@ class MonthReport(BaseReport):
             year: int,
             file_format: str,
             save_path: str,
-            data: List[List[Any]]
+            data: List[List[Any]],
+            aggregated: bool = False
     ):
         self.month = month
+        self.aggregated = aggregated
         super().__init__(year=year, file_format=file_format, save_path=save_path, data=data)
 
     def generate_filename(self) -> str:
@@ -44,6 +50,8 @@ class MonthReport(BaseReport):
 
 class QuarterReport(BaseReport):
     quarter: int
+    # Суммарное время звучания за квартал в секундах, посчитанное в БД
+    total_play_seconds: Optional[int]
 
     def __init__(
             self,
@@ -51,10 +59,24 @@ class QuarterReport(BaseReport):
             year: int,
             file_format: str,
             save_path: str,
-            data: List[List[Any]]
+            data: List[List[Any]],
+            total_play_seconds: Optional[int] = None
     ):
         self.quarter = quarter
+        self.total_play_seconds = total_play_seconds
         super().__init__(year=year, file_format=file_format, save_path=save_path, data=data)
 
     def generate_filename(self) -> str:
         return f"РАО {self.quarter}-й квартал {self.year} г.{self.file_format}"
+
+
+@dataclass
+class BootstrapSnapshot:
+    """Состояние UI и настройки, нужные для построения окна на старте."""
+    songs_col_size: Optional[Dict[str, int]] = None
+    report_col_size: Optional[Dict[str, int]] = None
+    monthly_path: Optional[str] = None
+    quarterly_path: Optional[str] = None
+    songs_sort: Optional[Tuple[int, str, int]] = None
+    report_sort: Optional[Tuple[int, str, int]] = None
+    settings: Dict[ConfigKey, Any] = field(default_factory=dict)
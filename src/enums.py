@@ -55,6 +55,13 @@ class DispatcherType(str, Enum):
     COMMON = "COMMON"
 
 
+class CoalesceMode(str, Enum):
+    """Политики слияния однотипных событий в EventBus"""
+    LATEST = "LATEST"
+    DEBOUNCE = "DEBOUNCE"
+    THROTTLE = "THROTTLE"
+
+
 class GROUP(str, Enum):
     SONGS_TABLE = "songs"
     REPORT_TABLE = "report"
@@ -81,6 +88,8 @@ class ConfigKey(str, Enum):
     CARD_PIN = "CARD_PIN"
     SONG_TOOLTIPS = "SONG_TOOLTIPS"
     REPORT_TOOLTIPS = "REPORT_TOOLTIPS"
+    PROGRESSIVE_STARTUP = "PROGRESSIVE_STARTUP"
+    SQLITE_PROFILE = "SQLITE_PROFILE"
     # etc.
 
 
@@ -99,8 +108,15 @@ class EventType:
             # SETTINGS = "BACK.DB.SETTINGS"
             # DEFAULT_SETTINGS = "BACK.DB.DEFAULT_SETTINGS"
             TABLE = "BACK.DB.TABLE"
+            # Порция строк таблицы при потоковой загрузке на старте.
+            TABLE_CHUNK = "BACK.DB.TABLE_CHUNK"
+            # Страница строк таблицы по запросу REQUEST_PAGE.
+            TABLE_PAGE = "BACK.DB.TABLE_PAGE"
             CARD_VALUES = "BACK.DB.CARD_VALUES"
-            CARD_DICT = "BACK.DB.CARD_DICT"
+            # Строки пакетного сохранения, одно обновление таблицы на пачку.
+            CARDS_VALUES = "BACK.DB.CARDS_VALUES"
+            # Сброс отложенных записей состояния UI в БД.
+            FLUSH_STATE = "BACK.DB.FLUSH_STATE"
             REPORT = "BACK.DB.REPORT"
             VALIDATION = "BACK.DB.VALIDATION"
 
@@ -120,6 +136,8 @@ class EventType:
             SMALL = "VIEW.TERM.SMALL"
             MEDIUM = "VIEW.TERM.MEDIUM"
             LARGE = "VIEW.TERM.LARGE"
+            # Вывод метрик EventBus в терминал
+            METRICS = "VIEW.TERM.METRICS"
 
         class TABLE:
             class PANEL:
@@ -137,11 +155,14 @@ class EventType:
                 MANUAL_COL_SIZE = "VIEW.TABLE.DT.MANUAL_COL_SIZE"
                 AUTO_COL_SIZE = "VIEW.TABLE.DT.AUTO_COL_SIZE",
                 CLONE_ITEM = "VIEW.TABLE.DT.CLONE_ITEM",
+                # Запрос страницы строк при прокрутке или поиске по истории.
+                REQUEST_PAGE = "VIEW.TABLE.DT.REQUEST_PAGE"
 
             class BUFFER:
                 FILTERED_TABLE = "VIEW.TABLE.FILTERED_TABLE"
                 CARD_UPDATED = "VIEW.TABLE.CARD_UPDATED"
                 INVISIBLE_ID = "VIEW.TABLE.INVISIBLE_ID"
+                LOAD_PROGRESS = "VIEW.TABLE.LOAD_PROGRESS"
 
             HEADER_TOOLTIPS_STATE = "VIEW.TABLE.HEADER_TOOLTIPS_STATE"
 
@@ -150,6 +171,9 @@ class EventType:
 
         class CARD:
             SAVE = "VIEW.CARD.SAVE"
+            SAVE_MANY = "VIEW.CARD.SAVE_MANY"
+            # Запрос словаря карточки из БД через EventBus.request
+            FETCH = "VIEW.CARD.FETCH"
             DESTROY = "VIEW.CARD.DESTROY"
 
         class EXPORT:
@@ -164,6 +188,7 @@ class EventType:
 
         class UI:
             CLOSE_WINDOW = "VIEW.UI.CLOSE_WINDOW"
+            STREAM_TABLES = "VIEW.UI.STREAM_TABLES"
 
     # PLACEHOLDER
     FAKE_EVENT = "FAKE_EVENT"
@@ -1,13 +1,35 @@
 import logging
+import sys
 import threading
+import time
 import queue
-from typing import Callable, Dict, List, Optional, Union
-from collections import defaultdict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple, Union
+from collections import defaultdict, deque
 from abc import ABC, abstractmethod
+from concurrent.futures import Future, InvalidStateError
+from dataclasses import dataclass
 
 from tkinter import Tk
 
-from .enums import EventType, DispatcherType, GROUP
+from .enums import EventType, DispatcherType, GROUP, CoalesceMode
+
+
+@dataclass(frozen=True)
+class CoalescePolicy:
+    """
+    How events of one type and group are merged before dispatch.
+
+    LATEST   — a queued event is dropped if a newer one with the same key
+               is already published.
+    DEBOUNCE — the latest event is delivered delay_ms after the last publish.
+    THROTTLE — at most one delivery per delay_ms, the latest event wins.
+
+    key is called with the publish arguments and splits events of one
+    type and group further, e.g. by the state key they carry.
+    """
+    mode: CoalesceMode
+    delay_ms: int = 0
+    key: Optional[Callable[..., Hashable]] = None
 
 
 class Event:
@@ -15,9 +37,88 @@ class Event:
             self,
             event_type: Union[str, EventType],
             group_id: Optional[GROUP] = None,
+            policy: Optional[CoalescePolicy] = None,
     ):
         self.event_type = event_type
         self.group_id = group_id
+        # Политика слияния, заданная публикатором, важнее зарегистрированной
+        self.policy = policy
+
+
+class Histogram:
+    """Duration histogram in milliseconds with fixed bucket bounds."""
+
+    BOUNDS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+    def __init__(self):
+        self.buckets = [0] * (len(self.BOUNDS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, ms: float):
+        index = 0
+        while index < len(self.BOUNDS_MS) and ms > self.BOUNDS_MS[index]:
+            index += 1
+        self.buckets[index] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def percentile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th percentile, capped by the maximum."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, bucket in enumerate(self.buckets):
+            seen += bucket
+            if seen >= rank and bucket:
+                return min(float(self.BOUNDS_MS[index]), self.max_ms) \
+                    if index < len(self.BOUNDS_MS) else self.max_ms
+        return self.max_ms
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+
+
+class BusMetrics:
+    """
+    Counters of EventBus and its dispatchers:
+    - peak queue depth per queue ("bus" and each dispatcher);
+    - wait time per stage: "bus" — publish → bus worker, dispatcher type —
+      dispatch → handler start;
+    - handler duration per event type, with a warning for slow handlers.
+    """
+
+    SLOW_HANDLER_MS = 100
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.peak_depth: Dict[str, int] = defaultdict(int)
+        self.waits: Dict[str, Histogram] = defaultdict(Histogram)
+        self.handlers: Dict[str, Histogram] = defaultdict(Histogram)
+        self.slow: Dict[str, int] = defaultdict(int)
+
+    def observe_depth(self, queue_name: str, depth: int):
+        if depth > self.peak_depth[queue_name]:
+            with self._lock:
+                self.peak_depth[queue_name] = max(self.peak_depth[queue_name], depth)
+
+    def record_wait(self, stage: str, seconds: float):
+        with self._lock:
+            self.waits[stage].add(seconds * 1000)
+
+    def record_handler(self, event_type: str, seconds: float) -> bool:
+        """Record a handler run, True if it was slow."""
+        ms = seconds * 1000
+        slow = ms > self.SLOW_HANDLER_MS
+        with self._lock:
+            self.handlers[event_type].add(ms)
+            if slow:
+                self.slow[event_type] += 1
+        return slow
 
 
 # Dispatcher interface
@@ -29,20 +130,76 @@ class Dispatcher(ABC):
         """Execute the callback with given arguments."""
         raise NotImplementedError
 
+    def depth(self) -> int:
+        """Number of callbacks waiting for execution."""
+        return 0
+
     def stop(self):
         """Gracefully stop the dispatcher (if applicable)."""
         pass
 
 
 class TkDispatcher(Dispatcher):
-    """Dispatcher for routing callbacks via Tkinter event loop."""
+    """
+    Dispatcher for routing callbacks via Tkinter event loop.
+
+    Callbacks are collected in a deque and the Tk loop is woken once per
+    batch. Each tick drains the deque for up to FRAME_BUDGET seconds; the
+    rest is rescheduled after RESCHEDULE_MS, so redraws and user input are
+    processed between the parts of a burst.
+    """
+
+    FRAME_BUDGET = 0.008
+    RESCHEDULE_MS = 1
 
     def __init__(self, tk: Tk):
         self.tk = tk
+        self._pending = deque()
+        self._lock = threading.Lock()
+        self._scheduled = False
+        self._stopped = False
 
     def dispatch(self, callback: Callable, *args, **kwargs):
-        """Schedule callback execution in Tkinter's main loop."""
-        self.tk.after(0, lambda _=None: callback(*args, **kwargs))
+        """Queue callback execution in Tkinter's main loop."""
+        if self._stopped:
+            return
+        self._pending.append((callback, args, kwargs))
+        with self._lock:
+            if self._scheduled or self._stopped:
+                return
+            self._scheduled = True
+        self.tk.after(0, self._drain)
+
+    def depth(self) -> int:
+        return len(self._pending)
+
+    def _drain(self):
+        deadline = time.perf_counter() + self.FRAME_BUDGET
+        while True:
+            if not self._pending:
+                with self._lock:
+                    # Проверка под тем же локом, что и в dispatch: задача,
+                    # добавленная после неё, сама разбудит цикл заново
+                    if not self._pending:
+                        self._scheduled = False
+                        return
+            callback, args, kwargs = self._pending.popleft()
+            try:
+                callback(*args, **kwargs)
+            except Exception:
+                # Как при отдельном tk.after: ошибка печатается Tk и не
+                # останавливает остальные колбэки пачки
+                self.tk.report_callback_exception(*sys.exc_info())
+
+            if self._pending and time.perf_counter() >= deadline:
+                self.tk.after(self.RESCHEDULE_MS, self._drain)
+                return
+
+    def stop(self):
+        """Drop pending callbacks, the window is being closed."""
+        with self._lock:
+            self._stopped = True
+            self._pending.clear()
 
 
 class QueueDispatcher(Dispatcher):
@@ -50,7 +207,6 @@ class QueueDispatcher(Dispatcher):
 
     def __init__(self):
         self._queue = queue.Queue()
-        self._stop_event = threading.Event()
         self._thread = threading.Thread(target=self._worker, daemon=True)
         self._thread.start()
 
@@ -58,8 +214,12 @@ class QueueDispatcher(Dispatcher):
         """Enqueue the callback for execution in a background thread."""
         self._queue.put(lambda: callback(*args, **kwargs))
 
+    def depth(self) -> int:
+        return self._queue.qsize()
+
     def _worker(self):
-        while not self._stop_event.is_set():
+        # Очередь дорабатывается до метки None из stop()
+        while True:
             task = self._queue.get()
             if task is None:
                 break
@@ -70,7 +230,6 @@ class QueueDispatcher(Dispatcher):
 
     def stop(self):
         """Stop dispatcher gracefully after completing pending tasks."""
-        self._stop_event.set()
         self._queue.put(None)
         self._thread.join()
 
@@ -81,17 +240,25 @@ class Subscriber:
 
     If dispatcher_type is set, the callback is routed through the corresponding
     dispatcher (e.g. Tk, thread queue). If None, DEFAULT is used.
+
+    A policy, if given, is registered for the event type and the subscriber's
+    group on subscribe (see EventBus.set_policy). Events are coalesced before
+    delivery, so the policy applies to every subscriber of that route, not
+    only to this one. It is removed when the last subscriber that brought it
+    unsubscribes.
     """
 
     def __init__(
             self,
             callback: Callable,
             route_by: DispatcherType,
-            group_id: Optional[GROUP] = None
+            group_id: Optional[GROUP] = None,
+            policy: Optional[CoalescePolicy] = None
     ):
         self.callback = callback
         self.route_by = route_by
         self.group_id = group_id
+        self.policy = policy
 
 
 class EventBus:
@@ -120,14 +287,33 @@ class EventBus:
     """
 
     _subscribers: Dict[Union[str, EventType], List[Subscriber]] = defaultdict(list)
+    # Таблица маршрутов (event_type, group_id) -> подписчики. Пересобирается
+    # целиком при подписке/отписке и подменяется одной ссылкой, поэтому
+    # publish и _worker читают её без блокировки.
+    _routes: Dict[Tuple[Union[str, EventType], Optional[GROUP]], Tuple[Subscriber, ...]] = {}
     _dispatchers: Dict[DispatcherType, Dispatcher] = {}
     _event_queue = queue.Queue()
     _lock = threading.RLock()
-    _stop_event = threading.Event()
     _thread: Optional[threading.Thread] = None
     _started = False
+    _flush_callbacks: List[Callable[[], None]] = []
     _logger = logging.getLogger(__name__)
 
+    # Слияние событий. Ключ слияния: (event_type, group_id, policy.key(*args)).
+    _policies: Dict[Tuple[Union[str, EventType], Optional[GROUP]], CoalescePolicy] = {}
+    # Подписчики, принёсшие политику маршрута, в порядке подписки: действует
+    # политика последнего, с уходом всех политика снимается.
+    _policy_owners: Dict[Tuple[Union[str, EventType], Optional[GROUP]], List[Subscriber]] = {}
+    _coalesce_lock = threading.Lock()
+    # Номер последней публикации по ключу — для LATEST
+    _latest: Dict[Hashable, int] = {}
+    # Отложенные DEBOUNCE/THROTTLE события и время последней доставки THROTTLE,
+    # с ними работает только поток _worker
+    _deferred: Dict[Hashable, Tuple[float, CoalescePolicy, Event, tuple, dict]] = {}
+    _last_delivery: Dict[Hashable, float] = {}
+
+    metrics = BusMetrics()
+
     @classmethod
     def start(cls):
         """Start the event worker thread if not already running."""
@@ -141,13 +327,43 @@ class EventBus:
     def register_dispatcher(cls, dispatcher_type: DispatcherType, dispatcher: Dispatcher):
         """Register a dispatcher to handle callbacks of a given type."""
         with cls._lock:
-            cls._dispatchers[dispatcher_type] = dispatcher
+            cls._dispatchers = {**cls._dispatchers, dispatcher_type: dispatcher}
+
+    @classmethod
+    def register_flush(cls, callback: Callable[[], None]):
+        """
+        Register a callback that is run once the dispatchers have stopped,
+        e.g. to flush write-behind caches before exit.
+        """
+        with cls._lock:
+            cls._flush_callbacks.append(callback)
+
+    @classmethod
+    def set_policy(cls, event_type: Union[str, EventType], policy: Optional[CoalescePolicy],
+                   group_id: Optional[GROUP] = None):
+        """
+        Set the coalescing policy for an event type and group. A policy for
+        group None applies to every group without its own policy.
+        Pass None to remove the policy.
+        """
+        with cls._lock:
+            policies = dict(cls._policies)
+            if policy is None:
+                policies.pop((event_type, cls._route_group(group_id)), None)
+            else:
+                policies[(event_type, cls._route_group(group_id))] = policy
+            cls._policies = policies
 
     @classmethod
     def subscribe(cls, event_type: Union[str, EventType], subscriber: Subscriber):
         """Subscribe a callback to an event."""
         with cls._lock:
             cls._subscribers[event_type].append(subscriber)
+            cls._rebuild_routes(event_type)
+            if subscriber.policy is not None:
+                key = (event_type, cls._route_group(subscriber.group_id))
+                cls._policy_owners.setdefault(key, []).append(subscriber)
+                cls.set_policy(event_type, subscriber.policy, subscriber.group_id)
 
     @classmethod
     def unsubscribe(cls, event_type: Union[str, EventType], subscriber: Subscriber):
@@ -155,43 +371,284 @@ class EventBus:
         with cls._lock:
             if subscriber in cls._subscribers.get(event_type, []):
                 cls._subscribers[event_type].remove(subscriber)
+                cls._rebuild_routes(event_type)
+                if subscriber.policy is not None:
+                    cls._release_policy(event_type, subscriber)
+
+    @classmethod
+    def _release_policy(cls, event_type: Union[str, EventType], subscriber: Subscriber):
+        """Снимает политику отписавшегося подписчика, вызывается под _lock."""
+        key = (event_type, cls._route_group(subscriber.group_id))
+        owners = cls._policy_owners.get(key, [])
+        if subscriber in owners:
+            owners.remove(subscriber)
+        if owners:
+            cls.set_policy(event_type, owners[-1].policy, subscriber.group_id)
+        else:
+            cls._policy_owners.pop(key, None)
+            cls.set_policy(event_type, None, subscriber.group_id)
+
+    @staticmethod
+    def _route_group(group_id) -> Optional[GROUP]:
+        """GROUP, HEADER и строки с тем же значением дают один ключ маршрута."""
+        if group_id is None or isinstance(group_id, GROUP):
+            return group_id
+        try:
+            return GROUP(group_id)
+        except ValueError:
+            return group_id
+
+    @classmethod
+    def _rebuild_routes(cls, event_type: Union[str, EventType]):
+        """
+        Copy-on-write rebuild of the routes of one event type, called under _lock.
+
+        💡 Событие группы G получают подписчики с group_id G и подписчики без
+        группы. Событие без группы (`event.group_id is None`) считается **общим**
+        и доставляется только подписчикам без группы.
+        """
+        subscribers = cls._subscribers.get(event_type, [])
+        groups = {cls._route_group(s.group_id) for s in subscribers} | {None}
+        routes = {key: value for key, value in cls._routes.items() if key[0] != event_type}
+        for group_id in groups:
+            route = tuple(s for s in subscribers
+                          if s.group_id is None or cls._route_group(s.group_id) == group_id)
+            if route:
+                routes[(event_type, group_id)] = route
+        cls._routes = routes
 
     @classmethod
     def publish(cls, event: Event, *args, **kwargs):
         """Publish an event with optional arguments to all subscribers."""
-        cls._event_queue.put((event, args, kwargs))
+        group_id = cls._route_group(event.group_id)
+        policies = cls._policies
+        policy = event.policy or policies.get((event.event_type, group_id)) \
+            or policies.get((event.event_type, None))
+        coalesce = None
+        if policy is not None:
+            key = (event.event_type, group_id,
+                   policy.key(*args, **kwargs) if policy.key else None)
+            with cls._coalesce_lock:
+                seq = cls._latest[key] = cls._latest.get(key, 0) + 1
+            coalesce = (policy, key, seq, time.monotonic())
+        cls._event_queue.put((event, args, kwargs, coalesce, time.perf_counter()))
+        cls.metrics.observe_depth("bus", cls._event_queue.qsize())
+
+    @classmethod
+    def request(
+            cls,
+            event: Event,
+            *args,
+            on_reply: Optional[Callable[[Any], None]] = None,
+            on_error: Optional[Callable[[BaseException], None]] = None,
+            reply_by: DispatcherType = DispatcherType.TK,
+            timeout: Optional[float] = None,
+            **kwargs
+    ) -> Future:
+        """
+        Send a request to the first subscriber of the event and return a Future
+        with the value its callback returns.
+
+        The request is queued in order with published events and is not
+        coalesced. on_reply / on_error are run through the reply_by dispatcher.
+        The Future fails with TimeoutError if the handler has not finished
+        timeout seconds after it started (time spent waiting in the queues
+        is not counted) and with LookupError if nobody handles the event.
+        Cancelling the Future before the handler starts skips the handler
+        and the reply.
+        """
+        future: Future = Future()
+        if on_reply is not None or on_error is not None:
+            future.add_done_callback(
+                lambda done: cls._route_reply(done, event, on_reply, on_error, reply_by))
+
+        cls._event_queue.put((event, args, kwargs, None, time.perf_counter(), future, timeout))
+        cls.metrics.observe_depth("bus", cls._event_queue.qsize())
+        return future
+
+    @classmethod
+    def _start_timeout(cls, future: Future, event: Event, timeout: float):
+        timer = threading.Timer(timeout, cls._expire_request, args=(future, event, timeout))
+        timer.daemon = True
+        timer.start()
+        future.add_done_callback(lambda _: timer.cancel())
+
+    @staticmethod
+    def _expire_request(future: Future, event: Event, timeout: float):
+        try:
+            future.set_exception(TimeoutError(f"No reply to {event.event_type} in {timeout} s"))
+        except InvalidStateError:
+            pass
+
+    @classmethod
+    def _route_reply(cls, future: Future, event: Event, on_reply: Optional[Callable],
+                     on_error: Optional[Callable], reply_by: DispatcherType):
+        """Hand the result of a request over to the caller's dispatcher."""
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None and on_error is None:
+            cls._logger.warning(f"Request {event.event_type} failed: {error!r}")
+            return
+        callback, value = (on_error, error) if error is not None else (on_reply, future.result())
+        if callback is None:
+            return
+        dispatcher = cls._dispatchers.get(reply_by)
+        if dispatcher:
+            dispatcher.dispatch(callback, value)
+        else:
+            cls._logger.warning(f"Dispatcher not registered for type: {reply_by}")
 
     @classmethod
     def _worker(cls):
         """Internal worker loop that processes the event queue."""
-        while not cls._stop_event.is_set():
-            task = cls._event_queue.get()
+        # Очередь разбирается до метки None из stop_all_dispatchers, чтобы
+        # опубликованные перед выходом и отложенные события не терялись
+        while True:
+            try:
+                task = cls._event_queue.get(timeout=cls._deferred_timeout(time.monotonic()))
+            except queue.Empty:
+                cls._release_deferred(time.monotonic())
+                continue
             if task is None:
+                cls._release_deferred(time.monotonic(), force=True)
                 break
-            event, args, kwargs = task
-            for subscriber in cls._subscribers.get(event.event_type, []):
-                # 💡 Событие доставляется только подписчикам, у которых
-                # `subscriber.group_id` совпадает с `event.group_id`.
-                # Если `event.group_id is None`, оно считается **общим** и доставляется
-                # только подписчикам без группы (`subscriber.group_id is None`).
-                if subscriber.group_id is not None and subscriber.group_id != event.group_id:
-                    continue
-
-                dispatcher = cls._dispatchers.get(subscriber.route_by)
-
-                if dispatcher:
-                    dispatcher.dispatch(subscriber.callback, *args, **kwargs)
+            cls._handle(*task)
+            cls._event_queue.task_done()
+            cls._release_deferred(time.monotonic())
+
+    @classmethod
+    def _handle(cls, event: Event, args: tuple, kwargs: dict,
+                coalesce: Optional[Tuple[CoalescePolicy, Hashable, int, float]],
+                enqueued_at: float, future: Optional[Future] = None,
+                timeout: Optional[float] = None):
+        cls.metrics.record_wait("bus", time.perf_counter() - enqueued_at)
+        if future is not None:
+            cls._deliver_request(event, args, kwargs, future, timeout)
+            return
+        if coalesce is None:
+            cls._deliver(event, args, kwargs)
+            return
+
+        policy, key, seq, published_at = coalesce
+        if policy.mode == CoalesceMode.LATEST:
+            with cls._coalesce_lock:
+                superseded = cls._latest.get(key) != seq
+            if not superseded:
+                cls._deliver(event, args, kwargs)
+        elif policy.mode == CoalesceMode.DEBOUNCE:
+            cls._deferred[key] = (published_at + policy.delay_ms / 1000, policy, event, args, kwargs)
+        elif policy.mode == CoalesceMode.THROTTLE:
+            due = cls._last_delivery.get(key, float("-inf")) + policy.delay_ms / 1000
+            if key not in cls._deferred and due <= published_at:
+                cls._last_delivery[key] = published_at
+                cls._deliver(event, args, kwargs)
+            else:
+                cls._deferred[key] = (due, policy, event, args, kwargs)
+
+    @classmethod
+    def _deferred_timeout(cls, now: float) -> Optional[float]:
+        """Seconds until the nearest deferred event is due, None if there are none."""
+        if not cls._deferred:
+            return None
+        return max(0.0, min(entry[0] for entry in cls._deferred.values()) - now)
+
+    @classmethod
+    def _release_deferred(cls, now: float, force: bool = False):
+        """Deliver deferred events that are due (all of them if force)."""
+        for key, (due, policy, event, args, kwargs) in list(cls._deferred.items()):
+            if force or due <= now:
+                del cls._deferred[key]
+                if policy.mode == CoalesceMode.THROTTLE:
+                    cls._last_delivery[key] = now
+                cls._deliver(event, args, kwargs)
+
+    @classmethod
+    def _deliver(cls, event: Event, args: tuple, kwargs: dict):
+        """Route the event to the dispatchers of its subscribers."""
+        for subscriber in cls._route(event):
+            dispatcher = cls._dispatchers.get(subscriber.route_by)
+
+            if dispatcher:
+                dispatcher.dispatch(cls._timed(subscriber, event.event_type), *args, **kwargs)
+                cls.metrics.observe_depth(subscriber.route_by.value, dispatcher.depth())
+            else:
+                cls._logger.warning(
+                    f"Dispatcher not registered for type: {subscriber.route_by}"
+                )
+
+    @classmethod
+    def _route(cls, event: Event) -> Tuple[Subscriber, ...]:
+        routes = cls._routes
+        event_type, group_id = event.event_type, cls._route_group(event.group_id)
+        subscribers = routes.get((event_type, group_id))
+        if subscribers is None:
+            # У группы нет своих подписчиков — только подписчики без группы
+            subscribers = routes.get((event_type, None), ())
+        return subscribers
+
+    @classmethod
+    def _deliver_request(cls, event: Event, args: tuple, kwargs: dict, future: Future,
+                         timeout: Optional[float] = None):
+        """Run the first subscriber of the event and resolve the future with its result."""
+        subscribers = cls._route(event)
+        dispatcher = cls._dispatchers.get(subscribers[0].route_by) if subscribers else None
+        if dispatcher is None:
+            try:
+                future.set_exception(LookupError(f"No handler for request {event.event_type}"))
+            except InvalidStateError:
+                pass
+            return
+
+        handler = cls._timed(subscribers[0], event.event_type)
+
+        def respond(*call_args, **call_kwargs):
+            try:
+                if not future.set_running_or_notify_cancel():
+                    return  # отменён до запуска
+            except RuntimeError:
+                return  # уже завершён
+            # Таймаут отсчитывается от запуска обработчика: пока диспетчер
+            # занят (например, потоковой загрузкой таблиц), запрос не истекает
+            if timeout is not None:
+                cls._start_timeout(future, event, timeout)
+            try:
+                try:
+                    result = handler(*call_args, **call_kwargs)
+                except Exception as e:
+                    future.set_exception(e)
                 else:
+                    future.set_result(result)
+            except InvalidStateError:
+                pass  # таймаут сработал, пока обработчик работал
+
+        dispatcher.dispatch(respond, *args, **kwargs)
+        cls.metrics.observe_depth(subscribers[0].route_by.value, dispatcher.depth())
+
+    @classmethod
+    def _timed(cls, subscriber: Subscriber, event_type: Union[str, EventType]) -> Callable:
+        """Wrap the subscriber callback to measure its wait in the dispatcher and its duration."""
+        callback, stage, dispatched_at = subscriber.callback, subscriber.route_by.value, time.perf_counter()
+
+        def run(*args, **kwargs):
+            started = time.perf_counter()
+            cls.metrics.record_wait(stage, started - dispatched_at)
+            try:
+                return callback(*args, **kwargs)
+            finally:
+                duration = time.perf_counter() - started
+                if cls.metrics.record_handler(str(event_type), duration):
                     cls._logger.warning(
-                        f"Dispatcher not registered for type: {subscriber.route_by}"
+                        f"Slow handler {getattr(callback, '__qualname__', callback)!s} "
+                        f"for {event_type}: {duration * 1000:.0f} ms"
                     )
-            cls._event_queue.task_done()
+
+        return run
 
     @classmethod
     def stop_all_dispatchers(cls):
         """Stop the event thread and all registered dispatchers."""
         with cls._lock:
-            cls._stop_event.set()
             cls._event_queue.put(None)
 
             if cls._thread:
@@ -201,6 +658,12 @@ class EventBus:
             for dispatcher in cls._dispatchers.values():
                 dispatcher.stop()
 
+            for callback in cls._flush_callbacks:
+                try:
+                    callback()
+                except Exception:
+                    cls._logger.exception(f"Flush callback failed: {callback!r}")
+
     @classmethod
     def render_subscriber_map(cls) -> str:
         """Render a table of all current subscribers for debugging."""
@@ -226,3 +689,32 @@ class EventBus:
                 lines.append("-" * sep_len)
 
             return "\n".join(lines)
+
+    @classmethod
+    def render_metrics(cls) -> str:
+        """Render queue depths, wait times and handler durations for debugging."""
+        metrics = cls.metrics
+        with cls._lock:
+            depths = {"bus": cls._event_queue.qsize()}
+            depths.update({key.value: d.depth() for key, d in cls._dispatchers.items()})
+
+        sep_len = 90
+        lines = [f"{'QUEUE':<30} | {'DEPTH':>8} | {'PEAK':>8}", "=" * sep_len]
+        for name in sorted(set(depths) | set(metrics.peak_depth), key=lambda n: (n != "bus", n)):
+            lines.append(f"{name:<30} | {depths.get(name, 0):>8} | {metrics.peak_depth[name]:>8}")
+
+        def histogram_lines(title: str, histograms: Dict[str, Histogram], slow: bool):
+            lines.append("")
+            lines.append(f"{title:<30} | {'COUNT':>8} | {'AVG':>8} | {'P50':>8} | "
+                         f"{'P95':>8} | {'MAX':>8}" + (f" | {'SLOW':>5}" if slow else ""))
+            lines.append("=" * sep_len)
+            for name, hist in sorted(histograms.items()):
+                line = (f"{name:<30} | {hist.count:>8} | {hist.mean_ms:>8.2f} | "
+                        f"{hist.percentile(0.5):>8.1f} | {hist.percentile(0.95):>8.1f} | "
+                        f"{hist.max_ms:>8.1f}")
+                lines.append(line + (f" | {metrics.slow[name]:>5}" if slow else ""))
+
+        with metrics._lock:
+            histogram_lines("WAIT, ms (queue -> start)", dict(metrics.waits), slow=False)
+            histogram_lines("HANDLER, ms (event type)", dict(metrics.handlers), slow=True)
+        return "\n".join(lines)
@@ -156,6 +156,8 @@ class Export(ttk.Frame):
             "Январь", "Февраль", "Март", "Апрель", "Май", "Июнь",
             "Июль", "Август", "Сентябрь", "Октябрь", "Ноябрь", "Декабрь"
         ]
+    # Режимы месячного отчёта: строка на каждое исполнение или сводка по произведениям
+    MONTH_MODES = ["По эфирам", "Сводный"]
 
     def __init__(
             self,
@@ -205,17 +207,19 @@ class Export(ttk.Frame):
         month_vars = {
             "month": StringVar(),
             "year": StringVar(),
+            "mode": StringVar(),
             "path": StringVar(value=self._monthly_path)
         }
         month_vars["month"].set(self.MONTHS[now.month - 1])
         month_vars["year"].set(str(now.year))
+        month_vars["mode"].set(self.MONTH_MODES[0])
 
         monthly_section = ExportSection(
             parent=container,
             title="Экспорт ежемесячного отчёта",
-            labels=[("Месяц:", "month"), ("Год:", "year")],
+            labels=[("Месяц:", "month"), ("Год:", "year"), ("Режим:", "mode")],
             variables=month_vars,
-            options={"month": self.MONTHS, "year": years},
+            options={"month": self.MONTHS, "year": years, "mode": self.MONTH_MODES},
             export_callback=self.export_monthly,
             state_key=STATE.MONTHLY_PATH
         )
@@ -256,7 +260,8 @@ class Export(ttk.Frame):
 
         export_report = MonthReport(
             month=month_index, year=int(year_str),
-            file_format=fmt, save_path=path, data=[]
+            file_format=fmt, save_path=path, data=[],
+            aggregated=vars["mode"].get() == self.MONTH_MODES[1]
         )
 
         EventBus.publish(Event(
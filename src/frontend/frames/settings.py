@@ -2,7 +2,7 @@ from abc import ABC, abstractmethod
 
 from typing import Dict, Any, List, Optional
 import tkinter as tk
-from tkinter import ttk, StringVar, BooleanVar
+from tkinter import ttk, StringVar, BooleanVar, messagebox
 
 from ..widgets import ScrolledFrame
 from ..icons import Icons
@@ -67,9 +67,10 @@ class CheckboxFrame(BaseFrame):
 class ComboboxFrame(BaseFrame):
     def __init__(self, parent, *, key: ConfigKey, value: Any, attr_name: str,
                  options: Dict[str, Any], event_type: Optional[EventType] = None,
-                 group_id: Optional[GROUP] = None):
+                 group_id: Optional[GROUP] = None, notice: Optional[str] = None):
         super().__init__(parent, key, attr_name, event_type, group_id)
         self.keys_map = options
+        self.notice = notice  # сообщение пользователю после смены значения
 
         # найти ключ, соответствующий значению
         reverse_map = {v: k for k, v in options.items()}
@@ -83,6 +84,11 @@ class ComboboxFrame(BaseFrame):
                              values=list(options.keys()), state="readonly")
         self.add_widget(combo)
 
+    def _on_var_changed(self, *_):
+        super()._on_var_changed()
+        if self.notice:
+            messagebox.showinfo("Настройки", self.notice)
+
     def _get_value(self, *_):
         val = self.var.get()
         return self.keys_map.get(val)
@@ -210,7 +216,32 @@ class SettingsWidgets(ttk.Frame):
                     "event_type": EventType.VIEW.SETTINGS.HEADER_TOOLTIPS_STATE,
                     "group_id": GROUP.REPORT_TABLE
                 },
+            },
+            {
+                "widget_type": CheckboxFrame,
+                "widget_args": {
+                    "key": ConfigKey.PROGRESSIVE_STARTUP,
+                    "attr_name": "Загружать таблицы после показа окна:",
+                    "event_type": None,
+                    "group_id": None
+                },
             }
+        ],
+        "База данных": [
+            {
+                "widget_type": ComboboxFrame,
+                "widget_args": {
+                    "key": ConfigKey.SQLITE_PROFILE,
+                    "attr_name": "Режим записи SQLite:",
+                    "event_type": None,
+                    "group_id": None,
+                    "options": {
+                        "Надёжный (fsync на каждый коммит)": "safe",
+                        "Быстрый (WAL)": "fast"
+                    },
+                    "notice": "Режим записи SQLite применится после перезапуска программы.",
+                },
+            },
         ]
     }
 
@@ -22,7 +22,11 @@ class TableWrapper(ttk.Frame):
             enable_tooltips: bool,
             show_table_end: bool,
             prev_cols_state: Optional[Dict[str, int]] = None,
-            sort_key_state: Optional[Tuple[str, int, str]] = None
+            sort_key_state: Optional[Tuple[str, int, str]] = None,
+            virtual_scroll: bool = False,
+            ngram_index: bool = False,
+            loading_started_at: Optional[float] = None,
+            sorted_keys: Optional[List[str]] = None
     ):
         super().__init__(parent)
         self.configure_grid()
@@ -30,6 +34,7 @@ class TableWrapper(ttk.Frame):
         self.table = Table(
             self, group_id, header_map, data, stretchable_column_indices,
             enable_tooltips, show_table_end, prev_cols_state, sort_key_state,
+            virtual_scroll, ngram_index, loading_started_at, sorted_keys
         )
         self.table.grid(row=0, column=0, sticky="nsew", pady=(3, 0))
 
@@ -56,11 +61,11 @@ class TableWrapper(ttk.Frame):
         )
 
     def _get_field_value(self, key: str):
-        selected_items = self.table.data_table.dt.selection()
+        selected_items = self.table.data_table.selection()
         original_id = selected_items[0]
         data = dict(zip(
             self.table.data_table._headers,
-            self.table.data_table.dt.item(original_id, "values")
+            self.table.data_table.row_values(original_id)
         ))
         self.clipboard_clear()
         self.clipboard_append(data.get(key, ""))
@@ -86,11 +91,16 @@ class SongsTable(TableWrapper):
             show_table_end: bool,
             default_report_values: Dict[str, Any],
             prev_cols_state: Optional[Dict[str, int]] = None,
-            sort_key_state: Optional[Tuple[str, int, str]] = None
+            sort_key_state: Optional[Tuple[str, int, str]] = None,
+            virtual_scroll: bool = False,
+            ngram_index: bool = False,
+            loading_started_at: Optional[float] = None,
+            sorted_keys: Optional[List[str]] = None
     ):
         super().__init__(
             parent, group_id, header_map, data, stretchable_column_indices,
-            enable_tooltips, show_table_end, prev_cols_state, sort_key_state
+            enable_tooltips, show_table_end, prev_cols_state, sort_key_state,
+            virtual_scroll, ngram_index, loading_started_at, sorted_keys
         )
         # Создаем дополнительную кнопку "В отчет".
         self._default_report_values = default_report_values
@@ -117,15 +127,32 @@ class SongsTable(TableWrapper):
         btn_report.pack(side="right", padx=5)
 
     def add_to_report(self):
-        selected = self.table.data_table.dt.selection()
-        if selected:
-            card_id = selected[0]
-        else:
+        selected = self.table.data_table.selection()
+        if not selected:
             messagebox.showwarning(
                 "Выбор песни",
                 "Пожалуйста, выберите песню для добавления в отчёт.")
             return
 
+        # Несколько песен после подтверждения сохраняются в отчёт одной
+        # пачкой, иначе первая открывается в карточке для правки.
+        if len(selected) > 1 and messagebox.askyesno(
+                "Добавление в отчёт",
+                f"Добавить выбранные песни ({len(selected)}) в отчёт без карточек?\n"
+                f"Дата и время будут заполнены значениями по умолчанию.\n\n"
+                f"«Нет» — открыть карточку первой песни."):
+            EventBus.publish(
+                Event(event_type=EventType.VIEW.CARD.SAVE_MANY),
+                GROUP.REPORT_TABLE, [self._report_card(card_id) for card_id in selected]
+            )
+            return
+
+        EventBus.publish(
+            Event(event_type=EventType.VIEW.TABLE.PANEL.ADD_CARD),
+            GROUP.REPORT_TABLE, self._report_card(selected[0]), True
+        )
+
+    def _report_card(self, card_id: str) -> Dict[str, str]:
         song = dict(zip(
             self.table.data_table._headers,
             self.table.buffer.original_data.get(card_id)
@@ -139,8 +166,4 @@ class SongsTable(TableWrapper):
         data["Лэйбл"] = song["Лэйбл"]
         data["Общий хронометраж"] = song["Общий хронометраж"]
         data["Длительность звучания"] = song["Общий хронометраж"]
-
-        EventBus.publish(
-            Event(event_type=EventType.VIEW.TABLE.PANEL.ADD_CARD),
-            GROUP.REPORT_TABLE, data, True
-        )
+        return data
@@ -1 +1,2 @@
-from .fio import FioInserter
\ No newline at end of file
+from .fio import FioInserter
+from .order_stat import OrderedKeys
@@ -0,0 +1,226 @@
+from typing import Dict, Iterable, Iterator, List, Tuple, Union
+
+
+class OrderedKeys:
+    """
+    Упорядоченный список уникальных ключей с быстрым поиском позиции.
+
+    Ключи хранятся блоками ограниченного размера, размеры блоков лежат
+    в дереве Фенвика, а для каждого ключа запоминается его блок. Поэтому
+    позиция ключа (rank), доступ по индексу, вставка и удаление стоят
+    O(log n) плюс сдвиг внутри одного блока, а не O(n) как у list.
+
+    Поддерживает ту часть интерфейса list, которой пользуется TableBuffer,
+    и сравнивается со списками поэлементно.
+    """
+
+    LOAD = 512  # Целевой размер блока, блок делится пополам при 2 * LOAD
+
+    def __init__(self, keys: Iterable[str] = ()):
+        self._build(list(keys))
+
+    # region Internal
+
+    def _build(self, keys: List[str]):
+        load = self.LOAD
+        self._blocks: List[List[str]] = [keys[i:i + load] for i in range(0, len(keys), load)]
+        self._len = len(keys)
+        self._block_of: Dict[str, List[str]] = {}
+        for block in self._blocks:
+            for key in block:
+                self._block_of[key] = block
+        if len(self._block_of) != self._len:
+            raise ValueError("Ключи OrderedKeys должны быть уникальны")
+        self._reindex_blocks()
+
+    def _reindex_blocks(self):
+        """Пересобирает номера блоков и дерево Фенвика по их размерам, O(число блоков)."""
+        self._block_pos: Dict[int, int] = {id(block): i for i, block in enumerate(self._blocks)}
+        tree = [0] * (len(self._blocks) + 1)
+        for i, block in enumerate(self._blocks, 1):
+            tree[i] += len(block)
+            parent = i + (i & -i)
+            if parent < len(tree):
+                tree[parent] += tree[i]
+        self._tree = tree
+
+    def _tree_add(self, block_idx: int, delta: int):
+        tree = self._tree
+        i = block_idx + 1
+        while i < len(tree):
+            tree[i] += delta
+            i += i & -i
+
+    def _prefix(self, block_idx: int) -> int:
+        """Количество ключей в блоках [0, block_idx)."""
+        tree = self._tree
+        total = 0
+        i = block_idx
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+    def _locate(self, index: int) -> Tuple[int, int]:
+        """Номер блока и смещение в нём для позиции 0 <= index < len."""
+        tree = self._tree
+        size = len(tree) - 1
+        pos = 0
+        step = 1 << (size.bit_length() - 1) if size else 0
+        while step:
+            nxt = pos + step
+            if nxt <= size and tree[nxt] <= index:
+                pos = nxt
+                index -= tree[nxt]
+            step >>= 1
+        return pos, index
+
+    def _normalize_index(self, index: int) -> int:
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError("OrderedKeys index out of range")
+        return index
+
+    def _detach(self, block_idx: int, block: List[str], key: str):
+        del self._block_of[key]
+        self._len -= 1
+        if block:
+            self._tree_add(block_idx, -1)
+        else:
+            del self._blocks[block_idx]
+            self._reindex_blocks()
+
+    # endregion
+
+    def index(self, key: str) -> int:
+        """Позиция (rank) ключа. ValueError, если ключа нет."""
+        block = self._block_of.get(key)
+        if block is None:
+            raise ValueError(f"{key!r} is not in OrderedKeys")
+        block_idx = self._block_pos[id(block)]
+        return self._prefix(block_idx) + block.index(key)
+
+    def insert(self, index: int, key: str):
+        """Вставляет ключ перед позицией index (как list.insert)."""
+        if key in self._block_of:
+            raise ValueError(f"{key!r} is already in OrderedKeys")
+
+        if not self._blocks:
+            block = [key]
+            self._blocks.append(block)
+            self._block_of[key] = block
+            self._len = 1
+            self._reindex_blocks()
+            return
+
+        if index < 0:
+            index = max(index + self._len, 0)
+        if index >= self._len:
+            block_idx = len(self._blocks) - 1
+            offset = len(self._blocks[block_idx])
+        else:
+            block_idx, offset = self._locate(index)
+
+        block = self._blocks[block_idx]
+        block.insert(offset, key)
+        self._block_of[key] = block
+        self._len += 1
+
+        if len(block) > 2 * self.LOAD:
+            half = len(block) // 2
+            tail = block[half:]
+            del block[half:]
+            self._blocks.insert(block_idx + 1, tail)
+            for moved in tail:
+                self._block_of[moved] = tail
+            self._reindex_blocks()
+        else:
+            self._tree_add(block_idx, 1)
+
+    def append(self, key: str):
+        self.insert(self._len, key)
+
+    def pop(self, index: int = -1) -> str:
+        index = self._normalize_index(index)
+        block_idx, offset = self._locate(index)
+        block = self._blocks[block_idx]
+        key = block.pop(offset)
+        self._detach(block_idx, block, key)
+        return key
+
+    def remove(self, key: str):
+        block = self._block_of.get(key)
+        if block is None:
+            raise ValueError(f"{key!r} is not in OrderedKeys")
+        block_idx = self._block_pos[id(block)]
+        block.remove(key)
+        self._detach(block_idx, block, key)
+
+    def discard(self, key: str):
+        if key in self._block_of:
+            self.remove(key)
+
+    def discard_many(self, keys: Iterable[str]):
+        """
+        Удаляет набор ключей. Если ключей много, дешевле пересобрать
+        структуру за O(n), чем удалять их по одному.
+        """
+        keys = {key for key in keys if key in self._block_of}
+        if len(keys) * self.LOAD > self._len:
+            self._build([key for key in self if key not in keys])
+        else:
+            for key in keys:
+                self.remove(key)
+
+    def ordered(self, keys: Iterable[str]) -> List[str]:
+        """
+        Ключи из keys, которые есть в списке, в порядке списка. Ключи
+        раскладываются по своим блокам, поэтому позиции остальных ключей
+        не вычисляются: O(k log k) плюс проход по затронутым блокам.
+        """
+        block_of = self._block_of
+        block_pos = self._block_pos
+        groups: Dict[int, List[str]] = {}
+        for key in keys:
+            block = block_of.get(key)
+            if block is not None:
+                groups.setdefault(block_pos[id(block)], []).append(key)
+
+        result: List[str] = []
+        for block_idx in sorted(groups):
+            group = groups[block_idx]
+            block = self._blocks[block_idx]
+            if len(group) * 128 < len(block):
+                result.extend(sorted(group, key=block.index))
+            else:
+                wanted = set(group)
+                result.extend(key for key in block if key in wanted)
+        return result
+
+    def copy(self) -> List[str]:
+        return list(self)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[str, List[str]]:
+        if isinstance(index, slice):
+            return list(self)[index]
+        block_idx, offset = self._locate(self._normalize_index(index))
+        return self._blocks[block_idx][offset]
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator[str]:
+        for block in self._blocks:
+            yield from block
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._block_of
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (OrderedKeys, list)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"OrderedKeys({list(self)!r})"
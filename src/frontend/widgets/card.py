@@ -3,6 +3,7 @@ import string
 import copy
 
 import tkinter as tk
+import tkinter.messagebox as messagebox
 from tkinter import ttk
 from typing import List, Dict, Callable, Union, Optional
 
@@ -324,6 +325,10 @@ class CardEditor(tk.Toplevel, BaseWindow):
 
 
 class CardManager:
+    # Сколько ждать ответа БД на открытие карточки, сек. (от начала
+    # обработки запроса: ожидание в очереди диспетчера не учитывается)
+    FETCH_TIMEOUT = 5.0
+
     def __init__(
             self,
             parent: tk.Frame,
@@ -342,7 +347,7 @@ class CardManager:
 
     def subscribe(self):
         subscriptions = [
-            (EventType.BACK.DB.CARD_DICT, self._on_card_dict),
+            (EventType.VIEW.TABLE.DT.EDIT_CARD, self._fetch_card),
             (EventType.VIEW.TABLE.PANEL.ADD_CARD, self._open_card),
             (EventType.VIEW.TABLE.DT.CLONE_ITEM, self._open_card),
             (EventType.VIEW.TABLE.DT.DELETE_CARDS, self._del_card_ids),
@@ -373,26 +378,30 @@ class CardManager:
             self._destroy_card(card)
 
     def _destroy_card(self, card_key: str):
-        card = self.opened_cards.pop(card_key)
+        card = self.opened_cards.pop(card_key, None)
+        if card is None:
+            return
         card.withdraw()
         card.update_idletasks()
         card.destroy()
 
-    def _on_card_dict(self, card_key: str, table: str, card_dict: Dict[str, str]):
-        """Тут реагирует на рассылку словаря карточки, если карточка открыта, обновляет.
-        Иначе, открывает новую."""
-        if card_key:
-            self._update_card(card_key, card_dict)
-        else:
-            self._open_card(table, card_dict)
+    def _fetch_card(self, table: str, card_id: str):
+        """Запрашивает карточку из БД и открывает её, когда придёт ответ.
+        Если БД не ответила или карточки нет, сообщает об этом пользователю."""
+        EventBus.request(
+            Event(event_type=EventType.VIEW.CARD.FETCH), table, card_id,
+            on_reply=lambda card_dict: self._open_card(table, card_dict),
+            on_error=lambda error: self._on_fetch_error(card_id, error),
+            timeout=self.FETCH_TIMEOUT
+        )
 
-    def _update_card(self, card_key: str, card_dict: Dict[str, str]):
-        open_card = self.opened_cards.get(card_key)
-        if open_card:
-            open_card.is_new = False
-            open_card.fields.update_fields(card_dict)
-            open_card.update_title()
-            open_card.buttons.set_save_button_enabled(False)
+    @staticmethod
+    def _on_fetch_error(card_id: str, error: BaseException):
+        if isinstance(error, TimeoutError):
+            message = f"База данных не ответила вовремя, карточка {card_id} не открыта."
+        else:
+            message = f"Не удалось открыть карточку {card_id}: {error}"
+        messagebox.showwarning("Открытие карточки", message)
 
     def _open_card(self, table: str, card_dict: Dict[str, str],
                    unlock_save: bool = False):
@@ -435,11 +444,11 @@ class CardManager:
         :param validation_result: Словарь, где ключ - название поле, а значение - статус
         """
         open_card = self.opened_cards.get(card_key)
+        if open_card is None:
+            return
 
         if all(validation_result.values()):
             # Тут закроет карточку сразу после сохранения.
-            # Если нужно оставлять открытой, то закомментить _destroy_card, и включить
-            # в sync_db.py рассылку в методе save_card.
             self._destroy_card(card_key)
         else:
             open_card.fields.highlight_bad_fields(validation_result)
@@ -1,5 +1,8 @@
 import logging
-from typing import List, Dict, Set, Tuple, Optional
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, List, Dict, Set, Tuple, Optional, Sequence, Iterable, Union
 
 import tkinter as tk
 import tkinter.messagebox as messagebox
@@ -7,12 +10,88 @@ from tkinter import ttk
 import tkinter.font as tkFont
 
 from .widgets import UndoEntry, ToggleButton, HoverButton
+from ..utils import OrderedKeys
 from ..icons import Icons
 from ..style import CONTEXT_MENU_STYLES
 from ...eventbus import Subscriber, EventBus, Event
 from ...enums import EventType, DispatcherType, GROUP, ICON, STATE
 
 
+def _longest_increasing_run(values: Sequence[int]) -> Set[int]:
+    """Возвращает значения, образующие наибольшую возрастающую подпоследовательность."""
+    tails: List[int] = []       # tails[k] — индекс в values хвоста цепочки длины k+1
+    tail_values: List[int] = []
+    parents: List[int] = [-1] * len(values)
+
+    for i, value in enumerate(values):
+        k = bisect_left(tail_values, value)
+        if k:
+            parents[i] = tails[k - 1]
+        if k == len(tails):
+            tails.append(i)
+            tail_values.append(value)
+        else:
+            tails[k] = i
+            tail_values[k] = value
+
+    result = set()
+    i = tails[-1] if tails else -1
+    while i != -1:
+        result.add(values[i])
+        i = parents[i]
+    return result
+
+
+def plan_rows_diff(current: Sequence[str], target: Sequence[str]) -> Tuple[List[str], Set[str]]:
+    """
+    Считает минимальный набор операций для перехода Treeview от current к target.
+
+    :param current: Ключи строк в текущем порядке.
+    :param target: Ключи строк в новом порядке.
+    :return: (ключи для открепления, ключи, которые остаются на месте).
+        Остальные ключи из target нужно вставить или переместить на их индекс.
+    """
+    target_pos = {key: i for i, key in enumerate(target)}
+    kept = [target_pos[key] for key in current if key in target_pos]
+
+    if all(a < b for a, b in zip(kept, kept[1:])):
+        # Частый случай фильтрации: общие строки сохраняют взаимный порядок.
+        stable_positions = set(kept)
+    else:
+        stable_positions = _longest_increasing_run(kept)
+
+    stable = {target[i] for i in stable_positions}
+    detach = [key for key in current if key not in stable]
+    return detach, stable
+
+
+class SearchGeneration:
+    """
+    Счётчик поколений поисковых запросов одной таблицы.
+
+    Общий для TablePanel, TableBuffer и DataTable: панель увеличивает его на
+    каждое изменение строки поиска, буфер прерывает фильтрацию устаревшего
+    поколения, а таблица отбрасывает устаревшие результаты.
+    """
+
+    def __init__(self):
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def next(self) -> int:
+        with self._lock:
+            self._value += 1
+            return self._value
+
+    @property
+    def current(self) -> int:
+        return self._value
+
+    def is_stale(self, generation: Optional[int]) -> bool:
+        """None — запрос вне поиска (без поколения), он никогда не устаревает."""
+        return generation is not None and generation != self._value
+
+
 class DataTable(ttk.Frame):
     size_states_map = {
         GROUP.SONGS_TABLE: STATE.SONGS_COL_SIZE,
@@ -27,6 +106,10 @@ class DataTable(ttk.Frame):
     oddrow_background = "#e4e7ed"
     evenrow_background = "#fcfcfc"
 
+    # Сколько строк держать материализованными сверху и снизу от видимой
+    # области в виртуальном режиме.
+    overscan = 30
+
     # region Initialization and Subscriptions
 
     def __init__(
@@ -37,11 +120,20 @@ class DataTable(ttk.Frame):
             data: List[List[str]],
             stretchable_column_indices: List[int],
             show_table_end: bool = False,
-            sort_key: Optional[Tuple[int, str, int]] = None
+            sort_key: Optional[Tuple[int, str, int]] = None,
+            virtual_scroll: bool = False,
+            search_generation: Optional[SearchGeneration] = None,
+            loading_started_at: Optional[float] = None
     ):
         super().__init__(parent)
 
+        self._logger = logging.getLogger(__name__)
         self._group_id = group_id.value
+        self._search_generation = search_generation or SearchGeneration()
+        # Потоковая загрузка: perf_counter() старта приложения, чтобы замерить
+        # время до первой отрисовки строк. None — данные переданы целиком.
+        self._loading_started_at = loading_started_at
+        self._first_paint_pending = loading_started_at is not None
         self.dt: Optional[ttk.Treeview] = None
         self.context_menu: Optional[tk.Menu] = None
         self._headers = headers
@@ -49,11 +141,29 @@ class DataTable(ttk.Frame):
         self._show_table_end: bool = show_table_end
         self._table_len = len(data)
 
+        # Виртуальный режим: в Treeview материализуется только окно строк
+        # вокруг видимой области, полный список хранится в self._rows.
+        self._virtual = virtual_scroll
+        self._rows: List[List[str]] = []
+        self._row_pos: Dict[str, int] = {}
+        self._window: Tuple[int, int] = (0, 0)  # [start, end) материализованных строк
+        self._selected: List[str] = []
+        self._applied_selection: Tuple[str, ...] = ()
+        self._rewindow_id = None
+        self._row_height = 25
+
+        # Обычный режим: открепленные (detach) строки переиспользуются при
+        # следующем фильтре, текущие теги зебры и показанные значения кешируются.
+        self._detached: Set[str] = set()
+        self._row_tags: Dict[str, str] = {}
+        self._row_values: Dict[str, List[str]] = {}
+
         self.estimated_column_widths: Dict[str, int] = {}
         self.user_defined_widths: Dict[str, int] = {}
 
         # Состояния
         self._col_sep_pressed = False
+        self._auto_sized = False  # ширины подогнаны автоматически, а не вручную
 
         # Текущее состояние сортировки: (column_name, direction),
         # где direction = 1 (▲), -1 (▼), 0 (нет)
@@ -78,7 +188,8 @@ class DataTable(ttk.Frame):
             (EventType.VIEW.TABLE.PANEL.EDIT_CARD, self._open_selected_row),
             (EventType.VIEW.TABLE.BUFFER.FILTERED_TABLE, self._filter_table),
             (EventType.VIEW.TABLE.PANEL.AUTO_SIZE, self._auto_size_widths),
-            (EventType.VIEW.TABLE.PANEL.CLONE_CARD, self._clone_selected_row)
+            (EventType.VIEW.TABLE.PANEL.CLONE_CARD, self._clone_selected_row),
+            (EventType.VIEW.TABLE.BUFFER.LOAD_PROGRESS, self._on_load_progress)
         ]
         for event_type, handler in subscriptions:
             EventBus.subscribe(
@@ -142,8 +253,14 @@ class DataTable(ttk.Frame):
         self.dt = ttk.Treeview(self, show="headings", style="Custom.Treeview")
         self.dt.grid(row=0, column=0, sticky="nsew")
 
-        self.scroll_y = ttk.Scrollbar(self, orient="vertical", command=self.dt.yview)
-        self.dt.configure(yscrollcommand=self.scroll_y.set)
+        if self._virtual:
+            # Скроллбар управляется логическим числом строк, а не содержимым Treeview.
+            self.scroll_y = ttk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+            self.dt.configure(yscrollcommand=self._on_dt_yscroll)
+            self._row_height = self._lookup_row_height()
+        else:
+            self.scroll_y = ttk.Scrollbar(self, orient="vertical", command=self.dt.yview)
+            self.dt.configure(yscrollcommand=self.scroll_y.set)
         self.scroll_y.grid(row=0, column=1, sticky="ns")
 
         self.scroll_x = ttk.Scrollbar(self, orient="horizontal", command=self.dt.xview)
@@ -185,6 +302,10 @@ class DataTable(ttk.Frame):
 
         self.dt.bind("<Button-3>", self._on_right_click)  # контекстное меню
 
+        if self._virtual:
+            self.dt.bind("<<TreeviewSelect>>", self._on_virtual_select)
+            self.dt.bind("<Configure>", self._schedule_rewindow, add="+")
+
     # endregion
 
     # region Mouse Interaction and Sorting
@@ -214,6 +335,7 @@ class DataTable(ttk.Frame):
                     is_changed = True
 
             if is_changed:
+                self._auto_sized = False
                 self._publish_cols_state()
             self._resize_columns()
 
@@ -282,6 +404,7 @@ class DataTable(ttk.Frame):
     def _auto_size_widths(self):
         """Сбрасывает пользовательские ширины и автоматически подгоняет колонки."""
         self.user_defined_widths.clear()
+        self._auto_sized = True
         self._adjust_column_widths()
         self._resize_columns()
         self._publish_cols_state(auto_size=True)
@@ -373,38 +496,127 @@ class DataTable(ttk.Frame):
     def _insert_row_to(self, row: List[str], index: int):
         """Вставляет или обновляет строку в таблице по индексу."""
         card_id = row[0]
-        if self.dt.exists(card_id):
-            self.dt.delete(card_id)  # Удаляем старую строку
-        else:
+        if self._virtual:
+            self._insert_virtual_row(row, index)
+            self._select_row(card_id)
+            return
+
+        if not self._delete_row(card_id):  # Удаляем старую строку
             self._table_len += 1
 
         # Вставляем в новую позицию
         self.dt.insert("", index, iid=card_id, values=row)
+        self._row_values[card_id] = row
         self._recolor_rows()
+        self._select_row(card_id)
 
-        self.dt.selection_set(card_id)
-        self.dt.focus(card_id)
-        self.dt.see(card_id)
+    def _select_row(self, card_id: str):
+        """Выделяет строку, ставит на неё фокус и прокручивает к ней."""
+        if self._virtual:
+            self._selected = [card_id]
+        self.see(card_id)
+        if self.dt.exists(card_id):
+            self.dt.selection_set(card_id)
+            self.dt.focus(card_id)
 
     def _delete_invisible_row(self, card_id: str):
         """Удаляет строку по идентификатору, если она существует."""
-        if self.dt.exists(card_id):
-            self.dt.delete(card_id)
+        if self._virtual:
+            self._remove_virtual_rows({card_id})
+            return
+
+        if self._delete_row(card_id):
             self._table_len -= 1
         self._recolor_rows()
 
-    def _fill_table(self, data: List[List[str]]):
-        """Обновляет содержимое таблицы с отфильтрованными данными."""
-        self.dt.delete(*self.dt.get_children())
+    def _delete_row(self, card_id: str) -> bool:
+        """Удаляет строку из Treeview. Возвращает True, если она была видна."""
+        if not self.dt.exists(card_id):
+            return False
+        self.dt.delete(card_id)
+        self._row_tags.pop(card_id, None)
+        self._row_values.pop(card_id, None)
+        if card_id in self._detached:
+            self._detached.discard(card_id)
+            return False
+        return True
+
+    def _fill_table(self, data: List[List[str]], keep_view: bool = False):
+        """Обновляет содержимое таблицы с отфильтрованными данными.
+
+        Вместо полной пересборки применяет к Treeview разницу между текущим и
+        новым порядком строк: лишние строки открепляются (detach), ранее
+        открепленные возвращаются через move, новые вставляются. У оставшихся
+        строк обновляются только изменившиеся значения. Если переставить
+        пришлось бы больше половины строк (пересортировка, обратный порядок),
+        таблица собирается заново: каждый move в Treeview линейный."""
+        if self._virtual:
+            self._set_virtual_rows(data, keep_view)
+            return
+
+        target = [row[0] for row in data]
+        children = self.dt.get_children()
+        detach, stable = plan_rows_diff(children, target)
+
+        moves = sum(1 for card_id in target
+                    if card_id not in stable and card_id in self._row_values)
+        if moves * 2 > len(target):
+            self._rebuild_rows(data)
+            return
+
+        if detach:
+            self.dt.selection_remove(*detach)
+            self.dt.detach(*detach)
+            self._detached.update(detach)
+
+        row_values = self._row_values
+        for index, row in enumerate(data):
+            card_id = row[0]
+            if card_id in stable:
+                if row_values[card_id] != row:
+                    self._set_row_values(row)
+                continue
+            if card_id in self._detached:
+                self.dt.move(card_id, "", index)
+                self._detached.discard(card_id)
+                if row_values[card_id] != row:
+                    self._set_row_values(row)
+            else:
+                self._insert_row(row, index)
+
         self._table_len = len(data)
+        self._recolor_rows(target)
+
+    def _rebuild_rows(self, data: List[List[str]]):
+        """Удаляет все строки Treeview, включая открепленные, и вставляет data
+        по порядку. Выделение сохраняется для оставшихся строк."""
+        selection = self.dt.selection()
+        self.dt.delete(*self._row_values)
+        self._detached.clear()
+        self._row_tags.clear()
+        self._row_values.clear()
+
         for index, row in enumerate(data):
             self._insert_row(row, index)
+        self._table_len = len(data)
+
+        kept = [iid for iid in selection if iid in self._row_values]
+        if kept:
+            self.dt.selection_set(kept)
+
+    def _set_row_values(self, row: List[str]):
+        """Перерисовывает значения уже вставленной строки."""
+        self.dt.item(row[0], values=row)
+        self._row_values[row[0]] = row
 
     def _insert_row(self, row: List[str], index: int = None):
-        """Вставляет строку в конец таблицы с заданным тегом (цветом) по индексу."""
+        """Вставляет строку в таблицу с заданным тегом (цветом) по индексу."""
         card_id = row[0]
         tag = self._get_tag(index)
-        self.dt.insert("", "end", iid=card_id, values=row, tags=(tag,))
+        self.dt.insert("", "end" if index is None else index,
+                       iid=card_id, values=row, tags=(tag,))
+        self._row_tags[card_id] = tag
+        self._row_values[card_id] = row
 
     def _get_tag(self, index: Optional[int]) -> str:
         """Обновляет цвет строк для зебры."""
@@ -412,17 +624,52 @@ class DataTable(ttk.Frame):
             index = self._table_len
         return "evenrow" if index % 2 == 0 else "oddrow"
 
-    def _recolor_rows(self):
-        """Перекрашивает строки таблицы в зависимости от их индекса (чётная/нечётная)."""
-        for index, iid in enumerate(self.dt.get_children()):
+    def _recolor_rows(self, order: Optional[Sequence[str]] = None):
+        """Перекрашивает строки таблицы в зависимости от их индекса (чётная/нечётная).
+        Обращается к Treeview только для строк, у которых тег изменился."""
+        if self._virtual:
+            # Теги проставляются по логическому индексу при материализации окна.
+            return
+        if order is None:
+            order = self.dt.get_children()
+        row_tags = self._row_tags
+        for index, iid in enumerate(order):
             tag = self._get_tag(index)
-            self.dt.item(iid, tags=(tag,))
+            if row_tags.get(iid) != tag:
+                self.dt.item(iid, tags=(tag,))
+                row_tags[iid] = tag
 
     def _clear_selection(self, event=None):
         """Снимает выделение и сбрасывает фокус с таблицы."""
+        self._selected = []
         self.dt.selection_set(())
         self.dt.focus("")
 
+    def selection(self) -> Tuple[str, ...]:
+        """Возвращает ID выделенных строк, включая не материализованные."""
+        if self._virtual:
+            return tuple(self._selected)
+        return self.dt.selection()
+
+    def row_values(self, card_id: str) -> Tuple[str, ...]:
+        """Возвращает значения строки по ID, даже если её нет в Treeview."""
+        if self._virtual:
+            return tuple(self._rows[self._row_pos[card_id]])
+        return self.dt.item(card_id, "values")
+
+    def see(self, card_id: str):
+        """Прокручивает таблицу к строке, при необходимости материализуя её."""
+        if not self._virtual:
+            self.dt.see(card_id)
+            return
+
+        index = self._row_pos.get(card_id)
+        if index is None:
+            return
+        if not self.dt.exists(card_id):
+            self._materialize(index - self._visible_count() // 2)
+        self.dt.see(card_id)
+
     def _open_selected_row(self, event=None):
         """Обрабатывает открытие строки по Enter или двойному клику."""
         if event is not None:
@@ -430,7 +677,7 @@ class DataTable(ttk.Frame):
             if region != "cell":
                 return
 
-        selected = self.dt.selection()
+        selected = self.selection()
         if selected:
             card_id = selected[0]
 
@@ -441,7 +688,7 @@ class DataTable(ttk.Frame):
 
     def _delete_selected_rows(self, event=None):
         """Удаляет выбранные строки."""
-        selected_items = self.dt.selection()
+        selected_items = self.selection()
         if not selected_items:
             messagebox.showinfo(
                 "Уведомление",
@@ -453,14 +700,15 @@ class DataTable(ttk.Frame):
                 "Уведомление", "Операция требует подтверждения."):
             return
 
-        deleted_ids = []
-        for card_id in selected_items:
-
-            self.dt.delete(card_id)
-            deleted_ids.append(card_id)
-
-        self._table_len -= len(deleted_ids)
-        self._recolor_rows()
+        deleted_ids = list(selected_items)
+        if self._virtual:
+            self._selected = []
+            self._remove_virtual_rows(set(deleted_ids))
+        else:
+            for card_id in deleted_ids:
+                if self._delete_row(card_id):
+                    self._table_len -= 1
+            self._recolor_rows()
 
         EventBus.publish(
             Event(
@@ -472,7 +720,7 @@ class DataTable(ttk.Frame):
 
     def _clone_selected_row(self):
         """Клонирует одну выбранную строку."""
-        selected_items = self.dt.selection()
+        selected_items = self.selection()
 
         if not selected_items:
             messagebox.showinfo(
@@ -482,7 +730,7 @@ class DataTable(ttk.Frame):
             return
 
         original_id = selected_items[0]
-        original_values = self.dt.item(original_id, "values")
+        original_values = self.row_values(original_id)
 
         cloned_data = dict(zip(self._headers, original_values))
         cloned_data["ID"] = ""
@@ -498,22 +746,205 @@ class DataTable(ttk.Frame):
     def _filter_table(
             self,
             rows: List[List[str]],
-            is_full: bool = True
+            is_full: bool = True,
+            generation: Optional[int] = None,
+            keep_view: bool = False
     ) -> None:
         """Обновляет таблицу, показывая только отфильтрованные данные
-        и перекрашивает строки."""
-        self._fill_table(rows)
+        и перекрашивает строки. Результаты устаревшего поиска отбрасываются.
+        При keep_view (подгрузка и пакетное сохранение) прокрутка пользователя
+        сохраняется, иначе таблица прокручивается как после нового фильтра."""
+        if self._search_generation.is_stale(generation):
+            return
+        keep_view = keep_view and self._table_len > 0
+        self._fill_table(rows, keep_view)
         self.update_idletasks()
-        self._recolor_rows()
-        self.scroll_to_bottom(rows, is_full)
+        if not keep_view:
+            self.scroll_to_bottom(rows, is_full)
+
+        if self._first_paint_pending and rows:
+            self._first_paint_pending = False
+            self.after_idle(lambda _=None: self._log_load_time("первые строки показаны"))
+
+    def _on_load_progress(self, loaded: int, done: bool):
+        """По окончании потоковой загрузки пересчитывает ширины колонок по данным."""
+        if not done or self._loading_started_at is None:
+            return
+
+        if self._virtual:
+            sample = self._rows[-20:]
+        else:
+            sample = [self.dt.item(iid, "values") for iid in self.dt.get_children()[-20:]]
+        self.estimated_column_widths = self._estimate_column_lengths(self._headers, sample)
+        if self._auto_sized:
+            self._auto_size_widths()
+
+        self._log_load_time(f"загружено строк: {loaded}")
+        self._loading_started_at = None
+
+    def _log_load_time(self, message: str):
+        elapsed = (time.perf_counter() - self._loading_started_at) * 1000
+        self._logger.info(f"Таблица '{self._group_id}': {message} через {elapsed:.0f} мс после запуска")
 
     def scroll_to_bottom(self, rows: List[List[str]], is_full: bool):
         """Прокручивает в конец если задан self._show_table_end=True в конструкторе"""
         if self._show_table_end and rows:
             if is_full:
-                self.dt.see(rows[-1][0])
+                self.see(rows[-1][0])
             else:
-                self.dt.see(rows[0][0])
+                self.see(rows[0][0])
+
+    # endregion
+
+    # region Virtual Scrolling
+
+    def _lookup_row_height(self) -> int:
+        """Высота строки Treeview в пикселях из текущего стиля."""
+        try:
+            return int(ttk.Style(self).lookup("Custom.Treeview", "rowheight") or 25)
+        except (tk.TclError, ValueError):
+            return 25
+
+    def _visible_count(self) -> int:
+        """Количество строк, помещающихся в видимую область Treeview."""
+        height = self.dt.winfo_height()
+        if height <= 1:
+            # Виджет ещё не отрисован — ориентируемся на высоту в строках.
+            return int(self.dt.cget("height"))
+        return max(1, height // self._row_height)
+
+    def _logical_top(self) -> float:
+        """Логический индекс первой видимой строки."""
+        start, end = self._window
+        return start + float(self.dt.yview()[0]) * (end - start)
+
+    def _set_virtual_rows(self, rows: List[List[str]], keep_view: bool = False):
+        """Заменяет логический список строк и материализует окно с начала.
+        При keep_view окно остаётся на строке, которая была верхней видимой,
+        а если её больше нет — на том же логическом индексе."""
+        top, anchor = 0, None
+        if keep_view and self._rows:
+            top = min(int(self._logical_top()), len(self._rows) - 1)
+            anchor = self._rows[top][0]
+
+        self._rows = list(rows)
+        self._reindex_rows(0)
+        self._selected = [iid for iid in self._selected if iid in self._row_pos]
+        self._materialize(self._row_pos.get(anchor, top))
+
+    def _reindex_rows(self, start: int):
+        """Пересчитывает позиции строк начиная с индекса start."""
+        if start == 0:
+            self._row_pos = {}
+        for index in range(start, len(self._rows)):
+            self._row_pos[self._rows[index][0]] = index
+        self._table_len = len(self._rows)
+
+    def _insert_virtual_row(self, row: List[str], index: int):
+        """Вставляет или перемещает строку в логическом списке."""
+        card_id = row[0]
+        old_index = self._row_pos.pop(card_id, None)
+        if old_index is not None:
+            self._rows.pop(old_index)
+        self._rows.insert(index, row)
+        self._reindex_rows(min(index, old_index if old_index is not None else index))
+        self._materialize(int(self._logical_top()))
+
+    def _remove_virtual_rows(self, card_ids: Set[str]):
+        """Удаляет строки из логического списка и перерисовывает окно."""
+        if not any(card_id in self._row_pos for card_id in card_ids):
+            return
+        top = int(self._logical_top())
+        self._rows = [row for row in self._rows if row[0] not in card_ids]
+        self._selected = [iid for iid in self._selected if iid not in card_ids]
+        self._reindex_rows(0)
+        self._materialize(top)
+
+    def _materialize(self, top: int):
+        """Вставляет в Treeview строки окна вокруг логического индекса top."""
+        total = len(self._rows)
+        visible = self._visible_count()
+        top = max(0, min(top, total - visible))
+        start = max(0, top - self.overscan)
+        end = min(total, top + visible + self.overscan)
+
+        focus = self.dt.focus()
+        self.dt.delete(*self.dt.get_children())
+        for index in range(start, end):
+            row = self._rows[index]
+            self.dt.insert("", "end", iid=row[0], values=row, tags=(self._get_tag(index),))
+        self._window = (start, end)
+
+        self._restore_selection(focus)
+        if end > start:
+            self.dt.yview_moveto((top - start) / (end - start))
+        else:
+            self.scroll_y.set(0, 1)
+
+    def _restore_selection(self, focus: str):
+        """Восстанавливает выделение и фокус для материализованных строк."""
+        visible_selection = [iid for iid in self._selected if self.dt.exists(iid)]
+        self.dt.selection_set(visible_selection)
+        if focus and self.dt.exists(focus):
+            self.dt.focus(focus)
+        self._applied_selection = self.dt.selection()
+
+    def _on_virtual_select(self, event=None):
+        """Запоминает выделение пользователя, игнорируя восстановление после
+        перерисовки окна."""
+        current = self.dt.selection()
+        if current == self._applied_selection:
+            return
+        self._selected = list(current)
+        self._applied_selection = current
+
+    def _on_dt_yscroll(self, first: str, last: str):
+        """Переводит прокрутку окна Treeview в логическую позицию скроллбара
+        и сдвигает окно, когда видимая область подходит к его краю."""
+        start, end = self._window
+        size = end - start
+        total = len(self._rows)
+        if not total or not size:
+            self.scroll_y.set(0, 1)
+            return
+
+        top = start + float(first) * size
+        bottom = start + float(last) * size
+        self.scroll_y.set(top / total, bottom / total)
+
+        margin = self.overscan // 2
+        near_top = start > 0 and top - start < margin
+        near_bottom = end < total and end - bottom < margin
+        if near_top or near_bottom:
+            self._schedule_rewindow()
+
+    def _on_scrollbar(self, action: str, *args):
+        """Обработчик скроллбара в виртуальном режиме."""
+        total = len(self._rows)
+        visible = self._visible_count()
+        top = self._logical_top()
+
+        if action == "moveto":
+            top = float(args[0]) * total
+        elif action == "scroll":
+            step = int(args[0])
+            top += step * (visible if args[1] == "pages" else 1)
+
+        top = int(top)
+        start, end = self._window
+        if start <= top and top + visible <= end and end > start:
+            self.dt.yview_moveto((top - start) / (end - start))
+        else:
+            self._materialize(top)
+
+    def _schedule_rewindow(self, event=None):
+        """Откладывает пересборку окна до простоя цикла Tk."""
+        if self._rewindow_id is None:
+            self._rewindow_id = self.after_idle(self._rewindow)
+
+    def _rewindow(self):
+        self._rewindow_id = None
+        self._materialize(int(round(self._logical_top())))
 
     # endregion
 
@@ -527,14 +958,17 @@ class TablePanel(ttk.Frame):
             self,
             parent: ttk.Frame,
             group_id: GROUP,
+            search_generation: Optional[SearchGeneration] = None
     ):
         super().__init__(parent)
         self._group_id = group_id.value
+        self._search_generation = search_generation or SearchGeneration()
         self.search_var = tk.StringVar()
         self._debounce_id = None
         self.buttons = {}
         self.icons = Icons()
         self.search_entry = None
+        self.loading_label = None
 
         # Основной контейнер строки поиска и кнопок
         self.container = ttk.Frame(self)
@@ -556,10 +990,19 @@ class TablePanel(ttk.Frame):
                 route_by=DispatcherType.TABLE
             )
         )
+        EventBus.subscribe(
+            EventType.VIEW.TABLE.BUFFER.LOAD_PROGRESS,
+            Subscriber(
+                callback=self.on_load_progress, group_id=self._group_id,
+                route_by=DispatcherType.TK
+            )
+        )
 
     def _create_entry(self):
         self.search_entry = UndoEntry(self.container, textvariable=self.search_var)
         self.search_entry.pack(side="left", fill="x", expand=True, padx=(10, 0))
+        # Индикатор потоковой загрузки, показывается только пока идут строки
+        self.loading_label = ttk.Label(self.container, foreground="#7a7f87")
 
     def _create_btn(self, container: ttk.Frame, icon: ICON, command, tooltip: str):
         btn = HoverButton(
@@ -642,17 +1085,19 @@ class TablePanel(ttk.Frame):
 
     def _on_search(self, *args):
         term = self.search_var.get().lower()
+        # Новое поколение сразу делает устаревшим поиск, который уже идёт в буфере
+        generation = self._search_generation.next()
         if self._debounce_id:
             self.after_cancel(self._debounce_id)
-        self._debounce_id = self.after(300, lambda _=None: self.on_search(term))
+        self._debounce_id = self.after(300, lambda _=None: self.on_search(term, generation))
 
-    def on_search(self, term: str):
+    def on_search(self, term: str, generation: Optional[int] = None):
         EventBus.publish(
             Event(
                 event_type=EventType.VIEW.TABLE.PANEL.SEARCH_VALUE,
                 group_id=self._group_id
             ),
-            term
+            term, generation=generation
         )
 
     def on_auto_size_applied(self):
@@ -672,23 +1117,69 @@ class TablePanel(ttk.Frame):
             btn.toggle()
             btn.configure(state="normal")
 
+    def on_load_progress(self, loaded: int, done: bool):
+        if done:
+            self.loading_label.pack_forget()
+            return
+        self.loading_label.configure(text=f"Загрузка… {loaded}")
+        if not self.loading_label.winfo_ismapped():
+            self.loading_label.pack(side="left", padx=(10, 0), after=self.search_entry)
+
 
 class TableBuffer:
+    # Разделитель ячеек в строке поиска. Не встречается в данных и вырезается
+    # из поискового запроса, поэтому совпадение не может пересечь границу ячеек.
+    SEARCH_SEP = "\x1f"
+    # Через сколько строк фильтрация проверяет, не устарел ли запрос.
+    SCAN_CHUNK = 4096
+    # Не чаще какого интервала (сек) потоковая загрузка обновляет таблицу.
+    LOAD_REFRESH_INTERVAL = 0.25
+    # Триграмма, встречающаяся в большем числе строк, считается частой: её
+    # список строк не хранится и кандидатов она не сужает.
+    NGRAM_MAX_POSTING = 2048
+
     def __init__(
             self,
             group_id: GROUP,
             original_data: Dict[str, List[str]],
             header_map: Dict[str, str],
             sort_key: Optional[Tuple[int, str, int]] = None,
-            max_history: int = 10
+            max_history: int = 10,
+            ngram_index: bool = False,
+            search_generation: Optional[SearchGeneration] = None,
+            sorted_keys: Optional[List[str]] = None
     ):
         self._group_id = group_id.value
+        self._search_generation = search_generation or SearchGeneration()
+
+        # Триграммный инвертированный индекс {триграмма: {card_id}}. Строится
+        # лениво порциями при поиске, пока запрос не устарел, и поддерживается
+        # в update_item/delete_items. Частые триграммы хранятся только именами.
+        self._use_ngram_index = ngram_index
+        self._ngram_index: Optional[Dict[str, Set[str]]] = None
+        self._common_ngrams: Set[str] = set()
+        self._ngram_backlog: List[str] = []  # ключи, ещё не попавшие в индекс
+        # Ключи, прошедшие текущий фильтр, в порядке sorted_keys. Хранятся как
+        # список из filter_data и переводятся в OrderedKeys при первом
+        # update_item, чтобы позицию в отфильтрованной таблице давал rank.
+        self._filtered_keys: Optional[Union[List[str], OrderedKeys]] = None
+        self._filtered_term: str = ""
+        # Нормализованный текст строки для поиска {card_id: "ячейка\x1fячейка"}.
+        # Обновляется только при изменении строки.
+        self._search_text: Dict[str, str] = {}
+        # Кеш ключей сортировки по колонкам {(column_idx, column_name): {card_id: key}}.
+        # Ключ строки считается один раз и сбрасывается только при её изменении.
+        self._sort_keys: Dict[Tuple[int, str], Dict[str, Tuple[Any, Any]]] = {}
+
         self.original_data = original_data
         self.header_map = header_map
-        self.sorted_keys: List[str] = []  # Отсортированные ключи
+        self.sorted_keys: OrderedKeys = OrderedKeys()  # Отсортированные ключи
 
         self.max_history = max_history
         self.history: List[Tuple[str, List[str]]] = []  # (term, list_of_keys)
+        self._loaded_count = 0  # новых строк, добавленных потоковой загрузкой
+        self._load_refreshed_at = 0.0  # когда загрузка последний раз обновила таблицу
+        self._load_pending = False  # есть строки, ещё не отправленные в таблицу
 
         self._logger = logging.getLogger(__name__)
 
@@ -697,12 +1188,38 @@ class TableBuffer:
         self.filter_term: str = ""
 
         if sort_key and sort_key[1] != "":
-            self.sort_data(None, sort_key)
+            if sorted_keys is not None and len(sorted_keys) == len(original_data):
+                # Готовый порядок из снимка таблицы, сортировка не нужна
+                column_idx, column_name, direction = sort_key
+                self.sort_key = (column_idx, self.header_map.get(column_name), direction)
+                self.sorted_keys = sorted_keys
+            else:
+                self.sort_data(None, sort_key)
         else:
             self.sorted_keys = list(original_data.keys())
 
         self.subscribe()
 
+    @property
+    def original_data(self) -> Dict[str, List[str]]:
+        return self._original_data
+
+    @original_data.setter
+    def original_data(self, data: Dict[str, List[str]]):
+        self._original_data = data
+        self._ngram_index = None
+        self._search_text = {}
+        self._sort_keys = {}
+
+    @property
+    def sorted_keys(self) -> OrderedKeys:
+        return self._sorted_keys
+
+    @sorted_keys.setter
+    def sorted_keys(self, keys: Iterable[str]):
+        self._sorted_keys = keys if isinstance(keys, OrderedKeys) else OrderedKeys(keys)
+        self._filtered_keys = None
+
     def subscribe(self):
         for event, handler in [
             (EventType.VIEW.TABLE.PANEL.SEARCH_VALUE, self.filter_data),
@@ -719,10 +1236,11 @@ class TableBuffer:
                 )
             )
 
-    def filter_data(self, term: str):
-        term = term.strip().lower()
-        self.filter_term = term  # сохраняем текущий фильтр
+    def filter_data(self, term: str, generation: Optional[int] = None):
+        if self._search_generation.is_stale(generation):
+            return
 
+        term = self._normalize(term)
         base_keys = self.sorted_keys.copy()
 
         if term:
@@ -731,30 +1249,95 @@ class TableBuffer:
                     base_keys = prev_keys
                     break
 
-            filtered_keys = [key for key in base_keys if
-                             self._passes_filter(self.original_data.get(key, []))]
+            candidates = self._ngram_candidates(term, generation)
+            if self._search_generation.is_stale(generation):
+                return
+            if candidates is not None and len(candidates) < len(base_keys):
+                base_keys = self._in_sorted_order(candidates)
+
+            filtered_keys = self._scan(base_keys, term, generation)
+            if filtered_keys is None:
+                return
         else:
             filtered_keys = base_keys
 
+        self.filter_term = term  # сохраняем текущий фильтр
         filtered_data = [self.original_data[key] for key in filtered_keys]
+        self._filtered_keys = filtered_keys if term else None
+        self._filtered_term = term
 
-        self._publish_filtered(filtered_data)
+        self._publish_filtered(filtered_data, generation)
         self._update_history(term, filtered_keys)
 
-    def _publish_filtered(self, data: List[List[str]]):
+    def _scan(self, keys: List[str], term: str,
+              generation: Optional[int] = None) -> Optional[List[str]]:
+        """
+        Отбирает ключи, строки которых содержат term. Проход идёт порциями,
+        между ними проверяется поколение: если пользователь уже ввёл новый
+        запрос, сканирование прерывается и возвращается None.
+        """
+        texts = self._search_texts()
+        if generation is None:
+            return [key for key in keys if term in texts.get(key, "")]
+
+        result = []
+        step = self.SCAN_CHUNK
+        for start in range(0, len(keys), step):
+            if self._search_generation.is_stale(generation):
+                return None
+            result.extend(key for key in keys[start:start + step] if term in texts.get(key, ""))
+        return result
+
+    def _publish_filtered(self, data: List[List[str]], generation: Optional[int] = None,
+                          keep_view: bool = False):
+        """keep_view — фильтр и сортировка не менялись, таблица сохраняет прокрутку."""
         EventBus.publish(
             Event(
                 event_type=EventType.VIEW.TABLE.BUFFER.FILTERED_TABLE,
                 group_id=self._group_id
             ),
-            data, self.filter_term == ""
+            data, self.filter_term == "", generation=generation, keep_view=keep_view
         )
 
+    def _publish_view(self):
+        """Отправляет таблице текущее представление из поддерживаемого порядка ключей."""
+        filtered = self._filtered_order()
+        keys = self.sorted_keys if filtered is None else filtered
+        self._publish_filtered([self.original_data[key] for key in keys],
+                               self._search_generation.current, keep_view=True)
+
     def _update_history(self, term: str, keys: List[str]):
         self.history.append((term, keys))
         if len(self.history) > self.max_history:
             self.history.pop(0)
 
+    def append_rows(self, rows: List[List[str]], is_last: bool = False):
+        """
+        Добавляет порцию строк потоковой загрузки. Ключи встают на место по
+        текущей сортировке, отфильтрованный порядок пересобирается только
+        перед отправкой. Таблица получает представление не чаще
+        LOAD_REFRESH_INTERVAL и обязательно на последней порции.
+        """
+        for row in rows:
+            if row[0] in self.original_data:
+                continue
+            self._place_row(row)
+            self._loaded_count += 1
+            self._load_pending = True
+        if self._load_pending:
+            self._filtered_keys = None
+
+        now = time.monotonic()
+        if self._load_pending and (is_last or now - self._load_refreshed_at >= self.LOAD_REFRESH_INTERVAL):
+            self._load_pending = False
+            self._load_refreshed_at = now
+            self._publish_view()
+
+        EventBus.publish(
+            Event(EventType.VIEW.TABLE.BUFFER.LOAD_PROGRESS, group_id=self._group_id),
+            self._loaded_count, is_last
+        )
+
     def sort_data(self, _state_name, sort_data: Tuple[int, str, int]):
         """"""
         column_idx, column_name, direction = sort_data
@@ -765,25 +1348,73 @@ class TableBuffer:
         try:
             keys = list(self.original_data.keys())
             if direction:
-                keys.sort(
-                    key=lambda k: self._sort_key(
-                        k, column_idx, column_name),
-                    reverse=(direction < 0)
-                )
+                column_keys = self._column_sort_keys(column_idx, column_name)
+                keys.sort(key=column_keys.__getitem__, reverse=(direction < 0))
             self.sorted_keys = keys
         except Exception as e:
             self._logger.warning(f"Сортировка не удалась: {e}")
             self.sorted_keys = list(self.original_data.keys())
 
         self.history.clear()
-        self.filter_data(term)
+        self.filter_data(term, generation=self._search_generation.current)
 
     def update_item(self, row: List[str]):
+        index = self._apply_row(row)
+        if index is None:
+            self._publish_invisible_id(row[0])
+            return
+
+        EventBus.publish(
+            Event(EventType.VIEW.TABLE.BUFFER.CARD_UPDATED, group_id=self._group_id),
+            row, index
+        )
+
+    def update_items(self, rows: List[List[str]]):
+        """
+        Пакетное обновление: все строки применяются к буферу так же, как в
+        update_item, затем таблица получает одно отфильтрованное представление
+        вместо события на строку. Фильтр заново не прогоняется: отфильтрованный
+        порядок поддерживается по ходу применения строк.
+        """
+        for row in rows:
+            self._apply_row(row)
+
+        if rows:
+            self._publish_view()
+
+    def _apply_row(self, row: List[str]) -> Optional[int]:
+        """
+        Записывает новую или изменённую строку в буфер и в отфильтрованный
+        порядок. Возвращает индекс строки в отфильтрованной таблице или None,
+        если строка не проходит фильтр.
+        """
+        card_id = row[0]
+        pos = self._place_row(row)
+
+        filtered = self._filtered_order()
+        if filtered is not None:
+            filtered.discard(card_id)
+        if not self._passes_filter(row):
+            return None
+        if filtered is None:
+            return pos
+
+        index = self._filtered_rank(filtered, pos)
+        filtered.insert(index, card_id)
+        return index
+
+    def _place_row(self, row: List[str]) -> int:
+        """
+        Записывает строку в буфер и ставит её ключ на место по текущей
+        сортировке. Отфильтрованный порядок не трогается. Возвращает позицию
+        ключа в sorted_keys.
+        """
         card_id = row[0]
+        self._unindex_row(card_id)
         self.original_data[card_id] = row
-
-        term = self.filter_term.strip().lower()
-        is_match = self._passes_filter(row)
+        self._search_text.pop(card_id, None)
+        self._drop_sort_keys(card_id)
+        self._index_row(card_id)
 
         try:
             old_pos = self.sorted_keys.index(card_id)
@@ -793,53 +1424,58 @@ class TableBuffer:
             old_pos = None
             was_present = False
 
-        if not is_match:
-            self._publish_invisible_id(card_id)
-            return
-
         pos = self._find_insert_position(card_id, was_present, old_pos)
         self.sorted_keys.insert(pos, card_id)
-
         self.history.clear()
-
-        if not term:
-            index = pos
-        else:
-            filtered_keys = [
-                k for k in self.sorted_keys
-                if self._passes_filter(self.original_data[k])
-            ]
-            try:
-                index = filtered_keys.index(card_id)
-            except ValueError:
-                self._logger.warning(
-                    f"Карточка {card_id} не найдена в отфильтрованном списке после вставки")
-                return
-
-        EventBus.publish(
-            Event(EventType.VIEW.TABLE.BUFFER.CARD_UPDATED, group_id=self._group_id),
-            row, index
-        )
+        return pos
 
     def delete_items(self, deleted_ids: List[str], _group_id: str):
         for item_id in deleted_ids:
+            self._unindex_row(item_id)
             self.original_data.pop(item_id, None)
+            self._search_text.pop(item_id, None)
+            self._drop_sort_keys(item_id)
         self.history.clear()
-        self.sorted_keys = [k for k in self.sorted_keys if k not in deleted_ids]
+        self.sorted_keys.discard_many(deleted_ids)
+        if isinstance(self._filtered_keys, OrderedKeys):
+            self._filtered_keys.discard_many(deleted_ids)
+        else:
+            self._filtered_keys = None
+
+    def _filtered_order(self) -> Optional[OrderedKeys]:
+        """Отфильтрованные ключи текущего фильтра, None если фильтр пуст."""
+        term = self.filter_term
+        if not term:
+            return None
+        if self._filtered_keys is None or self._filtered_term != term:
+            texts = self._search_texts()
+            self._filtered_keys = [k for k in self.sorted_keys if term in texts[k]]
+            self._filtered_term = term
+        if not isinstance(self._filtered_keys, OrderedKeys):
+            self._filtered_keys = OrderedKeys(self._filtered_keys)
+        return self._filtered_keys
+
+    def _filtered_rank(self, filtered: OrderedKeys, pos: int) -> int:
+        """
+        Позиция строки с индексом pos из sorted_keys в отфильтрованной таблице:
+        число отфильтрованных ключей, стоящих в sorted_keys раньше неё.
+        """
+        rank = self.sorted_keys.index
+        left, right = 0, len(filtered)
+        while left < right:
+            mid = (left + right) // 2
+            if rank(filtered[mid]) < pos:
+                left = mid + 1
+            else:
+                right = mid
+        return left
 
     def _publish_invisible_id(self, card_id: str):
-        self._insert_sorted_key(card_id)
-        self.history.clear()
         EventBus.publish(
             Event(EventType.VIEW.TABLE.BUFFER.INVISIBLE_ID, group_id=self._group_id),
             card_id
         )
 
-    def _insert_sorted_key(self, card_id: str, was_present: bool = False,
-                           old_pos: Optional[int] = None):
-        pos = self._find_insert_position(card_id, was_present, old_pos)
-        self.sorted_keys.insert(pos, card_id)
-
     def _find_insert_position(self, card_id: str, was_present: bool,
                               old_pos: Optional[int] = None) -> int:
         column_idx, column_name, direction = self.sort_key
@@ -847,15 +1483,13 @@ class TableBuffer:
         if direction == 0:
             return old_pos if was_present and old_pos is not None else len(self.sorted_keys)
 
-        new_key = self._sort_key(card_id, column_idx, column_name)
-
-        def get_key(k: str):
-            return self._sort_key(k, column_idx, column_name)
+        get_key = self._cached_sort_key
+        new_key = get_key(card_id, column_idx, column_name)
 
         left, right = 0, len(self.sorted_keys)
         while left < right:
             mid = (left + right) // 2
-            mid_key = get_key(self.sorted_keys[mid])
+            mid_key = get_key(self.sorted_keys[mid], column_idx, column_name)
             if direction < 0:
                 if mid_key > new_key:
                     left = mid + 1
@@ -881,22 +1515,7 @@ class TableBuffer:
                 primary_key = float('inf')
 
         elif column_name in {"duration", "play_duration", "total_duration", "time"}:
-            # Поддержка форматов: "HH:MM:SS", "MM:SS", "SS"
-            try:
-                parts = list(map(int, val.strip().split(":")))
-
-                if len(parts) == 3:
-                    h, m, s = parts
-                elif len(parts) == 2:
-                    h, m, s = 0, parts[0], parts[1]
-                elif len(parts) == 1:
-                    h, m, s = 0, 0, parts[0]
-                else:
-                    raise ValueError("Too many parts")
-                primary_key = h * 3600 + m * 60 + s
-
-            except (ValueError, TypeError):
-                primary_key = float('inf')
+            primary_key = self._duration_seconds(val)
 
         else:
             primary_key = str(val).lower()
@@ -909,9 +1528,178 @@ class TableBuffer:
 
         return primary_key, id_key
 
+    @staticmethod
+    def _duration_seconds(val: str) -> Union[int, float]:
+        """
+        Длительность из строки таблицы в секундах — то же значение, что
+        хранится в колонках *_sec базы. Форматы: "H:MM:SS", "M:SS", "SS".
+        Пустые и некорректные значения сортируются в конец.
+        """
+        try:
+            parts = list(map(int, val.strip().split(":")))
+        except (ValueError, TypeError, AttributeError):
+            return float('inf')
+        if not 1 <= len(parts) <= 3:
+            return float('inf')
+        seconds = 0
+        for part in parts:
+            seconds = seconds * 60 + part
+        return seconds
+
+    def _cached_sort_key(self, card_id: str, column_idx: int, column_name: str):
+        column_keys = self._sort_keys.setdefault((column_idx, column_name), {})
+        key = column_keys.get(card_id)
+        if key is None:
+            key = self._sort_key(card_id, column_idx, column_name)
+            column_keys[card_id] = key
+        return key
+
+    def _column_sort_keys(self, column_idx: int, column_name: str) -> Dict[str, Tuple[Any, Any]]:
+        """Возвращает ключи сортировки колонки для всех строк, досчитывая недостающие."""
+        column_keys = self._sort_keys.setdefault((column_idx, column_name), {})
+        if len(column_keys) != len(self.original_data):
+            for card_id in self.original_data:
+                if card_id not in column_keys:
+                    column_keys[card_id] = self._sort_key(card_id, column_idx, column_name)
+        return column_keys
+
+    def _drop_sort_keys(self, card_id: str):
+        for column_keys in self._sort_keys.values():
+            column_keys.pop(card_id, None)
+
     def _passes_filter(self, row: List[str]) -> bool:
-        term = self.filter_term.strip().lower()
-        return not term or any(term in cell.lower() for cell in row)
+        term = self.filter_term
+        return not term or term in self._row_search_text(row)
+
+    # region Search Text
+
+    @classmethod
+    def _normalize(cls, text: str) -> str:
+        """Приводит текст к виду для поиска: casefold и ё → е."""
+        return text.strip().casefold().replace("ё", "е").replace(cls.SEARCH_SEP, "")
+
+    @classmethod
+    def _row_search_text(cls, row: List[str]) -> str:
+        return cls.SEARCH_SEP.join(row).casefold().replace("ё", "е")
+
+    def _search_texts(self) -> Dict[str, str]:
+        """Возвращает кеш строк поиска, досчитывая недостающие."""
+        texts = self._search_text
+        if len(texts) != len(self.original_data):
+            for card_id, row in self.original_data.items():
+                if card_id not in texts:
+                    texts[card_id] = self._row_search_text(row)
+        return texts
+
+    def _row_text(self, card_id: str) -> str:
+        text = self._search_text.get(card_id)
+        if text is None:
+            text = self._row_search_text(self.original_data[card_id])
+            self._search_text[card_id] = text
+        return text
+
+    # endregion
+
+    # region N-gram Index
+
+    @staticmethod
+    def _ngrams(text: str, n: int = 3) -> Set[str]:
+        return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+    def _row_ngrams(self, card_id: str) -> Set[str]:
+        """Триграммы строки поиска. Триграммы через разделитель ячеек
+        отбрасываются: подстрока запроса не может пересечь границу ячеек."""
+        sep = self.SEARCH_SEP
+        return {gram for gram in self._ngrams(self._row_text(card_id)) if sep not in gram}
+
+    def _ensure_ngram_index(self, generation: Optional[int] = None) -> bool:
+        """
+        Достраивает индекс порциями по SCAN_CHUNK строк, между порциями
+        проверяя поколение поиска. False — запрос устарел, построение
+        продолжится со следующим поиском.
+        """
+        if self._ngram_index is None:
+            self._ngram_index = {}
+            self._common_ngrams = set()
+            self._ngram_backlog = list(self.original_data)
+        backlog = self._ngram_backlog
+        step = self.SCAN_CHUNK
+        while backlog:
+            if self._search_generation.is_stale(generation):
+                return False
+            chunk = backlog[-step:]
+            del backlog[-step:]
+            for card_id in chunk:
+                if card_id in self.original_data:
+                    self._add_row_ngrams(card_id)
+        return True
+
+    def _add_row_ngrams(self, card_id: str):
+        index = self._ngram_index
+        common = self._common_ngrams
+        limit = self.NGRAM_MAX_POSTING
+        for gram in self._row_ngrams(card_id):
+            if gram in common:
+                continue
+            postings = index.setdefault(gram, set())
+            postings.add(card_id)
+            if len(postings) > limit:
+                del index[gram]
+                common.add(gram)
+
+    def _index_row(self, card_id: str):
+        if self._ngram_index is None:
+            return
+        self._add_row_ngrams(card_id)
+
+    def _unindex_row(self, card_id: str):
+        if self._ngram_index is None or card_id not in self.original_data:
+            return
+        for gram in self._row_ngrams(card_id):
+            postings = self._ngram_index.get(gram)
+            if postings is not None:
+                postings.discard(card_id)
+                if not postings:
+                    del self._ngram_index[gram]
+
+    def _ngram_candidates(self, term: str, generation: Optional[int] = None) -> Optional[Set[str]]:
+        """
+        Возвращает множество ключей, строки которых содержат все редкие
+        триграммы term. None — индекс выключен, не достроен из-за более нового
+        запроса, term слишком короткий или состоит из частых триграмм: нужен
+        полный перебор. Кандидаты требуют проверки через _passes_filter.
+        """
+        if not self._use_ngram_index or len(term) < 3:
+            return None
+        if not self._ensure_ngram_index(generation):
+            return None
+
+        postings = []
+        for gram in self._ngrams(term):
+            if gram in self._common_ngrams:
+                continue
+            keys = self._ngram_index.get(gram)
+            if not keys:
+                return set()
+            postings.append(keys)
+        if not postings:
+            return None
+
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for keys in postings[1:]:
+            candidates &= keys
+            if not candidates:
+                break
+        return candidates
+
+    def _in_sorted_order(self, keys: Set[str]) -> List[str]:
+        """Упорядочивает подмножество ключей так же, как sorted_keys."""
+        if len(keys) * 4 > len(self.sorted_keys):
+            return [k for k in self.sorted_keys if k in keys]
+        return self.sorted_keys.ordered(keys)
+
+    # endregion
 
 
 class Table(ttk.Frame):
@@ -925,13 +1713,18 @@ class Table(ttk.Frame):
             enable_tooltips: bool,
             show_table_end: bool,
             prev_cols_state: Optional[Dict[str, int]] = None,
-            sort_key_state: Optional[Tuple[int, str, int]] = None
+            sort_key_state: Optional[Tuple[int, str, int]] = None,
+            virtual_scroll: bool = False,
+            ngram_index: bool = False,
+            loading_started_at: Optional[float] = None,
+            sorted_keys: Optional[List[str]] = None
     ):
         super().__init__(parent)
         self._setup_layout()
 
         # Configure
         self.group_id = group_id.value
+        self.search_generation = SearchGeneration()
         ROWS_DICT = {row[0]: list(row) for row in data}
         HEADER_LIST = list(header_map.keys())
         prev_cols_state = prev_cols_state or {}
@@ -942,7 +1735,10 @@ class Table(ttk.Frame):
             group_id=group_id,
             original_data=ROWS_DICT,
             header_map=header_map,
-            sort_key=sort_key
+            sort_key=sort_key,
+            ngram_index=ngram_index,
+            search_generation=self.search_generation,
+            sorted_keys=sorted_keys
         )
 
         # Сортируем данные, если надо, перед созданием виджета таблицы
@@ -956,12 +1752,16 @@ class Table(ttk.Frame):
             data=data,
             stretchable_column_indices=stretchable_column_indices,
             show_table_end=show_table_end,
-            sort_key=sort_key
+            sort_key=sort_key,
+            virtual_scroll=virtual_scroll,
+            search_generation=self.search_generation,
+            loading_started_at=loading_started_at
         )
 
         self.table_panel = TablePanel(
             parent=self,
-            group_id=group_id
+            group_id=group_id,
+            search_generation=self.search_generation
         )
 
         if not prev_cols_state:
@@ -990,6 +1790,20 @@ class Table(ttk.Frame):
                     group_id=self.group_id
                 )
             )
+        # Порции строк потоковой загрузки и пакетные сохранения
+        # принимает буфер в потоке таблиц
+        for event, handler in [
+            (EventType.BACK.DB.TABLE_CHUNK, self.buffer.append_rows),
+            (EventType.BACK.DB.CARDS_VALUES, self.buffer.update_items),
+        ]:
+            EventBus.subscribe(
+                event_type=event,
+                subscriber=Subscriber(
+                    callback=handler,
+                    route_by=DispatcherType.TABLE,
+                    group_id=self.group_id
+                )
+            )
 
     def toggle_tooltip_state(self, state: bool = True):
         for btn in self.table_panel.buttons.values():
@@ -82,6 +82,18 @@ class TermPanel(ttk.Frame):
             btn.pack(side="right", padx=5, pady=3)
             self.buttons[key] = btn
 
+        # Отладка: метрики очередей и обработчиков EventBus
+        btn = HoverButton(
+            self,
+            text="Метрики", command=self.on_metrics_clicked,
+            foreground="#cbcbcb", font=("Segoe UI", 8),
+            background=self.widget_color,
+            activebackground=self.btn_activebackground,
+            activeforeground="#fdfdfd"
+        )
+        btn.pack(side="right", padx=5, pady=3)
+        self.buttons["METRICS"] = btn
+
         self._update_size_icons(active_state=self.active_state)
 
     # region STOP BUTTONS
@@ -114,6 +126,10 @@ class TermPanel(ttk.Frame):
         self.focus_set()
         EventBus.publish(Event(event_type=EventType.VIEW.TERM.STOP))
 
+    def on_metrics_clicked(self):
+        self.focus_set()
+        EventBus.publish(Event(event_type=EventType.VIEW.TERM.METRICS))
+
     def on_small_clicked(self):
         self._set_active_state(state=TERM.SMALL, event_type=EventType.VIEW.TERM.SMALL)
 
@@ -183,7 +199,8 @@ class TermLogger(ttk.Frame):
              lambda: self._set_height(self.HEIGHTS[TERM.MEDIUM])),
             (EventType.VIEW.TERM.LARGE,
              lambda: self._set_height(self.HEIGHTS[TERM.LARGE])),
-            (EventType.BACK.LOGGER.EMITTED, self._write)
+            (EventType.BACK.LOGGER.EMITTED, self._write),
+            (EventType.VIEW.TERM.METRICS, self._write_metrics)
         ]
 
         for event_type, callback in subscriptions:
@@ -232,6 +249,9 @@ class TermLogger(ttk.Frame):
     def set_state(self, state: TERM):
         self.active_state = state
 
+    def _write_metrics(self):
+        self._write(EventBus.render_metrics(), "debug")
+
     def _write(self, msg: str, log_level: str) -> None:
         """
         Insert a log message into the Text widget and scroll to the latest entry.
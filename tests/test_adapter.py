@@ -0,0 +1,75 @@
+import datetime
+
+from src.backend.db.adapter import TableAdapter
+from src.enums import HEADER
+
+
+def report_row(**values):
+    """Кортеж строки report в порядке колонок модели, как его отдаёт Database."""
+    adapter = TableAdapter(HEADER.REPORT)
+    row = [None] * len(adapter.columns)
+    for name, value in values.items():
+        row[adapter.column_index[name]] = value
+    return tuple(row)
+
+
+def test_to_table_maps_tuples_by_column_index():
+    adapter = TableAdapter(HEADER.SONGS)
+    rows = [(7, "Artist", "Song", datetime.time(0, 3, 5), None, "Lyricist", "Label")]
+
+    assert adapter.to_table(rows) == [
+        ["7", "Artist", "Song", "3:05", "", "Lyricist", "Label"]
+    ]
+
+
+def test_to_quarter_report_combines_date_and_time():
+    adapter = TableAdapter(HEADER.REPORT)
+    row = report_row(
+        id=1, date=datetime.date(2024, 2, 3), time=datetime.time(8, 20),
+        title="Song", artist="Artist", play_count=2, program_name="Show"
+    )
+
+    (line,) = adapter.to_quarter_report([row])
+
+    assert line[0] == "Show"
+    assert line[1] == datetime.datetime(2024, 2, 3, 8, 20)
+    assert line[2] == "Song"
+    assert line[6] == 2
+    assert line[-1] == "Artist"
+
+
+def test_to_db_and_to_view_round_trip():
+    adapter = TableAdapter(HEADER.REPORT)
+    ui_row = {
+        "ID": "", "Дата": "2024-02-03", "Время": "8:20:00", "Длительность звучания": "3.05",
+        "Количество исполнений": "2", "Название": "Song", "Лишнее поле": "x"
+    }
+
+    db_row = adapter.to_db(ui_row)
+
+    assert db_row["id"] is None
+    assert db_row["date"] == datetime.date(2024, 2, 3)
+    assert db_row["time"] == datetime.time(8, 20)
+    assert db_row["play_duration"] == datetime.time(0, 3, 5)
+    assert db_row["play_count"] == 2
+    assert "Лишнее поле" not in db_row
+
+    view = adapter.to_view(db_row)
+    assert view["Дата"] == "2024-02-03"
+    assert view["Длительность звучания"] == "3:05"
+    assert view["Время"] == "8:20:00"
+    assert view["Жанр"] == ""
+    assert list(view) == list(adapter.fields_map)
+
+
+def test_to_db_keeps_value_that_cannot_be_coerced():
+    adapter = TableAdapter(HEADER.REPORT)
+
+    assert adapter.to_db({"Количество исполнений": "много"}) == {"play_count": "много"}
+    assert adapter.to_db({"Количество исполнений": "много"}, transform=False) == {"play_count": "много"}
+
+
+def test_aggregated_month_report_rows():
+    rows = TableAdapter.to_aggregated_month_report([("t", "c", "l", 3, "a", None)])
+    assert rows == [["t", "c", "l", 3, "a", None]]
+    assert isinstance(rows[0][3], int)
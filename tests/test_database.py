@@ -0,0 +1,332 @@
+import datetime
+import threading
+
+import pytest
+from sqlalchemy import create_engine, event, inspect, select
+
+from src.backend.db.adapter import TableAdapter
+from src.backend.db.base import SQLITE_PROFILES, apply_sqlite_pragmas, set_sqlite_profile
+from src.backend.db.database import Database
+from src.backend.db.migrations import MigrationRunner, MIGRATIONS, schema_migrations
+from src.backend.db.models import Songs, Report
+from src.enums import HEADER
+from src.frontend.widgets.table import TableBuffer
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}", future=True)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(engine):
+    db = Database(engine=engine)
+    yield db
+    db.release_connections()
+
+
+def query_plan(engine, stmt) -> str:
+    compiled = stmt.compile(dialect=engine.dialect)
+    params = tuple(str(compiled.params[name]) for name in compiled.positiontup)
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params).all()
+    return " | ".join(row[-1] for row in rows)
+
+
+def test_migrations_are_applied_once_and_recorded(db, engine):
+    versions = [m.version for m in MIGRATIONS]
+
+    with engine.connect() as conn:
+        recorded = conn.execute(select(schema_migrations.c.version)).scalars().all()
+    assert recorded == versions
+
+    assert MigrationRunner(engine).run() == []
+
+
+def test_migrations_add_indexes_to_existing_database(engine):
+    # База старой версии: таблицы без индексов и без schema_migrations
+    with engine.begin() as conn:
+        Songs.__table__.create(conn)
+        Report.__table__.create(conn)
+        for index in list(Songs.__table__.indexes) + list(Report.__table__.indexes):
+            index.drop(conn)
+
+    assert MigrationRunner(engine).run() == [m.version for m in MIGRATIONS]
+
+    inspector = inspect(engine)
+    assert {ix["name"] for ix in inspector.get_indexes("report")} == {
+        "ix_report_date_id", "ix_report_song_id"}
+    assert {ix["name"] for ix in inspector.get_indexes("songs")} == {"ix_songs_artist_title"}
+
+
+def test_report_queries_use_indexes(db, engine):
+    stmt = db._report_rows_stmt(datetime.date(2024, 1, 1), datetime.date(2024, 4, 1))
+    plan = query_plan(engine, stmt)
+    assert "USING INDEX ix_report_date_id" in plan
+    assert "TEMP B-TREE" not in plan  # сортировка берётся из индекса
+
+    plan = query_plan(engine, select(Report.id).where(Report.song_id == 1))
+    assert "ix_report_song_id" in plan
+
+    plan = query_plan(engine, select(Songs.id).where(Songs.artist == "a", Songs.title == "t"))
+    assert "ix_songs_artist_title" in plan
+
+
+def test_report_rows_ordered_by_date_and_id(db):
+    song_id = db.add_card("songs", {"artist": "a", "title": "t"})
+    for day in (3, 1, 2):
+        db.add_card("report", {
+            "date": datetime.date(2024, 5, day), "time": datetime.time(8, 0),
+            "artist": "a", "title": "t", "song_id": int(song_id)
+        })
+    db.add_card("report", {
+        "date": datetime.date(2024, 6, 1), "time": datetime.time(8, 0), "artist": "a", "title": "t"
+    })
+
+    rows = db.get_month_report(5, 2024)
+
+    assert [row[1].day for row in rows] == [1, 2, 3]
+
+
+@pytest.mark.parametrize("profile", list(SQLITE_PROFILES))
+def test_sqlite_profile_pragmas_applied_on_connect(engine, profile):
+    event.listen(engine, "connect", lambda conn, _: apply_sqlite_pragmas(conn, profile))
+    expected = SQLITE_PROFILES[profile]
+
+    with engine.connect() as conn:
+        pragma = lambda name: conn.exec_driver_sql(f"PRAGMA {name}").scalar()
+        assert pragma("foreign_keys") == 1
+        assert pragma("journal_mode").upper() == expected["journal_mode"]
+        assert pragma("busy_timeout") == expected["busy_timeout"]
+        assert pragma("cache_size") == expected["cache_size"]
+
+
+def test_unknown_sqlite_profile_is_rejected():
+    assert set_sqlite_profile("turbo") is False
+
+
+def test_state_settings_and_cards_round_trip(db):
+    db.set_state("songs_sort", [1, "artist", "asc"])
+    db.set_state("songs_sort", [2, "title", "desc"])
+    assert db.get_state("songs_sort") == [2, "title", "desc"]
+    assert db.get_state("missing") is None
+
+    db.set_settings({"SHOW_TERMINAL": False, "CARD_TRANSPARENCY": 80})
+    db.set_settings({"CARD_TRANSPARENCY": 90})
+    assert db.get_settings() == {"SHOW_TERMINAL": False, "CARD_TRANSPARENCY": 90}
+
+    card_id = db.add_card("songs", {"ID": "", "artist": "a", "title": "t"})
+    db.update_card(card_id, "songs", {"title": "t2", "unknown": 1})
+    assert db.get_card("songs", card_id)["title"] == "t2"
+
+    db.delete_card([card_id], "songs")
+    assert db.get_card("songs", card_id) is None
+
+
+def test_connection_is_reused_per_thread(db):
+    first = db._connection()
+    db.set_state("key", 1)
+    assert db._connection() is first
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append(db._connection()))
+    thread.start()
+    thread.join()
+    assert other[0] is not first
+
+    db.release_connections()
+    assert first.closed
+    assert db.get_state("key") == 1
+
+
+def test_release_connections_leaves_other_threads_to_reconnect(db):
+    other = []
+    acquired = threading.Event()
+    released = threading.Event()
+    resumed = threading.Event()
+
+    def worker():
+        other.append(db._connection())
+        acquired.set()
+        released.wait()
+        other.append(other[0].closed)
+        other.append(db._connection())
+        resumed.set()
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    mine = db._connection()
+    acquired.wait()
+    db.release_connections()
+    released.set()
+    resumed.wait()
+    thread.join()
+
+    assert mine.closed
+    assert other[1] is False  # чужое соединение не закрыто из этого потока
+    assert other[0].closed and other[2] is not other[0]
+    assert not other[2].closed
+    other[2].close()
+
+
+def test_upsert_cards_inserts_and_updates_in_one_call(db):
+    existing = db.add_card("songs", {"artist": "a", "title": "old"})
+
+    ids = db.upsert_cards("songs", [
+        {"artist": "b", "title": "t1"},
+        {"id": existing, "title": "new"},
+        {"artist": "c", "title": "t2", "label": "L"},
+        {"ID": "", "artist": "d", "title": "t3"},
+    ])
+
+    assert ids[1] == existing
+    assert len(set(ids)) == 4
+    assert [db.get_card("songs", i)["artist"] for i in ids] == ["b", "a", "c", "d"]
+    assert db.get_card("songs", existing)["title"] == "new"
+    assert db.get_card("songs", ids[2])["label"] == "L"
+
+
+def test_add_and_update_cards(db):
+    ids = db.add_cards("report", [
+        {"id": "999", "date": datetime.date(2024, 5, 1), "time": datetime.time(8, d),
+         "artist": "a", "title": f"t{d}"}
+        for d in range(1, 41)
+    ])
+    assert len(ids) == 40 and "999" not in ids
+    assert db.get_card("report", ids[0])["play_count"] == 1  # default колонки
+
+    db.update_cards("report", [{"id": card_id, "genre": "песня"} for card_id in ids])
+    assert {row[11] for row in db.get_month_report(5, 2024)} == {"песня"}
+
+
+def test_upsert_cards_rolls_back_whole_batch(db):
+    assert db.add_cards("songs", [{"artist": "a", "title": "t"}, {"artist": None, "title": "t"}]) == []
+    assert db.get_all_rows("songs") == []
+
+
+def test_data_version_counts_row_changes(db):
+    before = db.get_data_version("songs")
+    card_id = db.add_card("songs", {"artist": "a", "title": "t"})
+    db.update_card(card_id, "songs", {"title": "t2"})
+    db.delete_card([card_id], "songs")
+
+    assert db.get_data_version("songs") == before + 3
+    assert db.get_data_version("report") == 0
+
+
+def test_aggregated_month_report_groups_plays_per_work(db):
+    def play(day, artist, title, count=1, label=None):
+        db.add_card("report", {
+            "date": datetime.date(2024, 5, day), "time": datetime.time(8, 0),
+            "artist": artist, "title": title, "play_count": count, "label": label
+        })
+
+    play(3, "b", "second")
+    play(1, "a", "first", 2)
+    play(2, "a", "first")
+    play(4, "b", "second", 3)
+    play(5, "a", "first", label="other label")
+    play(1, "a", "first")
+    db.add_card("report", {"date": datetime.date(2024, 6, 1), "time": datetime.time(8, 0),
+                           "artist": "a", "title": "first"})
+
+    rows = db.get_month_report_aggregated(5, 2024)
+
+    assert [(row.title, row.play_count, row.label) for row in rows] == [
+        ("first", 4, None), ("second", 4, None), ("first", 1, "other label")]
+
+
+def test_aggregated_month_report_uses_date_index(db, engine):
+    stmt = db._aggregated_report_stmt(datetime.date(2024, 5, 1), datetime.date(2024, 6, 1))
+    assert "USING INDEX ix_report_date_id" in query_plan(engine, stmt)
+
+
+def test_migration_backfills_duration_seconds(engine):
+    # База до миграции 4: длительности только в колонках Time
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "CREATE TABLE songs (id INTEGER PRIMARY KEY, artist VARCHAR NOT NULL, "
+            "title VARCHAR NOT NULL, duration TIME, composer VARCHAR, lyricist VARCHAR, label VARCHAR)")
+        conn.exec_driver_sql(
+            "INSERT INTO songs (artist, title, duration) "
+            "VALUES ('a', 't', '01:02:03.000000'), ('b', 't', NULL)")
+
+    MigrationRunner(engine).run()
+
+    with engine.connect() as conn:
+        rows = conn.execute(select(Songs.duration, Songs.duration_sec).order_by(Songs.id)).all()
+    assert rows == [(datetime.time(1, 2, 3), 3723), (None, None)]
+
+
+def test_duration_seconds_follow_writes(db):
+    card_id = db.add_card("songs", {"artist": "a", "title": "t", "duration": datetime.time(0, 3, 10)})
+    assert db.get_card("songs", card_id)["duration_sec"] == 190
+
+    db.update_card(card_id, "songs", {"duration": None})
+    assert db.get_card("songs", card_id)["duration_sec"] is None
+
+    ids = db.upsert_cards("songs", [
+        {"id": card_id, "duration": datetime.time(0, 1, 0)},
+        {"artist": "b", "title": "t", "duration": datetime.time(0, 0, 5)},
+    ])
+    assert [db.get_card("songs", i)["duration_sec"] for i in ids] == [60, 5]
+
+
+def test_table_sort_seconds_match_stored_seconds(db):
+    for duration in (datetime.time(0, 0, 7), datetime.time(0, 12, 5), datetime.time(2, 0, 59), None):
+        db.add_card("songs", {"artist": "a", "title": "t", "duration": duration})
+    adapter = TableAdapter(HEADER.SONGS)
+    ui_index = [adapter.fields_map[key] for key in adapter._ui_headers()].index("duration")
+    rows = db.get_all_rows("songs")
+
+    for ui_row, db_row in zip(adapter.to_table(rows), rows):
+        stored = db_row[adapter.column_index["duration_sec"]]
+        expected = float("inf") if stored is None else stored
+        assert TableBuffer._duration_seconds(ui_row[ui_index]) == expected
+
+
+def test_quarter_play_seconds_summed_in_sql(db):
+    for month, play in ((1, datetime.time(0, 3, 0)), (3, datetime.time(1, 0, 1)),
+                        (3, None), (4, datetime.time(0, 5, 0))):
+        db.add_card("report", {
+            "date": datetime.date(2024, month, 10), "time": datetime.time(8, 0),
+            "artist": "a", "title": "t", "play_duration": play
+        })
+
+    assert db.get_quarter_play_seconds(1, 2024) == 180 + 3601
+    assert db.get_quarter_play_seconds(3, 2024) == 0
+    assert db.get_quarter_play_seconds(5, 2024) is None
+
+
+def test_rows_page_walks_report_by_date_and_id(db, engine):
+    for day in (3, 1, 2, 1, 3):
+        db.add_card("report", {"date": datetime.date(2024, 5, day), "time": datetime.time(8, 0),
+                               "artist": "a", "title": "t"})
+
+    def keys(rows):
+        return [(row[1].day, row[0]) for row in rows]
+
+    first = db.get_rows_page("report", limit=2)
+    assert keys(first) == [(1, 2), (1, 4)]
+    second = db.get_rows_page("report", after=db.page_key("report", first[-1]), limit=2)
+    assert keys(second) == [(2, 3), (3, 1)]
+
+    last = db.get_rows_page("report", limit=2, direction=-1)
+    assert keys(last) == [(3, 1), (3, 5)]
+    before = db.get_rows_page("report", after=db.page_key("report", last[0]), limit=2, direction=-1)
+    assert keys(before) == [(1, 4), (2, 3)]
+
+    stmt = db._page_stmt(Report, (datetime.date(2024, 5, 1), 1), 2, -1)
+    plan = query_plan(engine, stmt)
+    assert "USING INDEX ix_report_date_id" in plan and "TEMP B-TREE" not in plan
+
+
+def test_rows_page_for_songs_uses_id(db):
+    ids = [db.add_card("songs", {"artist": f"a{i}", "title": "t"}) for i in range(3)]
+
+    page = db.get_rows_page("songs", after=(int(ids[0]),), limit=5)
+
+    assert [str(row[0]) for row in page] == ids[1:]
+    assert db.get_rows_page("unknown") == []
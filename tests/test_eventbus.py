@@ -0,0 +1,337 @@
+import queue
+import time
+from collections import defaultdict
+
+import pytest
+
+from src.enums import CoalesceMode, DispatcherType, GROUP
+from src.eventbus import (BusMetrics, CoalescePolicy, Dispatcher, Event, EventBus, Histogram,
+                          Subscriber, TkDispatcher)
+
+
+class FakeTk:
+    """Вместо Tk: after только запоминает колбэки, run выполняет их по очереди."""
+
+    def __init__(self):
+        self.scheduled = []
+        self.errors = []
+
+    def after(self, ms, func):
+        self.scheduled.append((ms, func))
+
+    def report_callback_exception(self, exc_type, exc, tb):
+        self.errors.append(exc)
+
+    def run_next(self):
+        _, func = self.scheduled.pop(0)
+        func()
+
+
+def test_burst_wakes_tk_loop_once():
+    tk = FakeTk()
+    dispatcher = TkDispatcher(tk)
+    calls = []
+
+    for i in range(100):
+        dispatcher.dispatch(calls.append, i)
+
+    assert len(tk.scheduled) == 1
+    tk.run_next()
+    assert calls == list(range(100))
+    assert tk.scheduled == []
+
+    # После опустошения очереди следующий вызов снова будит цикл
+    dispatcher.dispatch(calls.append, 100)
+    assert len(tk.scheduled) == 1
+
+
+def test_drain_respects_frame_budget(monkeypatch):
+    tk = FakeTk()
+    dispatcher = TkDispatcher(tk)
+    clock = iter(range(1000))
+    monkeypatch.setattr("src.eventbus.time.perf_counter", lambda: next(clock) * 0.003)
+    calls = []
+
+    for i in range(10):
+        dispatcher.dispatch(calls.append, i)
+    tk.run_next()
+
+    # Бюджет 8 мс при 3 мс на колбэк: часть пачки выполнена, остальное перенесено
+    assert 0 < len(calls) < 10
+    assert [ms for ms, _ in tk.scheduled] == [TkDispatcher.RESCHEDULE_MS]
+
+    while tk.scheduled:
+        tk.run_next()
+    assert calls == list(range(10))
+
+
+def test_failing_callback_does_not_stop_batch():
+    tk = FakeTk()
+    dispatcher = TkDispatcher(tk)
+    calls = []
+
+    dispatcher.dispatch(lambda: 1 / 0)
+    dispatcher.dispatch(calls.append, "after error")
+    tk.run_next()
+
+    assert calls == ["after error"]
+    assert isinstance(tk.errors[0], ZeroDivisionError)
+
+
+def test_stopped_dispatcher_drops_callbacks():
+    tk = FakeTk()
+    dispatcher = TkDispatcher(tk)
+
+    dispatcher.stop()
+    dispatcher.dispatch(print, "ignored")
+
+    assert tk.scheduled == []
+    assert not dispatcher._pending
+
+
+class RecordingDispatcher(Dispatcher):
+    def __init__(self):
+        self.calls = []
+
+    def dispatch(self, callback, *args, **kwargs):
+        self.calls.append(args)
+
+
+@pytest.fixture
+def bus(monkeypatch):
+    """Чистое состояние EventBus без рабочего потока: очередь разбирается в тесте."""
+    dispatcher = RecordingDispatcher()
+    monkeypatch.setattr(EventBus, "_subscribers", defaultdict(list))
+    monkeypatch.setattr(EventBus, "_dispatchers", {DispatcherType.DB: dispatcher})
+    monkeypatch.setattr(EventBus, "_event_queue", queue.Queue())
+    for name in ("_routes", "_policies", "_policy_owners", "_latest", "_deferred", "_last_delivery"):
+        monkeypatch.setattr(EventBus, name, {})
+
+    def process():
+        while not EventBus._event_queue.empty():
+            EventBus._handle(*EventBus._event_queue.get_nowait())
+
+    dispatcher.process = process
+    return dispatcher
+
+
+def subscribe(event_type, policy=None, group_id=None):
+    EventBus.subscribe(event_type, Subscriber(
+        callback=print, route_by=DispatcherType.DB, group_id=group_id, policy=policy))
+
+
+def test_policy_is_removed_with_its_last_subscriber(bus):
+    debounce = CoalescePolicy(CoalesceMode.DEBOUNCE, delay_ms=100)
+    latest = CoalescePolicy(CoalesceMode.LATEST)
+    first = Subscriber(callback=print, route_by=DispatcherType.DB,
+                       group_id=GROUP.SONGS_TABLE, policy=debounce)
+    second = Subscriber(callback=print, route_by=DispatcherType.DB,
+                        group_id="songs", policy=latest)
+    EventBus.subscribe("SIZE", first)
+    EventBus.subscribe("SIZE", second)
+    assert EventBus._policies[("SIZE", GROUP.SONGS_TABLE)] is latest
+
+    EventBus.unsubscribe("SIZE", second)
+    assert EventBus._policies[("SIZE", GROUP.SONGS_TABLE)] is debounce
+
+    EventBus.unsubscribe("SIZE", first)
+    assert EventBus._policies == {}
+    assert EventBus._policy_owners == {}
+
+
+def test_latest_wins_per_group_and_key(bus):
+    subscribe("SIZE", CoalescePolicy(CoalesceMode.LATEST, key=lambda name, *_: name))
+
+    for group in (GROUP.SONGS_TABLE, GROUP.REPORT_TABLE, GROUP.SONGS_TABLE):
+        EventBus.publish(Event("SIZE", group), "size", group.value)
+    EventBus.publish(Event("SIZE", GROUP.SONGS_TABLE), "sort", "songs")
+    bus.process()
+
+    assert bus.calls == [("size", "report"), ("size", "songs"), ("sort", "songs")]
+
+
+def test_events_without_policy_are_all_delivered(bus):
+    subscribe("SAVE")
+
+    for i in range(3):
+        EventBus.publish(Event("SAVE"), i)
+    bus.process()
+
+    assert bus.calls == [(0,), (1,), (2,)]
+
+
+def test_debounce_delivers_latest_after_quiet_period(bus, monkeypatch):
+    subscribe("SETTINGS", CoalescePolicy(CoalesceMode.DEBOUNCE, 300))
+    now = [10.0]
+    monkeypatch.setattr("src.eventbus.time.monotonic", lambda: now[0])
+
+    for value in (1, 2, 3):
+        EventBus.publish(Event("SETTINGS"), value)
+        now[0] += 0.1
+    bus.process()
+
+    EventBus._release_deferred(now[0])
+    assert bus.calls == []
+    assert EventBus._deferred_timeout(now[0]) == pytest.approx(0.2)
+
+    EventBus._release_deferred(now[0] + 0.25)
+    assert bus.calls == [(3,)]
+
+
+def test_throttle_delivers_first_and_trailing_event(bus, monkeypatch):
+    subscribe("SCROLL", CoalescePolicy(CoalesceMode.THROTTLE, 100))
+    now = [0.0]
+    monkeypatch.setattr("src.eventbus.time.monotonic", lambda: now[0])
+
+    for value in range(5):
+        EventBus.publish(Event("SCROLL"), value)
+        now[0] += 0.01
+    bus.process()
+    assert bus.calls == [(0,)]
+
+    EventBus._release_deferred(0.1)
+    assert bus.calls == [(0,), (4,)]
+
+
+def test_publisher_policy_and_shutdown_release(bus):
+    subscribe("PATH")
+
+    EventBus.publish(Event("PATH", policy=CoalescePolicy(CoalesceMode.DEBOUNCE, 60_000)), "a")
+    EventBus.publish(Event("PATH", policy=CoalescePolicy(CoalesceMode.DEBOUNCE, 60_000)), "b")
+    bus.process()
+    assert bus.calls == []
+
+    EventBus._release_deferred(0.0, force=True)
+    assert bus.calls == [("b",)]
+
+
+def test_routes_by_event_type_and_group(bus):
+    subscribe("ROW", group_id=GROUP.SONGS_TABLE)
+    subscribe("ROW")
+    subscribe("ROW", group_id=GROUP.REPORT_TABLE)
+
+    EventBus.publish(Event("ROW", GROUP.SONGS_TABLE), "songs")
+    EventBus.publish(Event("ROW", "report"), "report")  # строка с тем же значением
+    EventBus.publish(Event("ROW"), "common")
+    EventBus.publish(Event("OTHER"), "nobody")
+    bus.process()
+
+    assert bus.calls == [("songs",)] * 2 + [("report",)] * 2 + [("common",)]
+
+
+def test_routes_are_replaced_on_subscription_change(bus):
+    subscriber = Subscriber(callback=print, route_by=DispatcherType.DB, group_id=GROUP.SONGS_TABLE)
+    EventBus.subscribe("ROW", subscriber)
+    routes = EventBus._routes
+
+    EventBus.unsubscribe("ROW", subscriber)
+
+    # Уже прочитанная таблица не меняется, новая публикуется целиком
+    assert routes[("ROW", GROUP.SONGS_TABLE)] == (subscriber,)
+    assert EventBus._routes == {}
+
+
+def test_histogram_percentiles_use_bucket_bounds():
+    hist = Histogram()
+    for ms in [0.5] * 90 + [30] * 9 + [700]:
+        hist.add(ms)
+
+    assert hist.count == 100
+    assert hist.percentile(0.5) == 1
+    assert hist.percentile(0.95) == 50
+    assert hist.percentile(1.0) == hist.max_ms == 700
+
+
+def test_metrics_record_waits_handlers_and_slow_warning(bus, monkeypatch, caplog):
+    monkeypatch.setattr(EventBus, "metrics", BusMetrics())
+    clock = iter([0.0, 0.010, 0.020, 0.050, 0.300])
+    monkeypatch.setattr("src.eventbus.time.perf_counter", lambda: next(clock))
+    wrapped = []
+    bus.dispatch = lambda callback, *args, **kwargs: wrapped.append((callback, args))
+    subscribe("SAVE")
+
+    EventBus.publish(Event("SAVE"), 1)   # 0.000: в очередь шины
+    bus.process()                        # 0.010: взято шиной, 0.020: передано диспетчеру
+    callback, args = wrapped[0]
+    callback(*args)                      # 0.050: старт обработчика, 0.300: конец
+
+    metrics = EventBus.metrics
+    assert metrics.waits["bus"].max_ms == pytest.approx(10)
+    assert metrics.waits["DB"].max_ms == pytest.approx(30)
+    assert metrics.handlers["SAVE"].max_ms == pytest.approx(250)
+    assert metrics.slow["SAVE"] == 1
+    assert "Slow handler" in caplog.text
+
+    rendered = EventBus.render_metrics()
+    assert "SAVE" in rendered and "bus" in rendered
+
+
+class ImmediateDispatcher(Dispatcher):
+    def __init__(self):
+        self.calls = []
+
+    def dispatch(self, callback, *args, **kwargs):
+        self.calls.append(args)
+        callback(*args, **kwargs)
+
+
+@pytest.fixture
+def request_bus(bus, monkeypatch):
+    db, tk = ImmediateDispatcher(), ImmediateDispatcher()
+    monkeypatch.setattr(EventBus, "_dispatchers", {DispatcherType.DB: db, DispatcherType.TK: tk})
+    return bus, tk
+
+
+def test_request_reply_is_routed_to_caller_dispatcher(request_bus):
+    bus, tk = request_bus
+    EventBus.subscribe("GET", Subscriber(callback=lambda a, b: a + b, route_by=DispatcherType.DB))
+    replies = []
+
+    futures = [EventBus.request(Event("GET"), i, 10, on_reply=replies.append) for i in range(3)]
+    bus.process()
+
+    assert [f.result(timeout=0) for f in futures] == [10, 11, 12]
+    assert replies == [10, 11, 12]
+    assert tk.calls == [(10,), (11,), (12,)]
+
+
+def test_request_errors_and_missing_handler(request_bus):
+    bus, _ = request_bus
+    EventBus.subscribe("FAIL", Subscriber(callback=lambda: 1 / 0, route_by=DispatcherType.DB))
+    errors = []
+
+    failed = EventBus.request(Event("FAIL"), on_error=errors.append)
+    unhandled = EventBus.request(Event("NOBODY"))
+    bus.process()
+
+    assert isinstance(failed.exception(timeout=0), ZeroDivisionError)
+    assert isinstance(errors[0], ZeroDivisionError)
+    assert isinstance(unhandled.exception(timeout=0), LookupError)
+
+
+def test_request_timeout_and_cancellation(request_bus):
+    bus, tk = request_bus
+    calls = []
+
+    def handler(value):
+        calls.append(value)
+        if value == "slow":
+            time.sleep(0.05)
+        return value
+
+    EventBus.subscribe("GET", Subscriber(callback=handler, route_by=DispatcherType.DB))
+
+    # Ожидание в очереди в таймаут не входит
+    queued = EventBus.request(Event("GET"), "queued", timeout=0.01)
+    time.sleep(0.03)
+    slow = EventBus.request(Event("GET"), "slow", timeout=0.01)
+    cancelled = EventBus.request(Event("GET"), "cancelled", on_reply=print)
+    assert cancelled.cancel()
+    bus.process()
+
+    assert queued.result(timeout=0) == "queued"
+    with pytest.raises(TimeoutError):
+        slow.result(timeout=0)
+    # Обработчик отменённого запроса не запускается
+    assert calls == ["queued", "slow"]
+    assert tk.calls == []
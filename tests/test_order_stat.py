@@ -0,0 +1,86 @@
+import random
+
+import pytest
+
+from src.frontend.utils import OrderedKeys
+
+
+@pytest.fixture
+def small_blocks(monkeypatch):
+    # Маленькие блоки, чтобы тесты проходили через деление и удаление блоков
+    monkeypatch.setattr(OrderedKeys, "LOAD", 4)
+
+
+def test_behaves_like_list(small_blocks):
+    keys = OrderedKeys(["a", "b", "c"])
+    keys.insert(1, "x")
+    keys.append("y")
+    keys.insert(0, "z")
+
+    assert keys == ["z", "a", "x", "b", "c", "y"]
+    assert keys.index("b") == 3
+    assert keys[-1] == "y"
+    assert keys[1:3] == ["a", "x"]
+    assert keys.pop(2) == "x"
+    assert keys.pop() == "y"
+    assert "x" not in keys and "a" in keys
+    assert keys.copy() == ["z", "a", "b", "c"]
+
+
+def test_missing_and_duplicate_keys(small_blocks):
+    keys = OrderedKeys(["a"])
+    with pytest.raises(ValueError):
+        keys.index("b")
+    with pytest.raises(ValueError):
+        keys.insert(0, "a")
+    with pytest.raises(IndexError):
+        keys[5]
+    with pytest.raises(ValueError):
+        OrderedKeys(["a", "a"])
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_random_operations_match_list(small_blocks, seed):
+    rnd = random.Random(seed)
+    expected = [str(i) for i in range(rnd.randint(0, 40))]
+    keys = OrderedKeys(expected)
+    next_id = len(expected)
+
+    for _ in range(300):
+        op = rnd.random()
+        if op < 0.4 or not expected:
+            pos = rnd.randint(0, len(expected))
+            expected.insert(pos, str(next_id))
+            keys.insert(pos, str(next_id))
+            next_id += 1
+        elif op < 0.6:
+            pos = rnd.randrange(len(expected))
+            assert keys.pop(pos) == expected.pop(pos)
+        elif op < 0.7:
+            victims = rnd.sample(expected, min(len(expected), rnd.randint(1, 10)))
+            keys.discard_many(victims + ["missing"])
+            expected = [k for k in expected if k not in victims]
+        else:
+            key = rnd.choice(expected)
+            assert keys.index(key) == expected.index(key)
+            pos = rnd.randrange(len(expected))
+            assert keys[pos] == expected[pos]
+
+        assert len(keys) == len(expected)
+
+    assert keys == expected
+
+
+@pytest.mark.parametrize("size, picked", [(40, 15), (5000, 20), (5000, 3000)])
+def test_ordered_subset_follows_list_order(size, picked):
+    rnd = random.Random(size + picked)
+    expected = [str(i) for i in range(size)]
+    rnd.shuffle(expected)
+    keys = OrderedKeys(expected)
+    for key in rnd.sample(expected, size // 10):
+        keys.remove(key)
+        expected.remove(key)
+
+    subset = set(rnd.sample(expected, picked)) | {"missing"}
+
+    assert keys.ordered(subset) == [key for key in expected if key in subset]
@@ -0,0 +1,85 @@
+import pytest
+
+from src.backend.db.snapshot import SnapshotStore
+
+
+ROWS = [["1", "Alpha", "3:10"], ["2", "Beta", ""], ["3", "Гамма", "1:00:00"]]
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SnapshotStore(tmp_path)
+    store.WRITE_DELAY = 60
+    yield store
+    if store._timer is not None:
+        store._timer.cancel()
+
+
+def test_round_trip_with_order(store, tmp_path):
+    store.replace("songs", ROWS, (3, 10))
+    store.set_order("songs", (1, "Название", -1), ["3", "2", "1"])
+    store.flush()
+
+    snapshot = SnapshotStore(tmp_path).load("songs", (3, 10))
+
+    assert snapshot.rows == ROWS
+    assert snapshot.order == ["3", "2", "1"]
+    assert snapshot.sort_state == (1, "Название", -1)
+
+
+def test_stale_key_or_missing_file_is_not_loaded(store, tmp_path):
+    assert store.load("songs", (3, 10)) is None
+
+    store.replace("songs", ROWS, (3, 10))
+    store.flush()
+
+    assert SnapshotStore(tmp_path).load("songs", (3, 11)) is None
+    assert SnapshotStore(tmp_path).load("songs", (4, 10)) is None
+
+
+def test_empty_table_round_trip(store, tmp_path):
+    store.replace("report", [], (3, 0))
+    store.flush()
+
+    assert SnapshotStore(tmp_path).load("report", (3, 0)).rows == []
+
+
+def test_incremental_update_and_delete(store, tmp_path):
+    store.replace("songs", ROWS, (3, 10))
+    store.set_order("songs", None, ["1", "2", "3"])
+
+    store.update("songs", [["2", "Beta 2", "2:00"], ["4", "Delta", ""]], (3, 12))
+    store.delete("songs", ["1"], (3, 13))
+    store.flush()
+
+    snapshot = SnapshotStore(tmp_path).load("songs", (3, 13))
+    assert snapshot.rows == [["2", "Beta 2", "2:00"], ["3", "Гамма", "1:00:00"], ["4", "Delta", ""]]
+    assert snapshot.order is None  # порядок после изменений неизвестен
+
+
+def test_update_without_version_change_drops_snapshot(store, tmp_path):
+    store.replace("songs", ROWS, (3, 10))
+    store.flush()
+
+    store.update("songs", [["1", "changed", ""]], (3, 10))
+    store.flush()
+
+    # На диске остался последний согласованный с базой снимок
+    assert SnapshotStore(tmp_path).load("songs", (3, 10)).rows == ROWS
+    assert "songs" not in store._tables
+
+
+def test_order_must_cover_snapshot_rows(store, tmp_path):
+    store.replace("songs", ROWS, (3, 10))
+    store.set_order("songs", None, ["1", "2"])
+    store.set_order("songs", None, ["1", "2", "5"])
+    store.flush()
+
+    assert SnapshotStore(tmp_path).load("songs", (3, 10)).order is None
+
+
+def test_separator_in_data_skips_snapshot(store, tmp_path):
+    store.replace("songs", [["1", "a\x1fb", ""]], (3, 1))
+    store.flush()
+
+    assert not store.path("songs").exists()
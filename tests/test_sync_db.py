@@ -0,0 +1,184 @@
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine, event
+
+from src.backend.db.database import Database
+from src.backend.db.settings import DEFAULT_SETTINGS
+from src.backend.db.snapshot import SnapshotStore
+from src.backend.db.sync_db import SyncDB
+from src.enums import ConfigKey, EventType, HEADER, STATE
+from src.eventbus import EventBus
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}", future=True)
+    db = Database(engine=engine)
+    yield db
+    db.release_connections()
+    engine.dispose()
+
+
+@pytest.fixture
+def sync_db(db, tmp_path):
+    with patch.object(EventBus, "subscribe"), \
+         patch.object(EventBus, "register_flush") as flush_mock:
+        sync_db = SyncDB(db=db, snapshots=SnapshotStore(tmp_path))
+    sync_db.register_flush_mock = flush_mock
+    yield sync_db
+    if sync_db._flush_timer is not None:
+        sync_db._flush_timer.cancel()
+
+
+def test_flush_is_registered_in_eventbus(sync_db):
+    sync_db.register_flush_mock.assert_called_once_with(sync_db.flush_states)
+
+
+def test_state_writes_are_coalesced_until_flush(sync_db, db):
+    sync_db.STATE_FLUSH_DELAY = 60
+    with patch.object(db, "set_states", wraps=db.set_states) as set_states:
+        for path in ("a", "b", "c"):
+            sync_db.set_state(STATE.MONTHLY_PATH, path)
+        sync_db.set_state(STATE.QUARTERLY_PATH, "q")
+
+        # Чтение из памяти, в базе ещё ничего нет
+        assert sync_db.get_state(STATE.MONTHLY_PATH) == "c"
+        assert db.get_state(STATE.MONTHLY_PATH.value) is None
+        set_states.assert_not_called()
+
+        sync_db.flush_states()
+        set_states.assert_called_once_with({"monthly_path": "c", "quarterly_path": "q"})
+
+    assert db.get_state("monthly_path") == "c"
+    assert sync_db._flush_timer is None
+
+
+def test_flush_timer_requests_flush_on_db_thread(sync_db):
+    sync_db.STATE_FLUSH_DELAY = 0.01
+    with patch.object(EventBus, "publish") as pub_mock:
+        sync_db.set_state(STATE.MONTHLY_PATH, "a")
+        sync_db._flush_timer.join(1)
+
+    event = pub_mock.call_args[0][0]
+    assert event.event_type == EventType.BACK.DB.FLUSH_STATE
+
+
+def test_state_reads_are_cached_and_copied(sync_db, db):
+    db.set_state("songs_sort", [1, "artist", 1])
+
+    with patch.object(db, "get_state", wraps=db.get_state) as get_state:
+        first = sync_db.get_state(STATE.SONGS_SORT)
+        second = sync_db.get_state(STATE.SONGS_SORT)
+
+    assert first == second == (1, "Исполнитель", 1)
+    assert get_state.call_count == 1
+    assert sync_db._states["songs_sort"] == [1, "artist", 1]
+
+
+def test_bootstrap_snapshot_loads_states_and_settings_in_one_query(sync_db, db):
+    db.set_states({
+        "songs_col_size": {"artist": 120},
+        "monthly_path": "/reports",
+        "report_sort": [2, "title", -1],
+    })
+    db.set_settings({"SHOW_TERMINAL": False, "SQLITE_PROFILE": "safe"})
+
+    statements = []
+    event.listen(db.engine, "before_cursor_execute",
+                 lambda conn, cursor, stmt, *args: statements.append(stmt))
+    snapshot = sync_db.load_bootstrap_snapshot()
+
+    assert len(statements) == 1
+    assert snapshot.songs_col_size["Исполнитель"] == 120
+    assert snapshot.monthly_path == "/reports"
+    assert snapshot.quarterly_path is None
+    assert snapshot.songs_sort is None
+    assert snapshot.report_sort == (2, "Название", -1)
+    assert snapshot.settings[ConfigKey.SHOW_TERMINAL] is False
+    assert snapshot.settings[ConfigKey.SQLITE_PROFILE] == "safe"
+    assert snapshot.settings[ConfigKey.CARD_PIN] == DEFAULT_SETTINGS[ConfigKey.CARD_PIN]
+
+    # Последующие чтения — из кеша
+    assert sync_db.get_state(STATE.MONTHLY_PATH) == "/reports"
+    assert len(statements) == 1
+
+
+def test_table_snapshot_follows_saved_cards(db, tmp_path):
+    snapshots = SnapshotStore(tmp_path)
+    snapshots.WRITE_DELAY = 60
+    with patch.object(EventBus, "subscribe"), patch.object(EventBus, "register_flush"):
+        sync_db = SyncDB(db=db, snapshots=snapshots)
+
+    assert sync_db.load_table_snapshot(HEADER.SONGS) is None
+    assert sync_db.get_all_rows(HEADER.SONGS) == []
+
+    with patch.object(EventBus, "publish"):
+        sync_db.save_card("", HEADER.SONGS.value, {
+            "ID": "", "Исполнитель": "a", "Название": "t", "Общий хронометраж": "3:00",
+            "Композитор": "", "Автор текста": "", "Лэйбл": ""
+        })
+    sync_db.save_snapshots({HEADER.SONGS: ["1"]})
+
+    snapshot = SyncDB(db=db, snapshots=SnapshotStore(tmp_path)).load_table_snapshot(HEADER.SONGS)
+    assert snapshot.rows == sync_db.get_all_rows(HEADER.SONGS)
+    assert snapshot.order == ["1"]
+
+    # Изменение базы мимо SyncDB делает снимок устаревшим
+    db.add_card("songs", {"artist": "b", "title": "t"})
+    assert sync_db.load_table_snapshot(HEADER.SONGS) is None
+
+
+def test_rows_page_publishes_rows_and_cursor(sync_db, db):
+    for i in range(3):
+        db.add_card("songs", {"artist": f"a{i}", "title": "t"})
+
+    with patch.object(EventBus, "publish") as pub_mock:
+        sync_db.get_rows_page(HEADER.SONGS, limit=2)
+        sync_db.get_rows_page(HEADER.SONGS, after=(2,), limit=2)
+
+    (event, rows, cursor, direction), _ = pub_mock.call_args_list[0]
+    assert event.event_type == EventType.BACK.DB.TABLE_PAGE
+    assert [row[0] for row in rows] == ["1", "2"] and cursor == (2,) and direction == 1
+
+    # Последняя страница неполная — курсора дальше нет
+    _, rows, cursor, _ = pub_mock.call_args_list[1][0]
+    assert [row[0] for row in rows] == ["3"] and cursor is None
+
+
+def test_get_card_returns_view_dict(sync_db, db):
+    card_id = db.add_card("songs", {"artist": "a", "title": "t"})
+
+    card = sync_db.get_card(HEADER.SONGS, card_id)
+
+    assert card["ID"] == card_id
+    assert card["Исполнитель"] == "a"
+
+
+def test_get_card_missing_raises_lookup_error(sync_db):
+    with pytest.raises(LookupError):
+        sync_db.get_card(HEADER.SONGS, "999")
+
+
+def test_save_cards_does_not_broadcast_validation(sync_db, db):
+    cards = [
+        {"ID": "", "Исполнитель": "a", "Название": "t", "Общий хронометраж": "3:00",
+         "Композитор": "", "Автор текста": "", "Лэйбл": ""},
+        {"ID": "", "Исполнитель": "", "Название": "bad", "Общий хронометраж": "x",
+         "Композитор": "", "Автор текста": "", "Лэйбл": ""},
+    ]
+    with patch.object(EventBus, "publish") as pub_mock:
+        sync_db.save_cards(HEADER.SONGS, cards)
+
+    events = [call[0][0].event_type for call in pub_mock.call_args_list]
+    assert EventType.BACK.DB.VALIDATION not in events
+    assert [row[1] for row in db.get_all_rows("songs")] == ["a"]
+
+
+def test_sqlite_profile_setting_is_saved_not_applied(sync_db, db):
+    with patch("src.backend.db.sync_db.set_sqlite_profile") as switch:
+        sync_db.set_settings({ConfigKey.SQLITE_PROFILE: "fast"})
+
+    switch.assert_not_called()
+    assert db.get_settings()["SQLITE_PROFILE"] == "fast"
+    assert DEFAULT_SETTINGS[ConfigKey.SQLITE_PROFILE] == "safe"
@@ -1,7 +1,9 @@
+import random
+
 import pytest
 from unittest.mock import patch
 
-from src.frontend.widgets.table import TableBuffer  # путь к модулю с TableBuffer
+from src.frontend.widgets.table import TableBuffer, SearchGeneration  # путь к модулю с TableBuffer
 from src.enums import EventType, GROUP
 from src.eventbus import EventBus
 
@@ -294,20 +296,6 @@ def test_find_insert_position_sorted(buffer_for_sort_tests):
     assert pos == 1  # между 10 и 20
 
 
-def test_insert_sorted_key(buffer_for_sort_tests):
-    buf = buffer_for_sort_tests
-    buf.original_data = {
-        "1": ["10", "aaa"],
-        "2": ["20", "bbb"],
-        "3": ["15", "ccc"]
-    }
-    buf.sorted_keys = ["1", "2"]
-    buf.sort_key = (0, "ID", 1)
-
-    buf._insert_sorted_key("3")
-    assert buf.sorted_keys == ["1", "3", "2"]
-
-
 def test_find_insert_position_no_sort_existing_key(buffer_for_sort_tests):
     buf = buffer_for_sort_tests
     buf.original_data = {
@@ -335,3 +323,342 @@ def test_find_insert_position_sorted_existing_key(buffer_for_sort_tests):
     # Ключ уже в списке, проверим, куда он будет вставлен повторно
     pos = buf._find_insert_position("3", was_present=True)
     assert pos == 1  # ключ со значением "15" должен быть между "10" и "20"
+
+
+@pytest.fixture
+def indexed_buffer():
+    return TableBuffer(
+        group_id=GROUP.SONGS_TABLE,
+        original_data={
+            "1": ["1", "Apple pie"],
+            "2": ["2", "Banana split"],
+            "3": ["3", "Pineapple"],
+            "4": ["4", "Grape"],
+        },
+        header_map={},
+        ngram_index=True
+    )
+
+
+def test_ngram_candidates_narrow_search(indexed_buffer):
+    candidates = indexed_buffer._ngram_candidates("apple")
+    assert candidates == {"1", "3"}
+    assert indexed_buffer._ngram_candidates("xyz") == set()
+    # Короткие термы ищутся полным перебором
+    assert indexed_buffer._ngram_candidates("ap") is None
+
+
+def test_ngram_filter_keeps_sort_order(indexed_buffer, patch_eventbus_publish):
+    pub_mock, _ = patch_eventbus_publish
+    indexed_buffer.sorted_keys = ["4", "3", "2", "1"]
+
+    indexed_buffer.filter_data("apple")
+
+    _, data_arg, _ = pub_mock.call_args[0]
+    assert [row[0] for row in data_arg] == ["3", "1"]
+
+
+def test_ngram_filter_after_backspace(indexed_buffer, patch_eventbus_publish):
+    pub_mock, _ = patch_eventbus_publish
+
+    indexed_buffer.filter_data("apple pie")
+    indexed_buffer.filter_data("apple")
+
+    _, data_arg, _ = pub_mock.call_args[0]
+    assert [row[0] for row in data_arg] == ["1", "3"]
+
+
+def test_ngram_index_follows_update_and_delete(indexed_buffer):
+    assert indexed_buffer._ngram_candidates("grape") == {"4"}
+
+    indexed_buffer.update_item(["4", "Grapefruit"])
+    indexed_buffer.update_item(["5", "Green grape"])
+    assert indexed_buffer._ngram_candidates("grape") == {"4", "5"}
+
+    indexed_buffer.update_item(["4", "Cherry"])
+    assert indexed_buffer._ngram_candidates("grape") == {"5"}
+
+    indexed_buffer.delete_items(["5"], GROUP.SONGS_TABLE)
+    assert indexed_buffer._ngram_candidates("grape") == set()
+    assert "grap" not in "".join(indexed_buffer._ngram_index)
+
+
+def test_ngram_index_build_yields_to_newer_search(patch_eventbus_publish, monkeypatch):
+    pub_mock, _ = patch_eventbus_publish
+    generation = SearchGeneration()
+    buf = TableBuffer(
+        group_id=GROUP.SONGS_TABLE,
+        original_data={str(i): [str(i), "apple" if i % 2 else "grape"] for i in range(10)},
+        header_map={},
+        ngram_index=True,
+        search_generation=generation
+    )
+    monkeypatch.setattr(TableBuffer, "SCAN_CHUNK", 4)
+    token = generation.next()
+    add_row = buf._add_row_ngrams
+
+    def typing(card_id):
+        add_row(card_id)
+        generation.next()  # пользователь ввёл следующий символ
+
+    monkeypatch.setattr(buf, "_add_row_ngrams", typing)
+    buf.filter_data("apple", generation=token)
+
+    assert pub_mock.call_count == 0
+    assert len(buf._ngram_backlog) == 6  # построена одна порция
+
+    monkeypatch.setattr(buf, "_add_row_ngrams", add_row)
+    buf.filter_data("apple", generation=generation.current)
+    assert buf._ngram_backlog == []
+    _, data_arg, _ = pub_mock.call_args[0]
+    assert [row[0] for row in data_arg] == ["1", "3", "5", "7", "9"]
+
+
+def test_common_ngrams_are_not_stored(monkeypatch):
+    monkeypatch.setattr(TableBuffer, "NGRAM_MAX_POSTING", 3)
+    buf = TableBuffer(
+        group_id=GROUP.SONGS_TABLE,
+        original_data={str(i): [str(i), f"song {name}"] for i, name in enumerate(
+            ["alpha", "beta", "gamma", "delta", "alpha two"])},
+        header_map={},
+        ngram_index=True
+    )
+
+    assert buf._ngram_candidates("alpha") == {"0", "4"}
+    assert "son" in buf._common_ngrams and "son" not in buf._ngram_index
+    assert buf._ngram_candidates("song") is None  # только частые триграммы
+
+
+def test_filter_normalizes_yo_and_case(patch_eventbus_publish):
+    pub_mock, _ = patch_eventbus_publish
+    buf = TableBuffer(
+        group_id=GROUP.SONGS_TABLE,
+        original_data={"1": ["1", "Ёлка"], "2": ["2", "Елена"], "3": ["3", "Сосна"]},
+        header_map={}
+    )
+
+    buf.filter_data("ЕЛ")
+
+    _, data_arg, _ = pub_mock.call_args[0]
+    assert [row[0] for row in data_arg] == ["1", "2"]
+
+
+def test_filter_does_not_match_across_cells(patch_eventbus_publish):
+    pub_mock, _ = patch_eventbus_publish
+    buf = TableBuffer(
+        group_id=GROUP.SONGS_TABLE,
+        original_data={"1": ["1", "ab", "cd"]},
+        header_map={}
+    )
+
+    buf.filter_data("bc")
+    _, data_arg, _ = pub_mock.call_args[0]
+    assert data_arg == []
+
+    buf.filter_data("b" + TableBuffer.SEARCH_SEP + "c")
+    _, data_arg, _ = pub_mock.call_args[0]
+    assert data_arg == []
+
+
+def test_search_text_refreshed_on_update(patch_eventbus_publish):
+    pub_mock, _ = patch_eventbus_publish
+    buf = TableBuffer(
+        group_id=GROUP.SONGS_TABLE,
+        original_data={"1": ["1", "Apple"]},
+        header_map={}
+    )
+    buf.filter_data("apple")
+    buf.update_item(["1", "Cherry"])
+    buf.filter_data("apple")
+
+    _, data_arg, _ = pub_mock.call_args[0]
+    assert data_arg == []
+    assert buf._search_text["1"] == "1" + TableBuffer.SEARCH_SEP + "cherry"
+
+
+def test_sort_keys_cached_and_invalidated_on_update(buffer_for_sort_tests, patch_eventbus_publish):
+    buf = buffer_for_sort_tests
+    buf.original_data = {
+        "1": ["1", "3:00"],
+        "2": ["2", "1:00"],
+        "3": ["3", "2:00"]
+    }
+    buf.header_map = {"Длительность": "duration"}
+
+    buf.sort_data(None, (1, "Длительность", 1))
+    assert buf.sorted_keys == ["2", "3", "1"]
+    assert buf._sort_keys[(1, "duration")]["1"] == (180, 1)
+
+    buf.update_item(["1", "0:30"])
+    assert buf._sort_keys[(1, "duration")]["1"] == (30, 1)
+    assert buf.sorted_keys == ["1", "2", "3"]
+
+    buf.delete_items(["2"], GROUP.SONGS_TABLE)
+    assert "2" not in buf._sort_keys[(1, "duration")]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_card_updated_index_matches_filtered_view(patch_eventbus_publish, seed):
+    pub_mock, _ = patch_eventbus_publish
+    rnd = random.Random(seed)
+    words = ["apple", "banana", "cherry", "grape"]
+    buf = TableBuffer(
+        group_id=GROUP.SONGS_TABLE,
+        original_data={str(i): [str(i), rnd.choice(words)] for i in range(50)},
+        header_map={"Название": "title"},
+        sort_key=(1, "Название", 1)
+    )
+    buf.filter_data("an")
+
+    for _ in range(40):
+        row = [str(rnd.randint(0, 60)), rnd.choice(words)]
+        pub_mock.reset_mock()
+        buf.update_item(row)
+
+        visible = [k for k in buf.sorted_keys if "an" in buf.original_data[k][1]]
+        event, *args = pub_mock.call_args[0]
+        if row[0] in visible:
+            assert event.event_type == EventType.VIEW.TABLE.BUFFER.CARD_UPDATED
+            assert args[1] == visible.index(row[0])
+        else:
+            assert event.event_type == EventType.VIEW.TABLE.BUFFER.INVISIBLE_ID
+
+    assert list(buf._filtered_order()) == [
+        k for k in buf.sorted_keys if "an" in buf.original_data[k][1]]
+
+
+def test_stale_filter_request_is_skipped(patch_eventbus_publish):
+    pub_mock, _ = patch_eventbus_publish
+    generation = SearchGeneration()
+    buf = TableBuffer(
+        group_id=GROUP.SONGS_TABLE,
+        original_data={"1": ["1", "apple"], "2": ["2", "banana"]},
+        header_map={},
+        search_generation=generation
+    )
+    old = generation.next()
+    new = generation.next()
+
+    buf.filter_data("apple", generation=old)
+    assert pub_mock.call_count == 0
+    assert buf.filter_term == ""
+
+    buf.filter_data("banana", generation=new)
+    _, data_arg, _ = pub_mock.call_args[0]
+    assert data_arg == [["2", "banana"]]
+    assert pub_mock.call_args[1] == {"generation": new, "keep_view": False}
+
+
+def test_filter_aborts_mid_scan_when_newer_search_arrives(patch_eventbus_publish, monkeypatch):
+    pub_mock, _ = patch_eventbus_publish
+    generation = SearchGeneration()
+    buf = TableBuffer(
+        group_id=GROUP.SONGS_TABLE,
+        original_data={str(i): [str(i), "apple"] for i in range(10)},
+        header_map={},
+        search_generation=generation
+    )
+    monkeypatch.setattr(TableBuffer, "SCAN_CHUNK", 2)
+    token = generation.next()
+
+    texts = buf._search_texts()
+    scanned = []
+
+    class TypingTexts(dict):
+        def get(self, key, default=None):
+            scanned.append(key)
+            if len(scanned) == 3:
+                generation.next()  # пользователь ввёл следующий символ
+            return texts.get(key, default)
+
+    monkeypatch.setattr(buf, "_search_texts", lambda: TypingTexts())
+
+    buf.filter_data("apple", generation=token)
+
+    assert pub_mock.call_count == 0
+    assert len(scanned) == 4  # прервано на границе второй порции
+    assert buf.history == []
+
+
+def test_append_rows_streams_into_sorted_filtered_view(patch_eventbus_publish, monkeypatch):
+    pub_mock, _ = patch_eventbus_publish
+    monkeypatch.setattr(TableBuffer, "LOAD_REFRESH_INTERVAL", 0)
+    buf = TableBuffer(
+        group_id=GROUP.SONGS_TABLE,
+        original_data={},
+        header_map={"Название": "title"},
+        sort_key=(1, "Название", 1)
+    )
+    buf.filter_data("a")
+
+    buf.append_rows([["1", "banana"], ["2", "cherry"]])
+    buf.append_rows([["3", "apple"], ["4", "avocado"]])
+
+    assert buf.sorted_keys == ["3", "4", "1", "2"]
+    filtered_call, progress_call = pub_mock.call_args_list[-2:]
+    assert [row[0] for row in filtered_call[0][1]] == ["3", "4", "1"]
+    assert progress_call[0][0].event_type == EventType.VIEW.TABLE.BUFFER.LOAD_PROGRESS
+    assert progress_call[0][1:] == (4, False)
+
+    pub_mock.reset_mock()
+    buf.append_rows([], is_last=True)
+    assert pub_mock.call_count == 1
+    assert pub_mock.call_args[0][1:] == (4, True)
+
+
+def test_append_rows_progress_counts_only_new_keys(patch_eventbus_publish, monkeypatch):
+    pub_mock, _ = patch_eventbus_publish
+    monkeypatch.setattr(TableBuffer, "LOAD_REFRESH_INTERVAL", 0)
+    buf = TableBuffer(group_id=GROUP.SONGS_TABLE, original_data={}, header_map={})
+
+    buf.append_rows([["1", "a"], ["2", "b"]])
+    buf.append_rows([["2", "b"], ["3", "c"]], is_last=True)  # "2" уже загружен
+
+    assert buf.sorted_keys == ["1", "2", "3"]
+    assert pub_mock.call_args[0][1:] == (3, True)
+
+
+def test_append_rows_throttles_refresh_and_flushes_on_last_chunk(patch_eventbus_publish, monkeypatch):
+    pub_mock, _ = patch_eventbus_publish
+    clock = [100.0]
+    monkeypatch.setattr("src.frontend.widgets.table.time.monotonic", lambda: clock[0])
+    buf = TableBuffer(group_id=GROUP.SONGS_TABLE, original_data={}, header_map={})
+    filter_spy = []
+    monkeypatch.setattr(buf, "filter_data", lambda *a, **k: filter_spy.append(a))
+
+    def filtered_calls():
+        return [c for c in pub_mock.call_args_list
+                if c[0][0].event_type == EventType.VIEW.TABLE.BUFFER.FILTERED_TABLE]
+
+    buf.append_rows([["1", "a"]])           # первая порция показывается сразу
+    clock[0] += 0.1
+    buf.append_rows([["2", "b"]])           # в пределах интервала — без обновления
+    assert len(filtered_calls()) == 1
+
+    clock[0] += 0.2
+    buf.append_rows([["3", "c"]])           # интервал прошёл
+    assert [row[0] for row in filtered_calls()[-1][0][1]] == ["1", "2", "3"]
+
+    clock[0] += 0.01
+    buf.append_rows([["4", "d"]])
+    buf.append_rows([], is_last=True)       # последняя порция досылает остаток
+    assert len(filtered_calls()) == 3
+    assert [row[0] for row in filtered_calls()[-1][0][1]] == ["1", "2", "3", "4"]
+    assert filter_spy == []                 # полная фильтрация не запускалась
+
+
+def test_update_items_publishes_single_refresh(table_buffer, patch_eventbus_publish):
+    pub_mock, _ = patch_eventbus_publish
+    table_buffer.original_data = {"1": ["1", "b"], "2": ["2", "d"]}
+    table_buffer.sort_key = (1, "name", 1)
+    table_buffer.sorted_keys = ["1", "2"]
+    table_buffer.filter_term = ""
+    pub_mock.reset_mock()
+
+    table_buffer.update_items([["3", "a"], ["2", "c"], ["4", "e"]])
+
+    assert table_buffer.sorted_keys == ["3", "1", "2", "4"]
+    assert pub_mock.call_count == 1
+    event, data, is_full = pub_mock.call_args[0]
+    assert event.event_type == EventType.VIEW.TABLE.BUFFER.FILTERED_TABLE
+    assert data == [["3", "a"], ["1", "b"], ["2", "c"], ["4", "e"]]
@@ -0,0 +1,300 @@
+import random
+from unittest.mock import patch
+
+import pytest
+
+from src.enums import GROUP
+from src.eventbus import EventBus
+from src.frontend.widgets.table import DataTable, SearchGeneration, TableBuffer, plan_rows_diff
+
+
+def apply_plan(current, target):
+    """Эмулирует применение плана к списку детей Treeview (detach/move/insert)."""
+    detach, stable = plan_rows_diff(current, target)
+    children = [k for k in current if k not in set(detach)]
+    moves = 0
+    for index, key in enumerate(target):
+        if key in stable:
+            assert children[index] == key
+            continue
+        children.insert(index, key)
+        moves += 1
+    return children, detach, moves
+
+
+def test_narrowing_filter_only_detaches():
+    current = ["1", "2", "3", "4", "5"]
+    target = ["1", "3", "5"]
+
+    children, detach, moves = apply_plan(current, target)
+
+    assert children == target
+    assert detach == ["2", "4"]
+    assert moves == 0
+
+
+def test_widening_filter_only_reattaches():
+    current = ["2", "4"]
+    target = ["1", "2", "3", "4", "5"]
+
+    children, detach, moves = apply_plan(current, target)
+
+    assert children == target
+    assert detach == []
+    assert moves == 3
+
+
+def test_reorder_moves_minimal_items():
+    current = ["1", "2", "3", "4", "5"]
+    target = ["2", "3", "4", "5", "1"]
+
+    children, detach, moves = apply_plan(current, target)
+
+    assert children == target
+    assert detach == ["1"]
+    assert moves == 1
+
+
+def test_reverse_keeps_single_item():
+    current = ["1", "2", "3"]
+    target = ["3", "2", "1"]
+
+    children, _, moves = apply_plan(current, target)
+
+    assert children == target
+    assert moves == 2
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_random_sequences(seed):
+    rnd = random.Random(seed)
+    universe = [str(i) for i in range(60)]
+    current = rnd.sample(universe, rnd.randint(0, 60))
+    target = rnd.sample(universe, rnd.randint(0, 60))
+
+    children, _, _ = apply_plan(current, target)
+
+    assert children == target
+
+
+class FakeTreeview:
+    """Минимальная замена ttk.Treeview для проверки _fill_table без дисплея."""
+
+    def __init__(self):
+        self.children = []
+        self.items = {}
+        self.selected = []
+        self.focused = ""
+        self.top_fraction = 0.0
+        self.calls = {"insert": 0, "move": 0, "item": 0}
+
+    def get_children(self):
+        return tuple(self.children)
+
+    def exists(self, iid):
+        return iid in self.items
+
+    def insert(self, _parent, index, iid, values, tags=()):
+        assert iid not in self.items
+        self.items[iid] = {"values": list(values), "tags": tags}
+        self.children.insert(len(self.children) if index == "end" else index, iid)
+        self.calls["insert"] += 1
+
+    def detach(self, *iids):
+        self.children = [iid for iid in self.children if iid not in iids]
+
+    def move(self, iid, _parent, index):
+        if iid in self.children:
+            self.children.remove(iid)
+        self.children.insert(index, iid)
+        self.calls["move"] += 1
+
+    def delete(self, *iids):
+        for iid in iids:
+            del self.items[iid]
+        self.children = [iid for iid in self.children if iid not in iids]
+
+    def item(self, iid, values=None, tags=None):
+        if values is not None:
+            self.items[iid]["values"] = list(values)
+            self.calls["item"] += 1
+        if tags is not None:
+            self.items[iid]["tags"] = tags
+
+    def selection(self):
+        return tuple(self.selected)
+
+    def selection_set(self, iids):
+        self.selected = list(iids)
+
+    def selection_remove(self, *iids):
+        self.selected = [iid for iid in self.selected if iid not in iids]
+
+    def focus(self, iid=None):
+        if iid is None:
+            return self.focused
+        self.focused = iid
+
+    def see(self, iid):
+        pass
+
+    def winfo_height(self):
+        return 1  # не отрисован: высота берётся из cget("height")
+
+    def cget(self, option):
+        assert option == "height"
+        return 10
+
+    def yview(self):
+        return self.top_fraction, 1.0
+
+    def yview_moveto(self, fraction):
+        self.top_fraction = fraction
+
+    def shown(self):
+        return [self.items[iid]["values"] for iid in self.children]
+
+
+@pytest.fixture
+def data_table():
+    table = DataTable.__new__(DataTable)
+    table.dt = FakeTreeview()
+    table._virtual = False
+    table._detached = set()
+    table._row_tags = {}
+    table._row_values = {}
+    table._table_len = 0
+    return table
+
+
+def rows(*pairs):
+    return [[key, value] for key, value in pairs]
+
+
+def test_fill_table_refreshes_changed_values(data_table):
+    data_table._fill_table(rows(("1", "a"), ("2", "b"), ("3", "c")))
+    data_table._fill_table(rows(("1", "a"), ("3", "c")))
+    data_table.dt.calls["item"] = 0
+
+    data_table._fill_table(rows(("1", "a"), ("2", "B"), ("3", "C")))
+
+    assert data_table.dt.shown() == rows(("1", "a"), ("2", "B"), ("3", "C"))
+    assert data_table.dt.calls["item"] == 2  # неизменённая строка не трогается
+    tags = [data_table.dt.items[iid]["tags"] for iid in data_table.dt.children]
+    assert tags == [("evenrow",), ("oddrow",), ("evenrow",)]
+
+
+def test_fill_table_rebuilds_on_reverse_order(data_table):
+    data = [[str(i), f"v{i}"] for i in range(100)]
+    data_table._fill_table(data)
+    data_table.dt.selection_set(["5", "7"])
+    data_table.dt.calls["insert"] = 0
+
+    data_table._fill_table(list(reversed(data)))
+
+    assert data_table.dt.shown() == list(reversed(data))
+    assert data_table.dt.calls["move"] == 0
+    assert data_table.dt.calls["insert"] == 100
+    assert data_table.dt.selection() == ("5", "7")
+    assert data_table._detached == set()
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_fill_table_random_updates(data_table, seed):
+    rnd = random.Random(seed)
+    universe = [str(i) for i in range(40)]
+    for _ in range(15):
+        keys = rnd.sample(universe, rnd.randint(0, 40))
+        data = [[key, rnd.choice("xyz")] for key in keys]
+
+        data_table._fill_table(data)
+
+        assert data_table.dt.shown() == data
+        assert data_table._table_len == len(data)
+        assert set(data_table.dt.items) == set(data_table.dt.children) | data_table._detached
+
+
+def test_update_items_refreshes_displayed_rows(data_table):
+    with patch.object(EventBus, "publish") as pub_mock, patch.object(EventBus, "subscribe"):
+        buf = TableBuffer(
+            group_id=GROUP.SONGS_TABLE,
+            original_data={"1": ["1", "apple"], "2": ["2", "banana"], "3": ["3", "avocado"]},
+            header_map={"Название": "title"},
+            sort_key=(1, "Название", 1)
+        )
+        buf.filter_data("a")
+        data_table._fill_table(pub_mock.call_args[0][1])
+        assert data_table.dt.shown() == [["1", "apple"], ["3", "avocado"], ["2", "banana"]]
+
+        pub_mock.reset_mock()
+        buf.update_items([["2", "almond"], ["3", "cherry"], ["1", "apricot"]])
+
+        assert pub_mock.call_count == 1
+        data_table._fill_table(pub_mock.call_args[0][1])
+
+    assert data_table.dt.shown() == [["2", "almond"], ["1", "apricot"]]
+
+
+class FakeScrollbar:
+    def set(self, first, last):
+        pass
+
+
+@pytest.fixture
+def virtual_table():
+    table = DataTable.__new__(DataTable)
+    table.dt = FakeTreeview()
+    table.scroll_y = FakeScrollbar()
+    table._virtual = True
+    table._rows = []
+    table._row_pos = {}
+    table._window = (0, 0)
+    table._selected = []
+    table._applied_selection = ()
+    table._row_height = 25
+    table._table_len = 0
+    table._search_generation = SearchGeneration()
+    table._first_paint_pending = False
+    table._show_table_end = True
+    table.update_idletasks = lambda: None
+    return table
+
+
+def make_rows(count, first=0):
+    return [[str(i), f"v{i}"] for i in range(first, first + count)]
+
+
+def test_virtual_window_materializes_rows_around_top(virtual_table):
+    virtual_table._set_virtual_rows(make_rows(1000))
+
+    overscan = DataTable.overscan
+    assert virtual_table._window == (0, 10 + overscan)
+    assert virtual_table.dt.children == [str(i) for i in range(10 + overscan)]
+
+    virtual_table._materialize(500)
+
+    assert virtual_table._window == (500 - overscan, 510 + overscan)
+    assert virtual_table.dt.children[0] == str(500 - overscan)
+    assert virtual_table._logical_top() == 500
+    tags = [virtual_table.dt.items[iid]["tags"] for iid in virtual_table.dt.children[:2]]
+    assert tags == [("evenrow",), ("oddrow",)]  # зебра по логическому индексу
+
+
+def test_virtual_refresh_keeps_scroll_offset(virtual_table):
+    virtual_table._filter_table(make_rows(1000))
+    virtual_table._materialize(500)
+
+    # Подгрузка добавила строки выше видимой области
+    virtual_table._filter_table(make_rows(100, first=5000) + make_rows(1000), keep_view=True)
+
+    top = int(virtual_table._logical_top())
+    assert virtual_table._rows[top][0] == "500"
+
+
+def test_virtual_new_filter_scrolls_to_end(virtual_table):
+    virtual_table._filter_table(make_rows(1000))
+    virtual_table._materialize(500)
+
+    virtual_table._filter_table(make_rows(300))
+
+    assert int(virtual_table._logical_top()) == 300 - 10